@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def parse_acceptance_filters(text):
+    """
+    Parse "id:mask" acceptance filters separated by commas or whitespace into python-can
+    can_filters. IDs and masks are hex with a 0x prefix or decimal. A mask may be omitted to
+    match the ID exactly, and an "x" or "s" suffix restricts a filter to extended or standard
+    frames. Raises ValueError on malformed input.
+    """
+    can_filters = []
+    for entry in text.replace(",", " ").split():
+        extended = None
+        if entry[-1] in "xXsS":
+            extended = entry[-1] in "xX"
+            entry = entry[:-1]
+
+        can_id, _, mask = entry.partition(":")
+        can_id = int(can_id, 0)
+        can_mask = int(mask, 0) if mask else 0x1FFFFFFF
+        if not 0 <= can_id <= 0x1FFFFFFF or not 0 <= can_mask <= 0x1FFFFFFF:
+            raise ValueError(f"Filter out of range: {entry}")
+
+        can_filter = {"can_id": can_id, "can_mask": can_mask}
+        if extended is not None:
+            can_filter["extended"] = extended
+        can_filters.append(can_filter)
+    return can_filters
+
+
+def acceptance_mask(arbitration_ids, extended, can_filters):
+    """
+    Return a boolean mask of the frames accepted by any of can_filters, with python-can semantics:
+    a frame matches when (id & can_mask) == (can_id & can_mask) and, if the filter names it,
+    the frame type agrees. No filters accept everything.
+    """
+    if not can_filters:
+        return np.ones(len(arbitration_ids), dtype=bool)
+
+    accepted = np.zeros(len(arbitration_ids), dtype=bool)
+    for can_filter in can_filters:
+        can_mask = can_filter["can_mask"]
+        match = (arbitration_ids & can_mask) == (can_filter["can_id"] & can_mask)
+        if "extended" in can_filter:
+            match &= extended == can_filter["extended"]
+        accepted |= match
+    return accepted
+
+
+def format_acceptance_filters(can_filters):
+    """
+    Format can_filters back into the text accepted by parse_acceptance_filters.
+    """
+    entries = []
+    for can_filter in can_filters:
+        suffix = ""
+        if "extended" in can_filter:
+            suffix = "x" if can_filter["extended"] else "s"
+        entries.append(f"0x{can_filter['can_id']:X}:0x{can_filter['can_mask']:X}{suffix}")
+    return ", ".join(entries)
@@ -0,0 +1,66 @@
+import threading
+import time
+
+
+HOST_CLOCK_TOLERANCE = 1.0
+
+
+def host_offset(frames):
+    """
+    Return the offset from the clock of a received batch to the host clock, measured on its
+    newest frame. Timestamps within HOST_CLOCK_TOLERANCE of host time are taken as host time.
+    """
+    offset = time.time() - float(frames["timestamp"][-1])
+    return 0.0 if abs(offset) < HOST_CLOCK_TOLERANCE else offset
+
+
+class BusClock:
+    """
+    The clock every captured frame is stamped on.
+
+    Received frames carry the adapter's clock (ACAN counts on its own u32 timer) while
+    transmitted frames are stamped with host time.time(). The first received batch fixes the
+    offset between the two, and align_host() moves host-stamped frames onto the bus clock, so
+    the bus load windows and ID periods see a single clock. When a frame is sent before any
+    is received, the host clock becomes the bus clock.
+    """
+
+    def __init__(self):
+        """
+        Initialize the BusClock.
+        """
+        self.offset = None
+        self._lock = threading.Lock()
+
+    def observe(self, frames):
+        """
+        Fix the host offset from the first received batch, and return it.
+        """
+        with self._lock:
+            if self.offset is None and len(frames):
+                self.offset = host_offset(frames)
+            return self.offset
+
+    def reference(self, offset):
+        """
+        Fix the host offset to offset unless it is already known, and return it.
+        """
+        with self._lock:
+            if self.offset is None:
+                self.offset = offset
+            return self.offset
+
+    def align_host(self, frames):
+        """
+        Move frames stamped with the host clock, such as Tx echoes, onto the bus clock.
+        """
+        offset = self.reference(0.0)
+        if offset:
+            frames["timestamp"] -= offset
+
+    def reset(self):
+        """
+        Forget the offset, for a new connection with a clock of its own.
+        """
+        with self._lock:
+            self.offset = None
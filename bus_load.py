@@ -0,0 +1,168 @@
+import numpy as np
+from can_enums import frame_flag
+
+
+CAN_CRC15_POLY = 0x4599
+STANDARD_HEADER_BITS = 19
+EXTENDED_HEADER_BITS = 39
+CRC_BITS = 15
+TRAILER_BITS = 13
+
+
+def _header_bits(frames, extended):
+    """
+    Return the SOF..DLC bits of frames as a (N, header) uint8 matrix, MSB first.
+    The DLC field carries the raw 4-bit code; codes 9 to 15 still mean 8 data bytes.
+    """
+    can_id = frames["arbitration_id"].astype(np.uint32)
+    remote = ((frames["flags"] & frame_flag.REMOTE) != 0).astype(np.uint8)
+    dlc = (frames["dlc"] & 0xF).astype(np.uint32)
+    zero = np.zeros(len(frames), dtype=np.uint8)
+
+    def field(value, width):
+        shifts = np.arange(width - 1, -1, -1, dtype=np.uint32)
+        return ((value[:, None] >> shifts) & 1).astype(np.uint8)
+
+    if extended:
+        columns = [
+            zero[:, None],
+            field(can_id >> 18, 11),
+            np.ones((len(frames), 1), dtype=np.uint8),
+            np.ones((len(frames), 1), dtype=np.uint8),
+            field(can_id & 0x3FFFF, 18),
+            remote[:, None],
+            zero[:, None],
+            zero[:, None],
+            field(dlc, 4),
+        ]
+    else:
+        columns = [
+            zero[:, None],
+            field(can_id & 0x7FF, 11),
+            remote[:, None],
+            zero[:, None],
+            zero[:, None],
+            field(dlc, 4),
+        ]
+    return np.hstack(columns)
+
+
+def _exact_stuff_bits(frames, extended):
+    """
+    Build the stuffed region (SOF..CRC) of every frame and count the stuff bits it needs.
+    The loops run over bit positions, with every frame of the batch processed at once.
+    """
+    count = len(frames)
+    header = _header_bits(frames, extended)
+    header_width = header.shape[1]
+    data_length = np.where(frames["flags"] & frame_flag.REMOTE, 0, np.minimum(frames["dlc"], 8)).astype(np.int64) * 8
+
+    width = header_width + 64 + CRC_BITS
+    stream = np.zeros((count, width), dtype=np.uint8)
+    stream[:, :header_width] = header
+    stream[:, header_width:header_width + 64] = np.unpackbits(np.ascontiguousarray(frames["data"]), axis=1)
+    payload_end = header_width + data_length
+
+    crc = np.zeros(count, dtype=np.uint32)
+    for position in range(header_width + 64):
+        active = position < payload_end
+        bit = stream[:, position].astype(np.uint32)
+        feedback = (bit ^ (crc >> 14)) & 1
+        crc = np.where(active, ((crc << 1) & 0x7FFF) ^ (feedback * CAN_CRC15_POLY), crc)
+
+    rows = np.arange(count)
+    for offset in range(CRC_BITS):
+        stream[rows, payload_end + offset] = (crc >> (CRC_BITS - 1 - offset)) & 1
+
+    stream_end = payload_end + CRC_BITS
+    stuff_bits = np.zeros(count, dtype=np.int64)
+    last_bit = np.full(count, 2, dtype=np.uint8)
+    run = np.zeros(count, dtype=np.int64)
+    for position in range(width):
+        active = position < stream_end
+        bit = stream[:, position]
+        run = np.where(bit == last_bit, run + 1, 1)
+        last_bit = bit.copy()
+        stuffed = active & (run == 5)
+        stuff_bits += stuffed
+        last_bit[stuffed] ^= 1
+        run[stuffed] = 1
+    return stuff_bits
+
+
+def frame_bit_lengths(frames, exact=True):
+    """
+    Return the on-wire length in bits of every classic CAN frame, including stuff bits,
+    the CRC/ACK/EOF trailer and the 3-bit interframe space.
+    With exact=False the worst-case stuffing for the frame's size is used instead of
+    stuffing the actual bit pattern.
+    """
+    extended = (frames["flags"] & frame_flag.EXTENDED) != 0
+    data_bits = np.where(frames["flags"] & frame_flag.REMOTE, 0, np.minimum(frames["dlc"], 8)).astype(np.int64) * 8
+    stuffed_region = np.where(extended, EXTENDED_HEADER_BITS, STANDARD_HEADER_BITS) + data_bits + CRC_BITS
+
+    if exact:
+        stuff_bits = np.zeros(len(frames), dtype=np.int64)
+        for group in (extended, ~extended):
+            if group.any():
+                stuff_bits[group] = _exact_stuff_bits(frames[group], bool(extended[group][0]))
+    else:
+        stuff_bits = (stuffed_region - 1) // 4
+
+    return stuffed_region + stuff_bits + TRAILER_BITS
+
+
+class BusLoadEstimator:
+    """
+    Rolling bus load from the on-wire bit length of every frame.
+    Bits are accumulated into fixed-resolution buckets keyed by frame timestamp, and the load
+    over a window is the bits in the most recent buckets divided by what the bitrate allows.
+    """
+
+    def __init__(self, bitrate, exact=True, resolution=0.001, history=1.0):
+        """
+        Initialize the BusLoadEstimator.
+        """
+        self.bitrate = bitrate
+        self.exact = exact
+        self.resolution = resolution
+        self.bucket_count = int(round(history / resolution))
+        self.clear()
+
+    def clear(self):
+        self.bucket_bits = np.zeros(self.bucket_count, dtype=np.float64)
+        self.bucket_number = np.full(self.bucket_count, -1, dtype=np.int64)
+        self.latest_bucket = None
+
+    def add(self, frames):
+        """
+        Account for a frame batch.
+        """
+        if not len(frames):
+            return
+
+        bits = frame_bit_lengths(frames, self.exact)
+        buckets = np.floor(frames["timestamp"] / self.resolution).astype(np.int64)
+        latest = int(buckets.max())
+        if self.latest_bucket is not None:
+            latest = max(latest, self.latest_bucket)
+        recent = buckets > latest - self.bucket_count
+        unique_buckets, inverse = np.unique(buckets[recent], return_inverse=True)
+        sums = np.bincount(inverse, weights=bits[recent])
+
+        slots = unique_buckets % self.bucket_count
+        stale = self.bucket_number[slots] != unique_buckets
+        self.bucket_bits[slots[stale]] = 0.0
+        self.bucket_number[slots] = unique_buckets
+        self.bucket_bits[slots] += sums
+        self.latest_bucket = latest
+
+    def load(self, window):
+        """
+        Return the bus load in percent over the most recent window seconds.
+        """
+        if self.latest_bucket is None or not self.bitrate:
+            return 0.0
+        buckets = max(1, int(round(window / self.resolution)))
+        in_window = self.bucket_number > self.latest_bucket - buckets
+        return float(self.bucket_bits[in_window].sum()) / (self.bitrate * buckets * self.resolution) * 100.0
@@ -1,4 +1,4 @@
-from enum import IntEnum
+from enum import IntEnum, IntFlag
 
 
 class capture_state(IntEnum):
@@ -31,3 +31,26 @@ class connect_enum(IntEnum):
     PCAN = 1,
     ACAN = 2,
     SOCKETSERVER = 3
+
+class reader_mode(IntEnum):
+    """
+    Enum for serial reader modes.
+    """
+    POLLING     = 0
+    BLOCKING    = 1
+
+class frame_flag(IntFlag):
+    """
+    Flag bits stored in the flags column of a captured frame.
+    """
+    EXTENDED    = 1
+    REMOTE      = 2
+    RX          = 4
+
+class trigger_state(IntEnum):
+    """
+    Enum for triggered capture states.
+    """
+    IDLE        = 0
+    ARMED       = 1
+    TRIGGERED   = 2
@@ -1,23 +1,42 @@
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
-from PySide6.QtWidgets import QTableView, QHeaderView
-from can_enums import can_msg_table_header
+from PySide6.QtWidgets import QAbstractItemView, QTableView, QHeaderView
+from can_enums import can_msg_table_header, frame_flag
+import bisect
+import numpy as np
 
 
 class CANMessageTableModel(QAbstractTableModel):
     def __init__(self, headers, parent=None):
         """
         Initialize the CANMessageTableModel.
+        Rows are not stored as strings: every cell is formatted on demand from the capture store,
+        so the formatting cost follows the visible viewport rather than the capture size.
         """
         super().__init__(parent)
         self.headers = headers
-        self.data_rows = []
+        self.store = None
+        self.decoder = None
+        self.decoded_text = {}
+        self.overwrite = False
+        self.interpret = False
+        self.display_filter = None
+        self.row_map = np.empty(0, dtype=np.int64)
 
+        self.row_offset = 0
+        self.row_count = 0
+        self.id_rows = []
+        self.id_keys = []
+        self.id_row_index = {}
+
+        self.first_timestamp = None
 
     def rowCount(self, parent=QModelIndex()):
         """
         Return the number of rows in the table.
         """
-        return len(self.data_rows)
+        if self.overwrite or self.interpret:
+            return len(self.id_rows)
+        return self.row_count
 
     def columnCount(self, parent=QModelIndex()):
         """
@@ -27,15 +46,57 @@ class CANMessageTableModel(QAbstractTableModel):
 
     def data(self, index, role=Qt.DisplayRole):
         """
-        Return the data for a given cell.
+        Return the data for a given cell, formatted from the capture store.
         """
         if not index.isValid():
             return None
 
-        if role == Qt.DisplayRole:
-            if index.column() == 0:
-                return str(index.row() + 1)
-            return self.data_rows[index.row()][index.column() - 1]
+        row = index.row()
+        column = index.column()
+        if role == Qt.ToolTipRole and (self.overwrite or self.interpret):
+            _, _, time_delta, _, count = self.id_rows[row]
+            return f"{count} frames, last period {time_delta * 1000:.3f} ms"
+        if role != Qt.DisplayRole:
+            return None
+
+        if column == 0:
+            return str(row + 1)
+
+        if self.overwrite or self.interpret:
+            _, store_index, time_delta, _, _ = self.id_rows[row]
+        elif self.display_filter is not None:
+            store_index = int(self.row_map[row])
+            time_delta = None
+        else:
+            store_index = self.row_offset + row
+            time_delta = None
+
+        store = self.store
+        flags = int(store.flags[store_index])
+
+        if column == 1:
+            if time_delta is not None:
+                return f"{int(time_delta * 1000)}"
+            return f"{int(self.relative_timestamp(store_index) * 1000000)}"
+        if column == 2:
+            return str(int(store.channel[store_index]))
+        if column == 3:
+            return f"0x{int(store.arbitration_id[store_index]):X}"
+        if column == 4:
+            return "1" if flags & frame_flag.EXTENDED else "0"
+        if column == 5:
+            return "1" if flags & frame_flag.REMOTE else "0"
+        if column == 6:
+            return "Rx" if flags & frame_flag.RX else "Tx"
+        if column == 7:
+            return str(int(store.dlc[store_index]))
+        if column == 8:
+            payload = store.payload(store_index)
+            if self.interpret and self.decoder:
+                return self.decoder(int(store.arbitration_id[store_index]), payload)
+            if self.interpret and self.id_rows[row][0] in self.decoded_text:
+                return self.decoded_text[self.id_rows[row][0]]
+            return " ".join(f"0x{byte:02X}" for byte in payload)
 
         return None
 
@@ -48,55 +109,226 @@ class CANMessageTableModel(QAbstractTableModel):
 
         return None
 
+    def relative_timestamp(self, store_index):
+        """
+        Return the time of a stored frame relative to the first displayed frame.
+        Live Tx frames are stamped on the bus clock when they are queued, so Rx and Tx share it.
+        """
+        return max(0.0, float(self.store.timestamp[store_index]) - self.first_timestamp)
+
+    def set_store(self, store):
+        """
+        Attach the frame store that backs the table and show every frame it already holds.
+        The store is either the live CaptureStore or a TraceReader; both expose the same columns.
+        """
+        self.beginResetModel()
+        self.store = store
+        self._reset_rows()
+        self.row_offset = 0
+        self.endResetModel()
+        self.append_frames(0, len(store))
+
+    def set_mode(self, overwrite=False, interpret=False):
+        """
+        Switch between sequential, overwrite and interpret modes. The table is cleared.
+        """
+        self.beginResetModel()
+        self.overwrite = overwrite
+        self.interpret = interpret
+        self._reset_rows()
+        self.endResetModel()
+
+    def set_filter(self, display_filter):
+        """
+        Show only the frames matching display_filter (None shows everything). The rows are
+        rebuilt from the frames already captured since the last clear.
+        """
+        start = self.row_offset
+        first_timestamp = self.first_timestamp
+        self.beginResetModel()
+        self.display_filter = display_filter
+        self._reset_rows()
+        self.row_offset = start
+        self.first_timestamp = first_timestamp
+        self.endResetModel()
+        if self.store is not None:
+            self.append_frames(start, len(self.store))
+
     def clear_table(self):
         """
         Clear all rows in the table.
         """
         self.beginResetModel()
-        self.data_rows = []
+        self._reset_rows()
         self.endResetModel()
 
-    def update_table(self, timestamp, can_id, extended, rtr, direction, dlc, data, overwrite=False, interpret=False):
+    def _reset_rows(self):
+        self.row_offset = len(self.store) if self.store is not None else 0
+        self.row_count = 0
+        self.row_map = np.empty(0, dtype=np.int64)
+        self.id_rows = []
+        self.id_keys = []
+        self.id_row_index = {}
+        self.decoded_text = {}
+        self.first_timestamp = None
+
+    def set_decoded(self, store_indexes, texts):
+        """
+        Store interpret mode text decoded outside the GUI thread. A row keeps showing the last
+        text delivered for its ID, raw bytes until the first one arrives.
+        Return the indices of the rows that changed.
+        """
+        rows = []
+        store = self.store
+        for store_index, text in zip(store_indexes, texts):
+            if store_index >= len(store):
+                continue
+            row_key = (
+                int(store.channel[store_index]),
+                bool(store.flags[store_index] & frame_flag.EXTENDED),
+                int(store.arbitration_id[store_index])
+            )
+            row_index = self.id_row_index.get(row_key)
+            if row_index is None:
+                continue
+            self.decoded_text[row_key] = text
+            rows.append(row_index)
+        if rows:
+            column = len(self.headers) - 1
+            self.dataChanged.emit(self.index(min(rows), column), self.index(max(rows), column))
+        return rows
+
+    def append_frames(self, start, stop):
         """
-        Update the table with a new CAN message.
+        Show the stored frames in [start, stop).
         - In overwrite or interpret mode, update the row with the same CAN ID or insert in ascending order.
-        - In normal mode, append the row sequentially.
-        """
-        column_data = [
-            timestamp,
-            can_id,
-            extended,
-            rtr,
-            direction,
-            str(dlc),
-            data
-        ]
-
-        if overwrite or interpret:
-            for row_index, row in enumerate(self.data_rows):
-                if row[1] == can_id:
-                    self.data_rows[row_index] = column_data
-                    self.dataChanged.emit(self.index(row_index, 0), self.index(row_index, len(column_data) - 1))
-                    return row_index
-
-            insert_index = 0
-            for row_index, row in enumerate(self.data_rows):
-                if can_id < row[1]:
-                    insert_index = row_index
-                    break
-            else:
-                insert_index = len(self.data_rows)
-
-            self.beginInsertRows(QModelIndex(), insert_index, insert_index)
-            self.data_rows.insert(insert_index, column_data)
-            self.endInsertRows()
-            return insert_index
+        - In normal mode, append the rows sequentially.
+        Return the indices of the rows that changed.
+        """
+        if start >= stop:
+            return []
+
+        if self.first_timestamp is None and not (self.overwrite or self.interpret):
+            self.first_timestamp = float(self.store.timestamp[start])
+
+        if self.overwrite or self.interpret:
+            return self.update_id_rows(start, stop)
+
+        count = stop - start
+        if self.display_filter is not None:
+            indices = np.flatnonzero(self.display_filter.evaluate(self.store, start, stop, self.time_origin())) + start
+            count = len(indices)
+            if not count:
+                return []
+            self._append_row_map(indices)
+
+        first_row = self.row_count
+        self.beginInsertRows(QModelIndex(), first_row, first_row + count - 1)
+        self.row_count += count
+        self.endInsertRows()
+        return list(range(first_row, self.row_count))
+
+    def _append_row_map(self, indices):
+        """
+        Append store indices to the filtered row map, doubling its capacity when full.
+        """
+        needed = self.row_count + len(indices)
+        if needed > len(self.row_map):
+            row_map = np.empty(max(needed, 2 * len(self.row_map), 1024), dtype=np.int64)
+            row_map[:self.row_count] = self.row_map[:self.row_count]
+            self.row_map = row_map
+        self.row_map[self.row_count:needed] = indices
 
+    def time_origin(self):
+        """
+        Return the timestamp that filter time windows are measured from.
+        """
+        if self.first_timestamp is not None:
+            return self.first_timestamp
+        if self.store is not None and len(self.store) > self.row_offset:
+            return float(self.store.timestamp[self.row_offset])
+        return 0.0
+
+    def store_index_row(self, store_index):
+        """
+        Return the sequential-mode row showing store_index, or the first row after it when
+        the frame is filtered out. Return None if there is no such row.
+        """
+        if self.display_filter is not None:
+            row = int(np.searchsorted(self.row_map[:self.row_count], store_index))
         else:
-            self.beginInsertRows(QModelIndex(), len(self.data_rows), len(self.data_rows))
-            self.data_rows.append(column_data)
-            self.endInsertRows()
-            return len(self.data_rows) - 1
+            row = store_index - self.row_offset
+        if not 0 <= row < self.row_count:
+            return None
+        return row
+
+    def update_id_rows(self, start, stop):
+        """
+        Coalesce the Rx frames in [start, stop) that pass the display filter per CAN ID and push only the latest frame of
+        each ID to its row, along with the ID's frame count and last period.
+        Rows are keyed by (channel, extended, arbitration ID), so every channel gets its own rows
+        and standard and extended IDs sort numerically in separate blocks.
+        """
+        store = self.store
+        selected = (store.flags[start:stop] & frame_flag.RX) != 0
+        if self.display_filter is not None:
+            selected &= self.display_filter.evaluate(store, start, stop, self.time_origin())
+        indices = np.flatnonzero(selected) + start
+        if not len(indices):
+            return []
+
+        keys = ((store.channel[indices].astype(np.uint64) << np.uint64(33))
+                | ((store.flags[indices] & frame_flag.EXTENDED).astype(np.uint64) << np.uint64(32))
+                | store.arbitration_id[indices])
+        unique_keys, reversed_last, counts = np.unique(keys[::-1], return_index=True, return_counts=True)
+        last_positions = len(indices) - 1 - reversed_last
+
+        previous = np.full(len(unique_keys), -1, dtype=np.int64)
+        if (counts > 1).any():
+            remaining = np.ones(len(indices), dtype=bool)
+            remaining[last_positions] = False
+            remaining_keys, reversed_previous = np.unique(keys[remaining][::-1], return_index=True)
+            remaining_indices = indices[remaining]
+            previous[np.searchsorted(unique_keys, remaining_keys)] = remaining_indices[len(remaining_indices) - 1 - reversed_previous]
+
+        touched_keys = []
+        changed_keys = []
+        for key, store_index, previous_index, count in zip(
+            unique_keys.tolist(), indices[last_positions].tolist(), previous.tolist(), counts.tolist()
+        ):
+            row_key = (key >> 33, bool((key >> 32) & 1), key & 0xFFFFFFFF)
+            timestamp = float(store.timestamp[store_index])
+            row_index = self.id_row_index.get(row_key)
+            touched_keys.append(row_key)
+            if row_index is None:
+                time_delta = timestamp - float(store.timestamp[previous_index]) if previous_index >= 0 else 0.0
+                self._insert_id_row(row_key, [row_key, store_index, max(0.0, time_delta), timestamp, count])
+                continue
+
+            row = self.id_rows[row_index]
+            previous_timestamp = float(store.timestamp[previous_index]) if previous_index >= 0 else row[3]
+            row[1] = store_index
+            row[2] = max(0.0, timestamp - previous_timestamp)
+            row[3] = timestamp
+            row[4] += count
+            changed_keys.append(row_key)
+
+        if changed_keys:
+            rows = [self.id_row_index[row_key] for row_key in changed_keys]
+            self.dataChanged.emit(self.index(min(rows), 0), self.index(max(rows), len(self.headers) - 1))
+        return sorted(self.id_row_index[row_key] for row_key in touched_keys)
+
+    def _insert_id_row(self, key, row):
+        """
+        Insert a row for a new CAN ID at its sorted position.
+        """
+        insert_index = bisect.bisect_left(self.id_keys, key)
+        self.beginInsertRows(QModelIndex(), insert_index, insert_index)
+        self.id_keys.insert(insert_index, key)
+        self.id_rows.insert(insert_index, row)
+        for row_index in range(insert_index, len(self.id_keys)):
+            self.id_row_index[self.id_keys[row_index]] = row_index
+        self.endInsertRows()
 
 class CANMessageTable(QTableView):
     def __init__(self, parent=None):
@@ -105,7 +337,7 @@ class CANMessageTable(QTableView):
         """
         super().__init__(parent)
 
-        self.headers = ["", "Timestamp", "ID", "Ext", "RTR", "Dir", "Len", "Data"]
+        self.headers = ["", "Timestamp", "Ch", "ID", "Ext", "RTR", "Dir", "Len", "Data"]
         self.timestamp_index = self.headers.index("Timestamp")
 
         self.model = CANMessageTableModel(self.headers)
@@ -125,6 +357,7 @@ class CANMessageTable(QTableView):
         header = self.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.Interactive)
         header.setSectionResizeMode(len(self.headers) - 1, QHeaderView.Stretch)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
         self.autoscroll_enabled = False
 
@@ -134,19 +367,64 @@ class CANMessageTable(QTableView):
         """
         self.model.clear_table()
 
-    def update_table(self, timestamp, can_id, extended, rtr, direction, dlc, data, overwrite=False, interpret=False):
+    def set_store(self, store):
         """
-        Update the table with a new CAN message.
+        Attach the frame store that backs the table.
         """
-        row_index = self.model.update_table(timestamp, can_id, extended, rtr, direction, dlc, data, overwrite, interpret)
+        self.model.set_store(store)
+        if self.model.interpret:
+            self.resizeRowsToContents()
 
-        if overwrite:
-            self.resizeRowToContents(row_index)
+    def scroll_to_store_index(self, store_index):
+        """
+        Scroll to and select the row showing a stored frame in sequential mode.
+        """
+        if self.model.overwrite or self.model.interpret:
+            return False
+        row = self.model.store_index_row(store_index)
+        if row is None:
+            return False
+        self.scrollTo(self.model.index(row, 0), QAbstractItemView.PositionAtTop)
+        self.selectRow(row)
+        return True
+
+    def set_filter(self, display_filter):
+        """
+        Show only the frames matching display_filter, or every frame for None.
+        """
+        self.model.set_filter(display_filter)
+        if self.model.interpret:
+            self.resizeRowsToContents()
+
+    def set_mode(self, overwrite=False, interpret=False, decoder=None):
+        """
+        Switch the table between sequential, overwrite and interpret modes.
+        """
+        self.model.decoder = decoder
+        self.model.set_mode(overwrite, interpret)
+
+    def append_frames(self, start, stop):
+        """
+        Show the stored frames in [start, stop) and return the indices of the rows that changed.
+        """
+        rows = self.model.append_frames(start, stop)
+
+        if self.model.interpret:
+            for row_index in rows:
+                self.resizeRowToContents(row_index)
 
         if self.autoscroll_enabled:
             self.scrollToBottom()
 
         self.viewport().update()
+        return rows
+
+    def set_decoded(self, store_indexes, texts):
+        """
+        Show interpret mode text decoded by the worker pool.
+        """
+        for row_index in self.model.set_decoded(store_indexes, texts):
+            self.resizeRowToContents(row_index)
 
     def can_msg_table_set_header(self, header):
         """
@@ -154,9 +432,11 @@ class CANMessageTable(QTableView):
         """
         if header == can_msg_table_header.TIME_STAMP_HEADER:
             self.model.headers[self.timestamp_index] = "Timestamp"
+            self.model.headerDataChanged.emit(Qt.Horizontal, self.timestamp_index, self.timestamp_index)
             print("[DEBUG] Timestamp set")
         elif header == can_msg_table_header.TIME_DELTA_HEADER:
             self.model.headers[self.timestamp_index] = "Time Delta"
+            self.model.headerDataChanged.emit(Qt.Horizontal, self.timestamp_index, self.timestamp_index)
             print("[DEBUG] Time Delta header set")
         else:
             return False
@@ -19,24 +19,41 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QRadioButton,
     QButtonGroup,
-    QStackedWidget
+    QStackedWidget,
+    QListWidget
     )
-from PySide6.QtGui import QKeySequence, QShortcut
+from PySide6.QtGui import QGuiApplication, QKeySequence, QShortcut
 
 from PySide6.QtCore import Qt, QTimer
 import can
 import cantools
 import json
+import numpy as np
 import os
 import queue
 import sys
 import time
 from functools import partial
-from can_enums import can_msg_table_header, capture_state, con_button, connect_enum
+from can_enums import can_msg_table_header, capture_state, con_button, connect_enum, reader_mode, trigger_state
 from can_message_table import CANMessageTable
+from acceptance_filter import parse_acceptance_filters
+from bus_clock import BusClock
+from bus_load import BusLoadEstimator
+from can_statistics import IDStatistics
+from can_statistics_table import CANStatisticsTable
+from capture_store import CaptureStore, frames_from_messages
+from channel_merger import ChannelMerger
 from connection_manager import ConnectionManager
-from dbc_manager import DBCManager
+from cyclic_scheduler import CyclicTransmitScheduler
+from dbc_manager import DBCLoaderThread, DBCManager
+from decode_pool import DBCDecodePool, DecodeTraceThread
+from display_filter import DisplayFilter
+from latency_probe import LatencyProbe
 from send_frame_manager import SendFrameManager
+from trace_logger import TraceLogger
+from trace_reader import TraceReader
+from triggered_capture import TriggeredCapture
+from replay_engine import ReplayEngine
 import serial.tools.list_ports
 import logging
 logger = logging.getLogger(__name__)
@@ -60,11 +77,9 @@ class CANMessageUI(QWidget):
         """
         self.can_bus = None
         self.can_msg_notifier = None
-        self.last_timestamps = {}
         self.can_db = None
-        self.can_msg_list = []
+        self.capture_store = CaptureStore()
 
-        self.first_timestamp = None
         self.total_frames_captured = 0
         self.frames_in_last_second = 0
         self.is_capturing_paused = False
@@ -110,9 +125,13 @@ class CANMessageUI(QWidget):
 
         self.send_shortcut_keys = ['Ctrl+1', 'Ctrl+2', 'Ctrl+3', 'Ctrl+4', 'Ctrl+5', 'Ctrl+6', 'Ctrl+7', 'Ctrl+8', 'Ctrl+9', 'Ctrl+0']
 
-        self.timestamp_offset = 0.0
-
         self.can_message_queue = queue.Queue()
+        self.min_refresh_rate = 30
+        self.max_refresh_rate = 60
+        self.refresh_budget = 0.008
+        self.refresh_frame_cost = 5e-6
+        self.min_refresh_frames = 1000
+        self.refresh_backlog = None
 
         self.connection_radio_group = None
 
@@ -120,10 +139,49 @@ class CANMessageUI(QWidget):
         self.control_layout_width = 200
 
         self.can_message_table = CANMessageTable()
+        self.can_message_table.set_store(self.capture_store)
+        self.id_statistics = IDStatistics()
+        self.can_statistics_table = CANStatisticsTable()
         self.connection_manager = ConnectionManager()
+        self.connection_manager.arrival_listeners.append(self.on_frames_arrived)
+        bus_config = self.connection_manager.get_bus_config()
+        self.bus_load = BusLoadEstimator(
+            bus_config.get("bitrate", 500000),
+            exact=bus_config.get("bit_stuffing", "exact") == "exact"
+        )
+        self.bus_load_windows = [0.01, 0.1, 1.0]
+        self.channel_bus_loads = {}
         self.dbc_manager = DBCManager()
+        self.dbc_loader_thread = None
+        self.dbc_load_started = 0.0
 
         self.send_frame_manager = SendFrameManager(self.connection_manager, self.can_message_queue)
+        self.send_frame_manager.tx_listeners.append(self.log_frames)
+        self.cyclic_scheduler = CyclicTransmitScheduler(self.send_frame_manager)
+        self.cyclic_scheduler.start()
+        self.can_interval_unit = 0.005
+        self.send_row_templates = {}
+        self.latency_probe = None
+        self.triggered_capture = None
+        self.decode_pool = None
+        self.decode_trace_thread = None
+        self.decode_trace_started = 0.0
+        self.bus_clock = BusClock()
+        self.channel_merger = ChannelMerger(self.on_message_received, clock=self.bus_clock)
+        self.send_frame_manager.to_bus_clock = self.bus_clock.align_host
+        self.channel_connections = {}
+        self.channel_frames_last = {}
+        self.main_connection_description = ""
+        self.trace_logger = None
+        self.trace_reader = None
+        self.replay_engine = None
+        self.replay_speeds = [
+            ("Real time", 1.0),
+            ("2x", 2.0),
+            ("5x", 5.0),
+            ("10x", 10.0),
+            ("As fast as possible", 0.0),
+        ]
 
 
     def setup_ui(self):
@@ -155,6 +213,31 @@ class CANMessageUI(QWidget):
 
         self.can_messages_tab = QWidget()
         self.can_messages_layout = QVBoxLayout(self.can_messages_tab)
+
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(QLabel("Filter:"))
+        self.display_filter_edit = QLineEdit()
+        self.display_filter_edit.setPlaceholderText("e.g. id in 0x100-0x1FF and rx and data[0] & 0xF0 == 0x10")
+        self.display_filter_edit.setToolTip(
+            "Combine with and / or / not and parentheses:\n"
+            "  rx, tx, ext, std, rtr\n"
+            "  id == 0x100, id in 0x100-0x1FF, id in {0x100, 0x200-0x2FF}\n"
+            "  dlc >= 4, time >= 1.5 (seconds)\n"
+            "  data[0] == 0x12, data[1] & 0xF0 == 0x10\n"
+            "  DBC signals: EngineSpeed > 3000, Engine.Temp < 90"
+        )
+        self.display_filter_edit.returnPressed.connect(self.apply_display_filter)
+        filter_row.addWidget(self.display_filter_edit)
+        self.apply_filter_button = self.create_button("Apply", self.apply_display_filter)
+        self.apply_filter_button.setFixedWidth(80)
+        filter_row.addWidget(self.apply_filter_button)
+        self.clear_filter_button = self.create_button("Clear", self.clear_display_filter)
+        self.clear_filter_button.setFixedWidth(80)
+        filter_row.addWidget(self.clear_filter_button)
+        self.display_filter_status_label = QLabel("")
+        filter_row.addWidget(self.display_filter_status_label)
+        self.can_messages_layout.addLayout(filter_row)
+
         self.can_messages_layout.addWidget(self.can_message_table)
         self.can_messages_tab.setLayout(self.can_messages_layout)
         self.tab_widget.addTab(self.can_messages_tab, "CAN Messages")
@@ -163,9 +246,9 @@ class CANMessageUI(QWidget):
         self.send_frames_layout = QVBoxLayout(self.send_frames_tab)
 
         self.send_frames_table = QTableWidget()
-        self.send_frames_table.setColumnCount(13)
+        self.send_frames_table.setColumnCount(14)
         self.send_frames_table.setHorizontalHeaderLabels(
-            ["ID", "Ext", "RTR", "Len", "D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7", "Send"]
+            ["ID", "Ext", "RTR", "Len", "D0", "D1", "D2", "D3", "D4", "D5", "D6", "D7", "Period", "Send"]
         )
         self.send_frames_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.send_frames_table.setRowCount(10)
@@ -174,18 +257,22 @@ class CANMessageUI(QWidget):
             id_input = QLineEdit()
             id_input.setText("0x150")
             id_input.setStyleSheet("color: white;")
+            id_input.textChanged.connect(partial(self.on_send_row_changed, row))
             self.send_frames_table.setCellWidget(row, 0, id_input)
 
             ext_dropdown = QComboBox()
             ext_dropdown.addItems(["Standard", "Extended"])
+            ext_dropdown.currentIndexChanged.connect(partial(self.on_send_row_changed, row))
             self.send_frames_table.setCellWidget(row, 1, ext_dropdown)
 
             rtr_checkbox = QCheckBox()
+            rtr_checkbox.stateChanged.connect(partial(self.on_send_row_changed, row))
             self.send_frames_table.setCellWidget(row, 2, rtr_checkbox)
 
             dlc_spinbox = QSpinBox()
             dlc_spinbox.setRange(0, 8)
             dlc_spinbox.setValue(8)
+            dlc_spinbox.valueChanged.connect(partial(self.on_send_row_changed, row))
             self.send_frames_table.setCellWidget(row, 3, dlc_spinbox)
 
             fixed_data = ["00", "00", "00", "00", "00", "00", "00", "00"]
@@ -196,24 +283,69 @@ class CANMessageUI(QWidget):
                 else:
                     data_input.setText("")
                 data_input.setStyleSheet("color: white;")
+                data_input.textChanged.connect(partial(self.on_send_row_changed, row))
                 self.send_frames_table.setCellWidget(row, col, data_input)
 
+            period_dropdown = QComboBox()
+            period_dropdown.addItems(["Off"] + self.can_intervals_strings)
+            period_dropdown.currentIndexChanged.connect(partial(self.handle_cyclic_period, row))
+            self.send_frames_table.setCellWidget(row, 12, period_dropdown)
+
             send_button = QPushButton("Send")
             send_button.clicked.connect(lambda _, r=row: self.handle_send_frame(r))
-            self.send_frames_table.setCellWidget(row, 12, send_button)
+            self.send_frames_table.setCellWidget(row, 13, send_button)
 
             shortcut = QShortcut(QKeySequence(self.send_shortcut_keys[row]), self)
             shortcut.setContext(Qt.ApplicationShortcut)
             shortcut.activated.connect(partial(self.handle_send_frame, row))
 
         self.send_frames_layout.addWidget(self.send_frames_table)
+
+        self.send_all_button = self.create_button("Send All", self.handle_send_all_frames)
+        self.send_frames_layout.addWidget(self.send_all_button)
+
+        self.cyclic_status_label = QLabel("Cyclic tasks: 0")
+        self.cyclic_status_label.setStyleSheet("color: white;")
+        self.send_frames_layout.addWidget(self.cyclic_status_label)
+
+        latency_group = QGroupBox("Latency Probe")
+        latency_layout = QVBoxLayout(latency_group)
+        latency_row = QHBoxLayout()
+        latency_row.addWidget(QLabel("Probe ID:"))
+        self.latency_id_edit = QLineEdit("0x7E0")
+        self.latency_id_edit.setFixedWidth(100)
+        latency_row.addWidget(self.latency_id_edit)
+        self.latency_ext_checkbox = QCheckBox("Extended")
+        latency_row.addWidget(self.latency_ext_checkbox)
+        latency_row.addWidget(QLabel("Interval (ms):"))
+        self.latency_interval_spinbox = QSpinBox()
+        self.latency_interval_spinbox.setRange(1, 1000)
+        self.latency_interval_spinbox.setValue(10)
+        latency_row.addWidget(self.latency_interval_spinbox)
+        self.latency_button = self.create_button("Start Probe", self.toggle_latency_probe)
+        self.latency_button.setFixedWidth(120)
+        latency_row.addWidget(self.latency_button)
+        latency_row.addStretch()
+        latency_layout.addLayout(latency_row)
+        self.latency_status_label = QLabel("Probe stopped")
+        latency_layout.addWidget(self.latency_status_label)
+        self.send_frames_layout.addWidget(latency_group)
         self.send_frames_tab.setLayout(self.send_frames_layout)
         self.tab_widget.addTab(self.send_frames_tab, "Send Frames")
 
+        self.statistics_tab = QWidget()
+        self.statistics_layout = QVBoxLayout(self.statistics_tab)
+        self.statistics_layout.addWidget(self.can_statistics_table)
+        self.tab_widget.addTab(self.statistics_tab, "Statistics")
+
         self.connections_tab = QWidget()
         self.setup_connections_tab()
         self.tab_widget.addTab(self.connections_tab, "Connections")
 
+        self.trace_tab = QWidget()
+        self.setup_trace_tab()
+        self.tab_widget.addTab(self.trace_tab, "Trace")
+
     def setup_connections_tab(self):
         main_layout = QHBoxLayout(self.connections_tab)
 
@@ -259,6 +391,20 @@ class CANMessageUI(QWidget):
             }
         """)
         left_layout.addWidget(self.connect_button)
+        left_layout.addSpacing(10)
+        left_layout.addWidget(QLabel("Channels:"))
+        self.channel_list = QListWidget()
+        self.channel_list.setToolTip(
+            "Channel 0 is the main connection, used for sending.\n"
+            "Extra channels are received and merged into one time-ordered stream."
+        )
+        left_layout.addWidget(self.channel_list)
+        channel_button_row = QHBoxLayout()
+        self.add_channel_button = self.create_button("Add Channel", self.add_channel)
+        channel_button_row.addWidget(self.add_channel_button)
+        self.remove_channel_button = self.create_button("Remove Channel", self.remove_channel)
+        channel_button_row.addWidget(self.remove_channel_button)
+        left_layout.addLayout(channel_button_row)
         left_layout.addStretch()
         left_group.setFixedWidth(280)
         main_layout.addWidget(left_group, 1)
@@ -269,6 +415,17 @@ class CANMessageUI(QWidget):
         self.connection_settings_stack = QStackedWidget()
 
         self.pcan_settings_widget = QWidget()
+        pcan_layout = QVBoxLayout(self.pcan_settings_widget)
+        pcan_layout.setAlignment(Qt.AlignLeft)
+        pcan_channel_row = QHBoxLayout()
+        pcan_channel_row.addWidget(QLabel("Channel:"))
+        self.pcan_channel_edit = QLineEdit()
+        self.pcan_channel_edit.setPlaceholderText("from can_config.json")
+        self.pcan_channel_edit.setFixedWidth(200)
+        pcan_channel_row.addWidget(self.pcan_channel_edit)
+        pcan_channel_row.addStretch()
+        pcan_layout.addLayout(pcan_channel_row)
+        pcan_layout.addStretch()
         self.connection_settings_stack.addWidget(self.pcan_settings_widget)
 
         self.acan_settings_widget = QWidget()
@@ -288,6 +445,20 @@ class CANMessageUI(QWidget):
         serial_row.addStretch()
 
         acan_layout.addLayout(serial_row)
+
+        reader_row = QHBoxLayout()
+        self.acan_low_cpu_checkbox = QCheckBox("Low-CPU reader")
+        self.acan_low_cpu_checkbox.setToolTip("Block on the serial port instead of polling it")
+        reader_row.addWidget(self.acan_low_cpu_checkbox)
+        reader_row.addWidget(QLabel("Latency target (ms):"))
+        self.acan_latency_spinbox = QSpinBox()
+        self.acan_latency_spinbox.setRange(1, 100)
+        self.acan_latency_spinbox.setValue(2)
+        self.acan_latency_spinbox.setFixedWidth(60)
+        reader_row.addWidget(self.acan_latency_spinbox)
+        reader_row.addStretch()
+
+        acan_layout.addLayout(reader_row)
         acan_layout.addStretch()
         self.connection_settings_stack.addWidget(self.acan_settings_widget)
 
@@ -321,11 +492,144 @@ class CANMessageUI(QWidget):
         self.connection_settings_stack.addWidget(self.udp_settings_widget)
 
         right_layout.addWidget(self.connection_settings_stack)
+
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(QLabel("Acceptance filters:"))
+        self.acceptance_filter_edit = QLineEdit()
+        self.acceptance_filter_edit.setPlaceholderText("id:mask, e.g. 0x100:0x7F0, 0x18FF0000:0x1FFF0000x")
+        self.acceptance_filter_edit.setToolTip(
+            "Only frames matching one of these ID/mask pairs are received.\n"
+            "Suffix x or s to match only extended or standard frames. Empty accepts everything."
+        )
+        filter_row.addWidget(self.acceptance_filter_edit)
+        right_layout.addLayout(filter_row)
         main_layout.addWidget(right_group, 2)
 
         self.connection_radio_group.buttonClicked.connect(self.on_radio_changed)
         self.on_radio_changed()
 
+    def setup_trace_tab(self):
+        """
+        Set up the Trace tab with the logging controls.
+        """
+        self.trace_layout = QVBoxLayout(self.trace_tab)
+
+        logging_group = QGroupBox("Logging")
+        logging_layout = QHBoxLayout(logging_group)
+        self.logging_button = self.create_button("Start Logging", self.toggle_logging)
+        self.logging_button.setFixedWidth(120)
+        logging_layout.addWidget(self.logging_button)
+        self.logging_status_label = QLabel("Not logging")
+        logging_layout.addWidget(self.logging_status_label)
+        logging_layout.addStretch()
+        self.trace_layout.addWidget(logging_group)
+
+        viewer_group = QGroupBox("Trace Viewer")
+        viewer_layout = QVBoxLayout(viewer_group)
+        viewer_row = QHBoxLayout()
+        self.open_trace_button = self.create_button("Open Trace", self.open_trace_file)
+        self.open_trace_button.setFixedWidth(120)
+        viewer_row.addWidget(self.open_trace_button)
+        self.show_live_button = self.create_button("Show Live", self.show_live_capture)
+        self.show_live_button.setFixedWidth(120)
+        self.show_live_button.setEnabled(False)
+        viewer_row.addWidget(self.show_live_button)
+        self.export_decoded_button = self.create_button("Export Decoded", self.export_decoded_trace)
+        self.export_decoded_button.setFixedWidth(120)
+        self.export_decoded_button.setEnabled(False)
+        viewer_row.addWidget(self.export_decoded_button)
+        self.trace_status_label = QLabel("Showing live capture")
+        viewer_row.addWidget(self.trace_status_label)
+        viewer_row.addStretch()
+        viewer_layout.addLayout(viewer_row)
+
+        seek_row = QHBoxLayout()
+        seek_row.addWidget(QLabel("Go to time (s):"))
+        self.trace_seek_edit = QLineEdit("0.0")
+        self.trace_seek_edit.setFixedWidth(120)
+        self.trace_seek_edit.returnPressed.connect(self.seek_trace)
+        seek_row.addWidget(self.trace_seek_edit)
+        self.trace_seek_button = self.create_button("Go", self.seek_trace)
+        self.trace_seek_button.setFixedWidth(60)
+        self.trace_seek_button.setEnabled(False)
+        seek_row.addWidget(self.trace_seek_button)
+        seek_row.addStretch()
+        viewer_layout.addLayout(seek_row)
+        self.trace_layout.addWidget(viewer_group)
+
+        replay_group = QGroupBox("Replay")
+        replay_layout = QVBoxLayout(replay_group)
+        replay_row = QHBoxLayout()
+        self.replay_button = self.create_button("Replay Trace", self.toggle_replay)
+        self.replay_button.setFixedWidth(120)
+        replay_row.addWidget(self.replay_button)
+        self.replay_pause_button = self.create_button("Pause", self.toggle_replay_pause)
+        self.replay_pause_button.setFixedWidth(80)
+        self.replay_pause_button.setEnabled(False)
+        replay_row.addWidget(self.replay_pause_button)
+        self.replay_speed_combo = QComboBox()
+        for label, speed in self.replay_speeds:
+            self.replay_speed_combo.addItem(label, speed)
+        replay_row.addWidget(self.replay_speed_combo)
+        self.replay_loop_checkbox = QCheckBox("Loop")
+        replay_row.addWidget(self.replay_loop_checkbox)
+        self.replay_transmit_checkbox = QCheckBox("Retransmit on bus")
+        replay_row.addWidget(self.replay_transmit_checkbox)
+        replay_row.addStretch()
+        replay_layout.addLayout(replay_row)
+
+        replay_seek_row = QHBoxLayout()
+        replay_seek_row.addWidget(QLabel("Seek to (s):"))
+        self.replay_seek_edit = QLineEdit("0.0")
+        self.replay_seek_edit.setFixedWidth(120)
+        self.replay_seek_edit.returnPressed.connect(self.seek_replay)
+        replay_seek_row.addWidget(self.replay_seek_edit)
+        self.replay_seek_button = self.create_button("Seek", self.seek_replay)
+        self.replay_seek_button.setFixedWidth(60)
+        self.replay_seek_button.setEnabled(False)
+        replay_seek_row.addWidget(self.replay_seek_button)
+        self.replay_status_label = QLabel("Not replaying")
+        replay_seek_row.addWidget(self.replay_status_label)
+        replay_seek_row.addStretch()
+        replay_layout.addLayout(replay_seek_row)
+        self.trace_layout.addWidget(replay_group)
+
+        trigger_group = QGroupBox("Trigger")
+        trigger_layout = QVBoxLayout(trigger_group)
+        trigger_condition_row = QHBoxLayout()
+        trigger_condition_row.addWidget(QLabel("Condition:"))
+        self.trigger_condition_edit = QLineEdit()
+        self.trigger_condition_edit.setPlaceholderText("id == 0x123, data[0] & 0x80 == 0x80, EngineSpeed > 6000")
+        self.trigger_condition_edit.setToolTip(
+            "Any display filter expression. Frames are held back until the first frame matches,\n"
+            "then the frames around it are shown and logged."
+        )
+        trigger_condition_row.addWidget(self.trigger_condition_edit)
+        trigger_layout.addLayout(trigger_condition_row)
+
+        trigger_window_row = QHBoxLayout()
+        trigger_window_row.addWidget(QLabel("Pre-trigger (s):"))
+        self.trigger_pre_edit = QLineEdit("1.0")
+        self.trigger_pre_edit.setFixedWidth(80)
+        trigger_window_row.addWidget(self.trigger_pre_edit)
+        trigger_window_row.addWidget(QLabel("Post-trigger (s):"))
+        self.trigger_post_edit = QLineEdit("1.0")
+        self.trigger_post_edit.setFixedWidth(80)
+        trigger_window_row.addWidget(self.trigger_post_edit)
+        self.trigger_rearm_checkbox = QCheckBox("Re-arm")
+        self.trigger_rearm_checkbox.setToolTip("Arm again after each post-trigger window")
+        trigger_window_row.addWidget(self.trigger_rearm_checkbox)
+        self.trigger_button = self.create_button("Arm", self.toggle_trigger)
+        self.trigger_button.setFixedWidth(80)
+        trigger_window_row.addWidget(self.trigger_button)
+        self.trigger_status_label = QLabel("Not armed")
+        trigger_window_row.addWidget(self.trigger_status_label)
+        trigger_window_row.addStretch()
+        trigger_layout.addLayout(trigger_window_row)
+        self.trace_layout.addWidget(trigger_group)
+
+        self.trace_layout.addStretch()
+
     def on_radio_changed(self, button=None):
         idx = self.connection_radio_group.checkedId()
         if idx == connect_enum.PCAN:
@@ -382,8 +686,23 @@ class CANMessageUI(QWidget):
         self.fps_layout.addWidget(self.fps_value_label)
         self.fps_layout.setAlignment(Qt.AlignCenter)
 
+        self.bus_load_text_label = QLabel("Bus Load (10ms / 100ms / 1s)")
+        self.bus_load_text_label.setStyleSheet("color: white;")
+        self.bus_load_text_label.setToolTip("Load of channel 0; extra channels show theirs in the channel list")
+        self.bus_load_text_label.setAlignment(Qt.AlignCenter)
+
+        self.bus_load_value_label = QLabel("0.0% / 0.0% / 0.0%")
+        self.bus_load_value_label.setStyleSheet("color: white;")
+        self.bus_load_value_label.setAlignment(Qt.AlignCenter)
+
+        self.bus_load_layout = QVBoxLayout()
+        self.bus_load_layout.addWidget(self.bus_load_text_label)
+        self.bus_load_layout.addWidget(self.bus_load_value_label)
+        self.bus_load_layout.setAlignment(Qt.AlignCenter)
+
         self.control_layout.addLayout(self.total_frames_layout)
         self.control_layout.addLayout(self.fps_layout)
+        self.control_layout.addLayout(self.bus_load_layout)
         self.control_layout.addWidget(self.capture_frame_button)
         self.control_layout.addWidget(self.clear_frame_button)
         self.control_layout.setAlignment(Qt.AlignCenter)
@@ -395,10 +714,14 @@ class CANMessageUI(QWidget):
         self.autoscroll_checkbox.setChecked(False)
         self.interpret_frames_checkbox = self.create_checkbox("Interpret Frames", self.interpret_frames_callback)
         self.interpret_frames_checkbox.setEnabled(False)
+        self.decode_workers_checkbox = self.create_checkbox("Decode In Workers", self.decode_workers_callback)
+        self.decode_workers_checkbox.setToolTip("Decode interpreted frames with the DBC in worker processes")
+        self.decode_workers_checkbox.setEnabled(False)
 
         self.checkbox_and_buttons_layout.addWidget(self.overwrite_checkbox)
         self.checkbox_and_buttons_layout.addWidget(self.autoscroll_checkbox)
         self.checkbox_and_buttons_layout.addWidget(self.interpret_frames_checkbox)
+        self.checkbox_and_buttons_layout.addWidget(self.decode_workers_checkbox)
         
         self.control_layout.addLayout(self.checkbox_and_buttons_layout)
 
@@ -434,9 +757,13 @@ class CANMessageUI(QWidget):
         self.fps_timer.timeout.connect(self.task_1s)
         self.fps_timer.start(1000)
 
+        screen = QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else self.max_refresh_rate
+        refresh_rate = min(max(refresh_rate, self.min_refresh_rate), self.max_refresh_rate)
+
         self.gui_update_timer = QTimer()
-        self.gui_update_timer.timeout.connect(self.task_1ms)
-        self.gui_update_timer.start(1)
+        self.gui_update_timer.timeout.connect(self.task_refresh)
+        self.gui_update_timer.start(int(1000 / refresh_rate))
 
     def create_can_messages_tab(self):
         """
@@ -532,67 +859,116 @@ class CANMessageUI(QWidget):
         """
         Clear the CAN message table.
         """
-        self.can_message_table.clear_table()
         self.total_frames_captured = 0
         self.frames_in_last_second = 0
         self.total_frames_value_label.setText("0")
         self.fps_value_label.setText("0")
-        self.first_timestamp = None
-        self.last_timestamps.clear()
-        self.can_msg_list.clear()
+        self.capture_store.clear()
+        self.can_message_table.clear_table()
+        self.id_statistics.clear()
+        self.can_statistics_table.update_statistics(self.id_statistics)
+        self.bus_load.clear()
+        for bus_load in self.channel_bus_loads.values():
+            bus_load.clear()
+        self.bus_load_value_label.setText("0.0% / 0.0% / 0.0%")
 
     def load_dbc_file(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Select DBC File", "", "DBC Files (*.dbc);;All Files (*)")
 
-        ins = time.time()
-
         if file_path:
-            keep_prefixes = (
-                "VERSION", "NS_", "BS_", "BU_", "BO_", "SG_", "CM_", "VAL_", "BA_",
-                "BA_DEF_", "BA_DEF_DEF_", "BA_DEF_DEF_REL_", "BA_REL_", "SGTYPE_", "SG_MUL_VAL_"
-            )
-
-            filtered_lines = []
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    if any(line.strip().startswith(prefix) for prefix in keep_prefixes):
-                        filtered_lines.append(line)
+            if self.dbc_loader_thread and self.dbc_loader_thread.isRunning():
+                return
 
-            import tempfile
-            temp_path = os.path.join(tempfile.gettempdir(), "filtered_dbc.dbc")
-            with open(temp_path, "w") as out:
-                out.writelines(filtered_lines)
+            self.dbc_load_started = time.time()
+            self.load_dbc_button.setEnabled(False)
+            self.dbc_status_label.setText("DBC File: loading...")
 
-            success, message = self.dbc_manager.load_dbc_file(temp_path)
-            if success:
-                QMessageBox.information(self, "DBC File Loaded", message)
-                print("[DEBUG] " + message)
+            self.dbc_loader_thread = DBCLoaderThread(self.dbc_manager, file_path)
+            self.dbc_loader_thread.progress.connect(self.on_dbc_load_progress)
+            self.dbc_loader_thread.loaded.connect(partial(self.on_dbc_loaded, file_path))
+            self.dbc_loader_thread.start()
 
-                self.dbc_status_label.setText(f"DBC File: {os.path.basename(file_path)}")
-                self.interpret_frames_checkbox.setEnabled(True)
-            else:
-                QMessageBox.critical(self, "Error", message)
-                print(f"[ERROR] {message}")
-                self.dbc_status_label.setText("DBC File: None")
-                self.interpret_frames_checkbox.setEnabled(False)
+        else:
+            self.dbc_status_label.setText("DBC File: None")
+            self.interpret_frames_checkbox.setEnabled(False)
+            self.decode_workers_checkbox.setEnabled(False)
 
-            try:
-                os.remove(temp_path)
-            except:
-                pass
-        
-            print(f"[DEBUG] DBC file loaded in {time.time() - ins:.2f} seconds")
+    def on_dbc_load_progress(self, percent):
+        """
+        Show the progress of the background DBC load.
+        """
+        self.dbc_status_label.setText(f"DBC File: loading {percent}%")
 
+    def on_dbc_loaded(self, file_path, success, message, can_db):
+        """
+        Activate the database parsed by the DBC loader thread.
+        """
+        self.load_dbc_button.setEnabled(True)
+        if success:
+            self.dbc_manager.set_database(can_db, file_path)
+            QMessageBox.information(self, "DBC File Loaded", message)
+            print("[DEBUG] " + message)
+
+            self.dbc_status_label.setText(f"DBC File: {os.path.basename(file_path)}")
+            self.interpret_frames_checkbox.setEnabled(True)
+            self.decode_workers_checkbox.setEnabled(True)
+            if self.decode_pool:
+                self.stop_decode_pool()
+                if self.decode_workers_checkbox.isChecked():
+                    self.start_decode_pool()
+            if self.interpret_frames_checkbox.isChecked():
+                self.apply_table_mode()
+            if self.can_message_table.model.display_filter is not None:
+                self.apply_display_filter()
         else:
+            QMessageBox.critical(self, "Error", message)
+            print(f"[ERROR] {message}")
             self.dbc_status_label.setText("DBC File: None")
             self.interpret_frames_checkbox.setEnabled(False)
-            
+            self.decode_workers_checkbox.setEnabled(False)
+
+        print(f"[DEBUG] DBC file loaded in {time.time() - self.dbc_load_started:.2f} seconds")
+
+    def apply_display_filter(self):
+        """
+        Compile the filter expression and show only the matching frames in the CAN Messages table.
+        """
+        text = self.display_filter_edit.text().strip()
+        if not text:
+            self.clear_display_filter()
+            return
+
+        try:
+            display_filter = DisplayFilter(text, self.dbc_manager.can_db)
+        except ValueError as e:
+            self.display_filter_status_label.setStyleSheet("color: #ff6b6b;")
+            self.display_filter_status_label.setText(str(e))
+            print(f"[ERROR] Invalid display filter: {e}")
+            return
+
+        started = time.perf_counter()
+        self.can_message_table.set_filter(display_filter)
+        elapsed = time.perf_counter() - started
+        self.submit_decode()
+        self.display_filter_status_label.setStyleSheet("color: white;")
+        self.task_filter_update()
+        print(f"[DEBUG] Display filter '{text}' applied in {elapsed * 1000:.1f} ms")
+
+    def clear_display_filter(self):
+        self.display_filter_edit.clear()
+        self.display_filter_status_label.setText("")
+        if self.can_message_table.model.display_filter is not None:
+            self.can_message_table.set_filter(None)
+            self.submit_decode()
+
     def toggle_pause(self):
         """
         Toggle the paused state of the CAN message reception.
         """
         if self.is_capturing_paused:
-            success = self.connection_manager.resume(self.on_message_received)
+            success = self.connection_manager.resume(partial(self.channel_merger.push, 0))
+            for channel, (connection_manager, _) in self.channel_connections.items():
+                connection_manager.resume(partial(self.channel_merger.push, channel))
             if success:
                 self.can_message_table.clear_table()
                 self.capture_button_set_state(capture_state.CAPTURE)
@@ -600,6 +976,8 @@ class CANMessageUI(QWidget):
                 print("[DEBUG] Resumed CAN message reception.")
         else:
             success = self.connection_manager.suspend()
+            for connection_manager, _ in self.channel_connections.values():
+                connection_manager.suspend()
             if success:
                 self.capture_button_set_state(capture_state.PAUSE)
                 print("[DEBUG] Suspended CAN message reception.")
@@ -617,46 +995,143 @@ class CANMessageUI(QWidget):
         Handle the state change of the overwrite checkbox.
         Clear the raw CAN data table whenever the checkbox is toggled.
         """
-        self.can_message_table.clear_table()
-
         if state == 2:
             self.can_message_table.can_msg_table_set_header(can_msg_table_header.TIME_DELTA_HEADER)
-            self.last_timestamps.clear()
-            self.first_timestamp = None
         else:
             if self.interpret_frames_checkbox.isChecked():
                 self.interpret_frames_checkbox.setChecked(False)
             print("[DEBUG] Overwrite checkbox state changed:", state)
             self.can_message_table.can_msg_table_set_header(can_msg_table_header.TIME_STAMP_HEADER)
-            self.first_timestamp = None
 
+        self.apply_table_mode()
         self.previous_checkbox_state = (state == 2)
 
+    def apply_table_mode(self):
+        """
+        Push the overwrite/interpret checkbox state to the table. The table is cleared.
+        """
+        self.can_message_table.set_mode(
+            overwrite=self.overwrite_checkbox.isChecked(),
+            interpret=self.interpret_frames_checkbox.isChecked(),
+            decoder=None if self.decoding_in_workers() else self.decode_data
+        )
+
+    def decoding_in_workers(self):
+        """
+        Whether live interpret mode rows are decoded by the worker pool. A pool started only to
+        export a trace leaves live decoding on the GUI thread.
+        """
+        return self.decode_pool is not None and self.decode_workers_checkbox.isChecked()
+
+    def decode_workers_callback(self, state):
+        """
+        Move interpret mode decoding into worker processes, or back onto the GUI thread. A
+        running trace export keeps the pool until it finishes.
+        """
+        if state == 2:
+            self.start_decode_pool()
+        elif not (self.decode_trace_thread and self.decode_trace_thread.isRunning()):
+            self.stop_decode_pool()
+        self.apply_table_mode()
+
+    def start_decode_pool(self):
+        if self.decode_pool or not self.dbc_manager.file_path:
+            return self.decode_pool
+        self.decode_pool = DBCDecodePool(self.dbc_manager.file_path)
+        print(f"[DEBUG] Started {self.decode_pool.max_workers} DBC decode workers")
+        return self.decode_pool
+
+    def stop_decode_pool(self):
+        if self.decode_trace_thread and self.decode_trace_thread.isRunning():
+            self.decode_trace_thread.cancel()
+            self.decode_trace_thread.wait()
+        if self.decode_pool:
+            self.decode_pool.shutdown()
+            self.decode_pool = None
+            print("[DEBUG] Stopped DBC decode workers")
+
+    def submit_decode(self, rows=None):
+        """
+        Send the latest frame of the given interpret mode rows, all rows by default, to the
+        decode workers.
+        """
+        model = self.can_message_table.model
+        if not self.decoding_in_workers() or not model.interpret:
+            return
+        if rows is None:
+            rows = range(model.rowCount())
+        if not len(rows):
+            return
+        store_indexes = np.array([model.id_rows[row][1] for row in rows], dtype=np.int64)
+        store = model.store
+        self.decode_pool.submit(
+            (store, store_indexes), store.arbitration_id[store_indexes], store.data[store_indexes], store.dlc[store_indexes]
+        )
+
+    def task_decode_update(self):
+        """
+        Hand the decoded batches that are ready, in order, to the table.
+        """
+        model = self.can_message_table.model
+        for (store, store_indexes), texts in self.decode_pool.collect():
+            if model.interpret and model.store is store:
+                self.can_message_table.set_decoded(store_indexes.tolist(), texts)
+
+    def read_send_row(self, row):
+        """
+        Read the frame fields of a Send Frames row. Raises ValueError on invalid input.
+        """
+        id_input = self.send_frames_table.cellWidget(row, 0)
+        ext_dropdown = self.send_frames_table.cellWidget(row, 1)
+        rtr_checkbox = self.send_frames_table.cellWidget(row, 2)
+        dlc_spinbox = self.send_frames_table.cellWidget(row, 3)
+
+        can_id = int(id_input.text(), 16)
+        is_extended = ext_dropdown.currentText() == "Extended"
+        is_rtr = rtr_checkbox.isChecked()
+        dlc = dlc_spinbox.value()
+
+        data = []
+        for col in range(4, 4 + dlc):
+            data_input = self.send_frames_table.cellWidget(row, col)
+            byte_str = data_input.text()
+            if byte_str:
+                data.append(int(byte_str, 16))
+            else:
+                data.append(0)
+        return can_id, is_extended, is_rtr, dlc, data
+
+    def read_send_row_message(self, row):
+        """
+        Build the can.Message a Send Frames row describes. Raises ValueError on invalid input.
+        """
+        can_id, is_extended, is_rtr, dlc, data = self.read_send_row(row)
+        return can.Message(
+            arbitration_id=can_id,
+            is_extended_id=is_extended,
+            is_remote_frame=is_rtr,
+            dlc=dlc,
+            data=bytearray(data),
+            is_rx=False
+        )
+
+    def send_row_template(self, row):
+        """
+        Return the pre-packed FrameTemplate of a Send Frames row, packing it on first use.
+        Raises ValueError on invalid input.
+        """
+        template = self.send_row_templates.get(row)
+        if template is None or template.connection_type != self.connection_manager.get_connection_type():
+            template = self.send_frame_manager.prepare_frames(frames_from_messages([self.read_send_row_message(row)]))
+            self.send_row_templates[row] = template
+        return template
+
     def handle_send_frame(self, row):
         """
         Handle the Send button click to send a CAN frame for a specific row.
         """
         try:
-            id_input = self.send_frames_table.cellWidget(row, 0)
-            ext_dropdown = self.send_frames_table.cellWidget(row, 1)
-            rtr_checkbox = self.send_frames_table.cellWidget(row, 2)
-            dlc_spinbox = self.send_frames_table.cellWidget(row, 3)
-
-            can_id = int(id_input.text(), 16)
-            is_extended = ext_dropdown.currentText() == "Extended"
-            is_rtr = rtr_checkbox.isChecked()
-            dlc = dlc_spinbox.value()
-
-            data = []
-            for col in range(4, 4 + dlc):
-                data_input = self.send_frames_table.cellWidget(row, col)
-                byte_str = data_input.text()
-                if byte_str:
-                    data.append(int(byte_str, 16))
-                else:
-                    data.append(0)
-
-            success, message = self.send_frame_manager.send_frame(can_id, is_extended, is_rtr, dlc, data)
+            success, message = self.send_frame_manager.send_frames(self.send_row_template(row))
             if success:
                 print(f"[DEBUG] Row {row + 1}: {message}")
             else:
@@ -664,6 +1139,143 @@ class CANMessageUI(QWidget):
         except ValueError:
             print(f"[ERROR] Row {row + 1}: Invalid input. Ensure all fields are in the correct format.")
 
+    def handle_send_all_frames(self):
+        """
+        Send every valid Send Frames row as one batch.
+        """
+        frames = []
+        for row in range(self.send_frames_table.rowCount()):
+            try:
+                frames.append(self.send_row_template(row).frames)
+            except ValueError:
+                print(f"[ERROR] Row {row + 1}: Invalid input. Ensure all fields are in the correct format.")
+        if not frames:
+            return
+
+        success, message = self.send_frame_manager.send_frames(np.concatenate(frames))
+        if success:
+            print(f"[DEBUG] Send All: {message}")
+        else:
+            print(f"[ERROR] Send All: {message}")
+
+    def toggle_trigger(self):
+        """
+        Arm a triggered capture with the condition and windows from the Trace tab, or disarm it
+        and go back to showing every frame.
+        """
+        if self.triggered_capture:
+            self.triggered_capture.disarm()
+            self.triggered_capture = None
+            self.trigger_button.setText("Arm")
+            self.trigger_status_label.setText("Not armed")
+            print("[DEBUG] Trigger disarmed")
+            return
+
+        try:
+            trigger = DisplayFilter(self.trigger_condition_edit.text().strip(), self.dbc_manager.can_db)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Trigger", str(e))
+            return
+        try:
+            pre_trigger = float(self.trigger_pre_edit.text())
+            post_trigger = float(self.trigger_post_edit.text())
+            if pre_trigger < 0 or post_trigger < 0:
+                raise ValueError
+        except ValueError:
+            QMessageBox.warning(self, "Invalid Trigger", "Pre- and post-trigger times must be positive numbers of seconds.")
+            return
+
+        triggered_capture = TriggeredCapture(
+            trigger, pre_trigger, post_trigger, rearm=self.trigger_rearm_checkbox.isChecked()
+        )
+        triggered_capture.arm()
+        self.can_message_table.clear_table()
+        self.triggered_capture = triggered_capture
+        self.trigger_button.setText("Disarm")
+        self.task_trigger_update()
+        print(f"[DEBUG] Trigger armed: '{trigger.text}', pre {pre_trigger} s, post {post_trigger} s")
+
+    def toggle_latency_probe(self):
+        """
+        Start or stop sending tagged probe frames and matching their echoes.
+        """
+        if self.latency_probe:
+            self.latency_probe.stop()
+            self.task_latency_update()
+            self.latency_probe = None
+            self.latency_button.setText("Start Probe")
+            print("[DEBUG] Latency probe stopped")
+            return
+
+        if not self.connection_manager.is_connected():
+            QMessageBox.critical(self, "Error", "Connect to a device before starting the latency probe.")
+            return
+        try:
+            can_id = int(self.latency_id_edit.text(), 16)
+        except ValueError:
+            QMessageBox.critical(self, "Error", "Invalid probe ID.")
+            return
+
+        self.latency_probe = LatencyProbe(
+            self.send_frame_manager,
+            can_id=can_id,
+            is_extended=self.latency_ext_checkbox.isChecked(),
+            interval=self.latency_interval_spinbox.value() / 1000.0
+        )
+        self.latency_probe.start()
+        self.latency_button.setText("Stop Probe")
+        self.latency_status_label.setText("Waiting for probe echoes...")
+        print(f"[DEBUG] Latency probe started on 0x{can_id:X}")
+
+    def handle_cyclic_period(self, row, index):
+        """
+        Start, change or stop the cyclic transmission of a Send Frames row.
+        """
+        if index == 0:
+            if self.cyclic_scheduler.remove_task(row):
+                print(f"[DEBUG] Row {row + 1}: cyclic sending stopped.")
+            return
+
+        period = self.can_intervals_counts[index - 1] * self.can_interval_unit
+        try:
+            message = self.read_send_row_message(row)
+        except ValueError:
+            print(f"[ERROR] Row {row + 1}: Invalid input. Ensure all fields are in the correct format.")
+            self.reset_cyclic_period(row)
+            return
+
+        if not self.cyclic_scheduler.add_task(row, message, period):
+            self.reset_cyclic_period(row)
+
+    def on_send_row_changed(self, row, *args):
+        """
+        Drop the packed template of an edited Send Frames row and push the edit into its running cyclic task.
+        """
+        self.send_row_templates.pop(row, None)
+        if row not in self.cyclic_scheduler.tasks:
+            return
+        try:
+            message = self.read_send_row_message(row)
+        except ValueError:
+            return
+        self.cyclic_scheduler.update_task(row, message)
+
+    def reset_cyclic_period(self, row):
+        period_dropdown = self.send_frames_table.cellWidget(row, 12)
+        period_dropdown.blockSignals(True)
+        period_dropdown.setCurrentIndex(0)
+        period_dropdown.setToolTip("")
+        period_dropdown.blockSignals(False)
+
+    def stop_cyclic_tasks(self):
+        """
+        Stop every cyclic task and set all Period cells back to Off.
+        """
+        self.cyclic_scheduler.stop_all()
+        for row in range(self.send_frames_table.rowCount()):
+            self.reset_cyclic_period(row)
+        self.cyclic_status_label.setText("Cyclic tasks: 0")
+
     def autoscroll_callback(self, state):
         """
         Handle the state change of the autoscroll checkbox.
@@ -680,12 +1292,11 @@ class CANMessageUI(QWidget):
         print("[DEBUG] Interpret Frames checkbox state changed:", state)
         if state == 2:
             self.overwrite_checkbox.setChecked(True)
-            self.can_message_table.model.overwrite_mode = True
             print("[DEBUG] Interpret Frames enabled. Table is in overwrite mode.")
         else:
             self.overwrite_checkbox.setChecked(False)
-            self.can_message_table.model.overwrite_mode = False
             print("[DEBUG] Interpret Frames disabled.")
+        self.apply_table_mode()
 
     def table_sort_callback(self, column_index):
         """
@@ -715,174 +1326,601 @@ class CANMessageUI(QWidget):
             case _:
                 return False
 
-    def toggle_connection(self):
+    def read_connection_settings(self):
         """
-        Toggle the connection to the selected device type.
+        Return the selected connection type and its connect() parameters, or None after
+        reporting invalid settings.
         """
         selected_id = self.connection_radio_group.checkedId()
         selected_type = connect_enum(selected_id)
 
         params = {}
-        if selected_type == connect_enum.ACAN:
+        try:
+            params['can_filters'] = parse_acceptance_filters(self.acceptance_filter_edit.text())
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", f"Invalid acceptance filter: {e}")
+            return None
+
+        if selected_type == connect_enum.PCAN:
+            params['channel'] = self.pcan_channel_edit.text().strip()
+        elif selected_type == connect_enum.ACAN:
             params['port'] = self.acan_port_combo.currentText()
+            params['reader_mode'] = reader_mode.BLOCKING if self.acan_low_cpu_checkbox.isChecked() else reader_mode.POLLING
+            params['latency_ms'] = self.acan_latency_spinbox.value()
         elif selected_type == connect_enum.SOCKETSERVER:
             params['ip'] = self.udp_ip_edit.text()
             params['port'] = self.udp_port_edit.text()
+        return selected_type, params
+
+    def describe_connection(self, connection_type, params):
+        if connection_type == connect_enum.PCAN:
+            return f"PCAN {params.get('channel') or '(config)'}"
+        if connection_type == connect_enum.ACAN:
+            return f"ACAN {params.get('port')}"
+        return f"UDP {params.get('ip')}:{params.get('port')}"
+
+    def toggle_connection(self):
+        """
+        Toggle the connection to the selected device type.
+        """
+        settings = self.read_connection_settings()
+        if settings is None:
+            return
+        selected_type, params = settings
 
         if not self.connection_manager.is_connected():
-            success = self.connection_manager.connect(self.on_message_received, selected_type, params)
+            description = self.describe_connection(selected_type, params)
+            if any(existing == description for _, existing in self.channel_connections.values()):
+                QMessageBox.critical(self, "Error", f"{description} is already open as an extra channel.")
+                return
+            self.channel_merger.add_channel(0)
+            success = self.connection_manager.connect(partial(self.channel_merger.push, 0), selected_type, params)
             if success:
-                self.first_timestamp = None
+                self.main_connection_description = description
                 self.connection_button_style(con_button.DISCONNECT)
                 self.clear_frame_button_callback()
                 self.send_frame_manager.set_connection_type(selected_type)
                 print(f"[DEBUG] Connected to {selected_type.name}.")
             else:
+                self.channel_merger.remove_channel(0)
                 QMessageBox.critical(self, "Error", f"Failed to connect to {selected_type.name}.")
         else:
+            self.stop_cyclic_tasks()
+            if self.latency_probe:
+                self.toggle_latency_probe()
             success = self.connection_manager.disconnect()
             if success:
+                self.channel_merger.remove_channel(0)
                 self.connection_button_style(con_button.CONNECT)
                 print("[DEBUG] Disconnected.")
             else:
                 QMessageBox.critical(self, "Error", "Failed to disconnect.")
 
 
-    def on_message_received(self, msg):
+    def add_channel(self):
         """
-        Callback function that gets called whenever a CAN message is received.
+        Open another connection with the current settings as the next free channel. Its frames
+        are merged with the other channels by timestamp.
+        """
+        settings = self.read_connection_settings()
+        if settings is None:
+            return
+        selected_type, params = settings
+        description = self.describe_connection(selected_type, params)
+        open_descriptions = [existing for _, existing in self.channel_connections.values()]
+        if self.connection_manager.is_connected():
+            open_descriptions.append(self.main_connection_description)
+        if description in open_descriptions:
+            QMessageBox.critical(self, "Error", f"{description} is already open.")
+            return
+
+        channel = next(number for number in range(1, 256) if number not in self.channel_connections)
+        connection_manager = ConnectionManager()
+        connection_manager.arrival_listeners.append(self.on_frames_arrived)
+        self.channel_merger.add_channel(channel)
+        if not connection_manager.connect(partial(self.channel_merger.push, channel), selected_type, params):
+            self.channel_merger.remove_channel(channel)
+            QMessageBox.critical(self, "Error", f"Failed to connect to {description}.")
+            return
+
+        self.channel_connections[channel] = (connection_manager, description)
+        self.task_channel_update()
+        print(f"[DEBUG] Channel {channel} connected to {description}.")
+
+    def remove_channel(self):
+        """
+        Disconnect the extra channel selected in the channel list.
+        """
+        item = self.channel_list.currentItem()
+        if item is None:
+            return
+        channel = item.data(Qt.UserRole)
+        if channel not in self.channel_connections:
+            return
+
+        connection_manager, description = self.channel_connections.pop(channel)
+        connection_manager.disconnect()
+        self.channel_merger.remove_channel(channel)
+        self.channel_frames_last.pop(channel, None)
+        self.channel_bus_loads.pop(channel, None)
+        self.task_channel_update()
+        print(f"[DEBUG] Channel {channel} ({description}) disconnected.")
+
+    def on_frames_arrived(self, frames, arrival):
+        """
+        Arrival listener of every connection: match latency probe echoes at the time their
+        batch was read, before the channel merger holds it back or it is queued for the GUI.
+        """
+        latency_probe = self.latency_probe
+        if latency_probe:
+            latency_probe.match(frames, arrival)
+
+    def on_message_received(self, frames):
+        """
+        Callback function that gets called with every batch of received CAN frames.
         """
         if self.is_capturing_paused:
             return
 
-        self.frames_in_last_second += 1
-        self.can_message_queue.put(msg)
+        self.frames_in_last_second += len(frames)
 
-    def decode_data(self, can_id, data):
+        triggered_capture = self.triggered_capture
+        if triggered_capture:
+            frames = triggered_capture.process(frames)
+            if not len(frames):
+                return
+
+        self.log_frames(frames)
+        self.can_message_queue.put(frames)
+
+    def log_frames(self, frames):
         """
-        Decode the CAN message using the DBCManager and return the formatted data string.
+        Hand a frame batch to the trace logger, if logging is active. Never blocks.
         """
-        decoded_signals, error = self.dbc_manager.decode_message(can_id, data)
+        trace_logger = self.trace_logger
+        if trace_logger:
+            trace_logger.log(frames)
 
-        # Get CAN message name from DBC if available
-        can_id_name = ""
-        if self.dbc_manager.can_db:
-            try:
-                message = self.dbc_manager.can_db.get_message_by_frame_id(can_id)
-                can_id_name = f"\t<{message.name}>"
-            except Exception:
-                can_id_name = ""
+    def toggle_logging(self):
+        """
+        Start logging to a trace file chosen by the user, or stop the active logger.
+        """
+        if self.trace_logger:
+            trace_logger = self.trace_logger
+            self.trace_logger = None
+            trace_logger.stop()
+            self.logging_button.setText("Start Logging")
+            self.logging_status_label.setText(f"Saved {trace_logger.frames_written} frames to {os.path.basename(trace_logger.file_path)}")
+            print(f"[DEBUG] Logging stopped: {trace_logger.file_path}")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Log To File", "", "Infinity Trace (*.bin);;Vector ASC (*.asc);;Vector BLF (*.blf)"
+        )
+        if not file_path:
+            return
+
+        try:
+            trace_logger = TraceLogger(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open log file: {e}")
+            return
+
+        trace_logger.start()
+        self.trace_logger = trace_logger
+        self.logging_button.setText("Stop Logging")
+        print(f"[DEBUG] Logging started: {file_path}")
+
+    def open_trace_file(self):
+        """
+        Open a recorded trace through mmap and show it in the CAN Messages table.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Trace", "", "Infinity Trace (*.bin);;All Files (*)")
+        if not file_path:
+            return
+
+        try:
+            trace_reader = TraceReader(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open trace: {e}")
+            return
+
+        self.close_trace_reader()
+        self.trace_reader = trace_reader
+        self.can_message_table.set_store(trace_reader)
+        self.submit_decode()
+        self.show_live_button.setEnabled(True)
+        self.trace_seek_button.setEnabled(True)
+        self.export_decoded_button.setEnabled(True)
+        self.trace_status_label.setText(
+            f"{os.path.basename(file_path)}: {len(trace_reader)} frames, {trace_reader.duration:.1f} s"
+        )
+        self.tab_widget.setCurrentWidget(self.can_messages_tab)
+        print(f"[DEBUG] Opened trace {file_path} ({len(trace_reader)} frames)")
+
+    def show_live_capture(self):
+        """
+        Switch the CAN Messages table back to the live capture.
+        """
+        self.can_message_table.set_store(self.capture_store)
+        self.submit_decode()
+        self.close_trace_reader()
+        self.show_live_button.setEnabled(False)
+        self.trace_seek_button.setEnabled(False)
+        self.export_decoded_button.setEnabled(False)
+        self.trace_status_label.setText("Showing live capture")
+
+    def export_decoded_trace(self):
+        """
+        Decode every DBC-known frame of the open trace into a CSV file on the decode workers.
+        """
+        if self.decode_trace_thread and self.decode_trace_thread.isRunning():
+            self.decode_trace_thread.cancel()
+            return
+        if not self.trace_reader:
+            return
+        if not self.dbc_manager.can_db:
+            QMessageBox.warning(self, "Export Decoded", "Load a DBC file first.")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Decoded Trace", "", "CSV Files (*.csv)")
+        if not file_path:
+            return
+
+        self.decode_trace_thread = DecodeTraceThread(
+            self.start_decode_pool(), self.trace_reader.file_path, len(self.trace_reader), file_path
+        )
+        self.decode_trace_thread.progress.connect(
+            lambda percent: self.trace_status_label.setText(f"Decoding trace {percent}%")
+        )
+        self.decode_trace_thread.finished_decoding.connect(self.on_trace_decoded)
+        self.decode_trace_started = time.time()
+        self.export_decoded_button.setText("Cancel Export")
+        self.decode_trace_thread.start()
+
+    def on_trace_decoded(self, success, message):
+        self.export_decoded_button.setText("Export Decoded")
+        self.trace_status_label.setText(message)
+        if success:
+            print(f"[DEBUG] {message} in {time.time() - self.decode_trace_started:.2f} seconds")
+        else:
+            print(f"[ERROR] {message}")
+        if not self.decode_workers_checkbox.isChecked():
+            self.stop_decode_pool()
+
+    def close_trace_reader(self):
+        if self.trace_reader:
+            self.trace_reader.close()
+            self.trace_reader = None
 
-        raw_data_str = " ".join(f"0x{byte:02X}" for byte in data)
-        raw_data_str += can_id_name + "\n"
+    def seek_trace(self):
+        """
+        Jump to the first frame at or after the entered time, relative to the start of the trace.
+        """
+        if not self.trace_reader or not len(self.trace_reader):
+            return
+        try:
+            offset = float(self.trace_seek_edit.text())
+        except ValueError:
+            print("[ERROR] Invalid seek time.")
+            return
+
+        store_index = self.trace_reader.index_for_time(float(self.trace_reader.block_min.min()) + offset)
+        store_index = min(store_index, len(self.trace_reader) - 1)
+        if not self.can_message_table.scroll_to_store_index(store_index):
+            print("[WARNING] Seeking is only available with Overwrite Data off.")
+
+    def toggle_replay(self):
+        """
+        Start replaying a trace file through the live pipeline, or stop the running replay.
+        """
+        if self.replay_engine:
+            self.stop_replay()
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(self, "Replay Trace", "", "Infinity Trace (*.bin);;All Files (*)")
+        if not file_path:
+            return
+
+        try:
+            replay_reader = TraceReader(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open trace: {e}")
+            return
+
+        transmit_callback = self.retransmit_frames if self.replay_transmit_checkbox.isChecked() else None
+        self.replay_engine = ReplayEngine(
+            replay_reader,
+            self.on_message_received,
+            speed=self.replay_speed_combo.currentData(),
+            loop=self.replay_loop_checkbox.isChecked(),
+            transmit_callback=transmit_callback,
+            backlog=self.can_message_queue.qsize
+        )
+        self.replay_engine.start()
+        self.replay_button.setText("Stop Replay")
+        self.replay_pause_button.setEnabled(True)
+        self.replay_seek_button.setEnabled(True)
+        print(f"[DEBUG] Replaying {file_path} at {self.replay_speed_combo.currentText()}")
 
-        if error:
-            decoded_data_str = f"Decoding Error: {error}"
+    def stop_replay(self):
+        """
+        Stop the running replay and release its trace file.
+        """
+        replay_engine = self.replay_engine
+        self.replay_engine = None
+        replay_engine.stop()
+        replay_engine.trace_reader.close()
+        self.replay_button.setText("Replay Trace")
+        self.replay_pause_button.setText("Pause")
+        self.replay_pause_button.setEnabled(False)
+        self.replay_seek_button.setEnabled(False)
+        self.replay_status_label.setText(f"Replayed {replay_engine.frames_replayed} frames")
+
+    def toggle_replay_pause(self):
+        if not self.replay_engine:
+            return
+        if self.replay_engine.is_paused():
+            self.replay_engine.resume()
+            self.replay_pause_button.setText("Pause")
         else:
-            decoded_data_str = "\n".join([f"{signal}: {value}" for signal, value in decoded_signals.items()])
+            self.replay_engine.pause()
+            self.replay_pause_button.setText("Resume")
+
+    def seek_replay(self):
+        if not self.replay_engine:
+            return
+        try:
+            self.replay_engine.seek(float(self.replay_seek_edit.text()))
+        except ValueError:
+            print("[ERROR] Invalid seek time.")
 
-        return f"{raw_data_str}\n{decoded_data_str}"
+    def retransmit_frames(self, frames):
+        """
+        Send replayed frames on the active bus as one batch.
+        """
+        self.send_frame_manager.send_frames(frames)
+
+    def task_replay_update(self):
+        """
+        Update the replay status label every second.
+        """
+        if not self.replay_engine:
+            return
+
+        if self.replay_engine.finished:
+            self.stop_replay()
+            return
+
+        self.replay_status_label.setText(
+            f"{self.replay_engine.progress():.1f} s | {self.replay_engine.frames_replayed} frames | "
+            f"loop {self.replay_engine.loops_completed} | max lateness {self.replay_engine.max_lateness * 1000:.2f} ms"
+        )
+
+    def task_statistics_update(self):
+        """
+        Refresh the Statistics tab every second while it is visible.
+        """
+        if self.tab_widget.currentWidget() is self.statistics_tab:
+            self.can_statistics_table.update_statistics(self.id_statistics)
+
+    def task_logging_update(self):
+        """
+        Update the logging status label every second.
+        """
+        if not self.trace_logger:
+            return
+
+        stats = self.trace_logger.stats()
+        self.logging_status_label.setText(
+            f"{stats['frames_written']} frames | {stats['bytes_written'] / 1e6:.1f} MB | "
+            f"{stats['frames_per_second']:.0f} fps | queue {stats['queue_depth']} | "
+            f"dropped {stats['dropped_frames']}"
+        )
+
+    def decode_data(self, can_id, data):
+        """
+        Decode the CAN message using the DBCManager and return the formatted data string.
+        """
+        return self.dbc_manager.decode_text(can_id, bytes(data))
 
     def task_1s(self):
         """
         Tasks runs for every second.
         """
         self.task_fps_update()
+        self.task_statistics_update()
+        self.task_logging_update()
+        self.task_replay_update()
+        self.task_cyclic_update()
+        self.task_latency_update()
+        self.task_filter_update()
+        self.task_trigger_update()
+        self.task_channel_update()
+
+    def task_channel_update(self):
+        """
+        List the open channels with their frame count, frame rate and 1s bus load every second.
+        """
+        channels = []
+        if self.connection_manager.is_connected():
+            channels.append((0, self.main_connection_description))
+        channels += [(channel, description) for channel, (_, description) in sorted(self.channel_connections.items())]
+
+        frames_received = self.channel_merger.stats()
+        selected = self.channel_list.currentItem().data(Qt.UserRole) if self.channel_list.currentItem() else None
+        self.channel_list.clear()
+        for channel, description in channels:
+            count = frames_received.get(channel, 0)
+            fps = count - self.channel_frames_last.get(channel, count)
+            self.channel_frames_last[channel] = count
+            bus_load = self.bus_load if channel == 0 else self.channel_bus_loads.get(channel)
+            load = bus_load.load(1.0) if bus_load else 0.0
+            self.channel_list.addItem(f"Ch {channel}: {description} | {count} frames | {fps} fps | {load:.1f}%")
+            item = self.channel_list.item(self.channel_list.count() - 1)
+            item.setData(Qt.UserRole, channel)
+            if channel == selected:
+                self.channel_list.setCurrentItem(item)
+
+    def task_trigger_update(self):
+        """
+        Show the trigger state and how many frames it has buffered and released every second.
+        """
+        if not self.triggered_capture:
+            return
+
+        stats = self.triggered_capture.stats()
+        if stats["state"] == trigger_state.ARMED:
+            state = f"Armed, {stats['buffered']} frames buffered"
+        elif stats["state"] == trigger_state.TRIGGERED:
+            state = f"Triggered at {stats['trigger_time']:.6f}, capturing"
+        else:
+            state = "Captured, arm again or disarm to resume"
+        self.trigger_status_label.setText(
+            f"{state} | {stats['triggers']} triggers | {stats['released']} frames released"
+        )
+
+    def task_latency_update(self):
+        """
+        Show p50/p99/max probe latency per connection type every second.
+        """
+        if not self.latency_probe:
+            return
+
+        lines = []
+        histogram_lines = []
+        for connection_type, stats in sorted(self.latency_probe.stats().items()):
+            lines.append(
+                f"{connection_type}: sent {stats['sent']}, received {stats['received']}, lost {stats['lost']} | "
+                f"p50 {stats['p50'] * 1000:.3f} ms, p99 {stats['p99'] * 1000:.3f} ms, max {stats['max'] * 1000:.3f} ms"
+            )
+            counts, edges = self.latency_probe.histogram(connection_type, bins=10)
+            histogram_lines.append(connection_type)
+            for count, low, high in zip(counts, edges[:-1], edges[1:]):
+                histogram_lines.append(f"  {low * 1000:8.3f} - {high * 1000:8.3f} ms: {count}")
+        if lines:
+            self.latency_status_label.setText("\n".join(lines))
+            self.latency_status_label.setToolTip("\n".join(histogram_lines))
+
+    def task_filter_update(self):
+        """
+        Show how many frames pass the display filter.
+        """
+        model = self.can_message_table.model
+        if model.display_filter is None:
+            return
+        if model.overwrite or model.interpret:
+            self.display_filter_status_label.setText(f"{model.rowCount()} IDs match")
+        else:
+            self.display_filter_status_label.setText(
+                f"{model.row_count} of {len(model.store) - model.row_offset} frames match"
+            )
+
+    def task_cyclic_update(self):
+        """
+        Report the send count and jitter of the cyclic tasks every second.
+        """
+        stats = self.cyclic_scheduler.stats()
+        if not stats:
+            return
+
+        for row, task_stats in stats.items():
+            self.send_frames_table.cellWidget(row, 12).setToolTip(
+                f"{task_stats['sent']} sent, {task_stats['missed']} missed\n"
+                f"Mean interval {task_stats['mean_interval'] * 1000:.3f} ms\n"
+                f"Jitter {task_stats['jitter'] * 1000:.3f} ms, "
+                f"max deviation {task_stats['max_deviation'] * 1000:.3f} ms"
+            )
+        self.cyclic_status_label.setText(
+            f"Cyclic tasks: {len(stats)} | "
+            f"sent {sum(task_stats['sent'] for task_stats in stats.values())} | "
+            f"max jitter {max(task_stats['jitter'] for task_stats in stats.values()) * 1000:.3f} ms | "
+            f"max deviation {max(task_stats['max_deviation'] for task_stats in stats.values()) * 1000:.3f} ms"
+        )
 
     def task_fps_update(self):
         """
         Update the FPS label every second.
         """
         self.fps_value_label.setText(f"{self.frames_in_last_second}")
+        if not self.frames_in_last_second and self.bus_load.latest_bucket is not None:
+            self.bus_load.clear()
+            for bus_load in self.channel_bus_loads.values():
+                bus_load.clear()
+            self.task_bus_load_update()
         self.frames_in_last_second = 0
 
-    def calculate_timestamp_diff(self, first_timestamp, current_timestamp):
+    def add_bus_load(self, frames):
         """
-        Calculate the timestamp difference in microseconds.
+        Count the frames towards the bus load of their channel. Every channel is its own bus.
         """
-        self.timestamp_offset = current_timestamp - first_timestamp
+        if not frames["channel"].any():
+            self.bus_load.add(frames)
+            return
+        for channel in np.unique(frames["channel"]).tolist():
+            channel_frames = frames[frames["channel"] == channel]
+            if channel == 0:
+                self.bus_load.add(channel_frames)
+                continue
+            bus_load = self.channel_bus_loads.get(channel)
+            if bus_load is None:
+                bus_load = self.channel_bus_loads[channel] = BusLoadEstimator(
+                    self.bus_load.bitrate, exact=self.bus_load.exact
+                )
+            bus_load.add(channel_frames)
 
-    def task_1ms(self):
+    def task_bus_load_update(self):
         """
-        Dequeue messages from the thread-safe queue and update the GUI in batches.
+        Update the bus load label from the rolling windows.
         """
-        while not self.can_message_queue.empty():
-            try:
-                msg = self.can_message_queue.get_nowait()
-
-                self.can_msg_list.append(msg)
-
-                self.total_frames_captured += 1
-                self.total_frames_value_label.setText(f"{self.total_frames_captured}")
+        self.bus_load_value_label.setText(
+            " / ".join(f"{self.bus_load.load(window):.1f}%" for window in self.bus_load_windows)
+        )
 
-                if not self.overwrite_checkbox.isChecked() and self.first_timestamp is None:
-                    self.first_timestamp = msg.timestamp
-                    self.calculate_timestamp_diff(self.first_timestamp, time.time())
-                    print(f"[DEBUG] TimeDiff: {self.timestamp_offset}")
+    def task_refresh(self):
+        """
+        Runs once per display frame. Take at most as many frames as refresh_budget seconds
+        of processing allow, apply them to the table as one batch and update the labels once.
+        The per-frame cost is measured on every tick. Frames beyond the limit are carried
+        over, together with whatever is left in the queue, to the next tick.
+        """
+        self.channel_merger.flush()
+        started = time.perf_counter()
+        deadline = started + self.refresh_budget
+        frame_limit = max(self.min_refresh_frames, int(self.refresh_budget / self.refresh_frame_cost))
+        batches = [self.refresh_backlog] if self.refresh_backlog is not None else []
+        count = len(self.refresh_backlog) if self.refresh_backlog is not None else 0
+        while count < frame_limit and time.perf_counter() < deadline:
+            try:
+                batch = self.can_message_queue.get_nowait()
+            except queue.Empty:
+                break
+            batches.append(batch)
+            count += len(batch)
 
-                can_id = msg.arbitration_id
-                if self.overwrite_checkbox.isChecked():
-                    if can_id in self.last_timestamps:
-                        timestamp_diff = msg.timestamp - self.last_timestamps[can_id]
-                    else:
-                        timestamp_diff = 0.0
-                    self.last_timestamps[can_id] = msg.timestamp
-                else:
-                    if self.first_timestamp is not None:
-                        timestamp_diff = msg.timestamp - self.first_timestamp
-                    else:
-                        timestamp_diff = 0.0
-
-                if timestamp_diff < 0:
-                    timestamp_diff = 0.0
-                    self.first_timestamp = msg.timestamp
-                    self.calculate_timestamp_diff(self.first_timestamp, time.time())
-
-                if not msg.is_rx:
-                    if (self.overwrite_checkbox.isChecked() or self.interpret_frames_checkbox.isChecked()):
-                        continue
-                    else:
-                        if timestamp_diff != 0:
-                            if self.first_timestamp < 0:
-                                timestamp_diff += self.timestamp_offset
-                            else:
-                                timestamp_diff -= self.timestamp_offset
-
-                if self.overwrite_checkbox.isChecked():
-                    timestamp = int(timestamp_diff * 1000)
-                else:
-                    timestamp = int(timestamp_diff * 1000000)
+        if self.decode_pool:
+            self.task_decode_update()
 
-                timestamp = f"{timestamp}"
+        if not batches:
+            return
 
-                extended = "1" if msg.is_extended_id else "0"
-                rtr = "1" if msg.is_remote_frame else "0"
-                direction = "Rx" if msg.is_rx else "Tx"
-                dlc = msg.dlc
+        frames = batches[0] if len(batches) == 1 else np.concatenate(batches)
+        self.refresh_backlog = frames[frame_limit:] if len(frames) > frame_limit else None
+        frames = frames[:frame_limit]
+        processing_started = time.perf_counter()
+        start = self.capture_store.append(frames)
+        self.id_statistics.update(frames)
+        self.add_bus_load(frames)
+        self.task_bus_load_update()
+        self.total_frames_captured += len(frames)
+        self.total_frames_value_label.setText(f"{self.total_frames_captured}")
+        if self.can_message_table.model.store is self.capture_store:
+            rows = self.can_message_table.append_frames(start, start + len(frames))
+            self.submit_decode(rows)
+        if len(frames) >= self.min_refresh_frames:
+            frame_cost = (time.perf_counter() - processing_started) / len(frames)
+            self.refresh_frame_cost = 0.8 * self.refresh_frame_cost + 0.2 * frame_cost
 
-                if self.interpret_frames_checkbox.isChecked():
-                    data_column_content = self.decode_data(can_id, msg.data)
-                else:
-                    raw_data_str = " ".join(f"0x{byte:02X}" for byte in msg.data)
-                    data_column_content = f"{raw_data_str}"
-
-                over_write_mode = False
-                if self.overwrite_checkbox.isChecked() or self.interpret_frames_checkbox.isChecked():
-                    over_write_mode = True
-                
-                self.can_message_table.update_table(
-                    timestamp=timestamp,
-                    can_id=f"0x{can_id:X}",
-                    extended=extended,
-                    rtr=rtr,
-                    direction=direction,
-                    dlc=dlc,
-                    data=data_column_content,
-                    overwrite=over_write_mode
-                )
-            except queue.Empty:
-                pass
-    
     def task_msg_check(self):
         """
         Check if the CAN message is received and process it.
@@ -911,7 +1949,19 @@ class CANMessageUI(QWidget):
         )
 
         if reply == QMessageBox.Yes:
+            if self.replay_engine:
+                self.stop_replay()
+            self.cyclic_scheduler.stop()
+            if self.latency_probe:
+                self.latency_probe.stop()
+            self.stop_decode_pool()
             self.connection_manager.disconnect()
+            for connection_manager, _ in self.channel_connections.values():
+                connection_manager.disconnect()
+            self.channel_connections = {}
+            if self.trace_logger:
+                self.trace_logger.stop()
+                self.trace_logger = None
 
             print("[DEBUG] Exiting application...")
             return True
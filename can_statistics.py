@@ -0,0 +1,165 @@
+import numpy as np
+from can_enums import frame_flag
+
+
+class IDStatistics:
+    """
+    Incremental per-channel, per-ID statistics: frame count, mean/min/max period, period jitter, DLC
+    changes and the last payload. Every statistic lives in a NumPy array indexed by a
+    per-ID slot, and whole frame batches are folded in with vectorized group operations.
+    Period mean and variance are combined per batch with the parallel form of Welford's
+    algorithm.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize the IDStatistics with room for capacity IDs.
+        """
+        self.initial_capacity = max(1, capacity)
+        self.clear()
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.size = 0
+        self.capacity = self.initial_capacity
+        self.sorted_keys = np.zeros(0, dtype=np.uint64)
+        self.sorted_slots = np.zeros(0, dtype=np.int64)
+        self.keys = np.zeros(self.capacity, dtype=np.uint64)
+        self.count = np.zeros(self.capacity, dtype=np.int64)
+        self.period_count = np.zeros(self.capacity, dtype=np.int64)
+        self.period_mean = np.zeros(self.capacity, dtype=np.float64)
+        self.period_m2 = np.zeros(self.capacity, dtype=np.float64)
+        self.period_min = np.full(self.capacity, np.inf)
+        self.period_max = np.zeros(self.capacity, dtype=np.float64)
+        self.last_timestamp = np.zeros(self.capacity, dtype=np.float64)
+        self.last_dlc = np.zeros(self.capacity, dtype=np.uint8)
+        self.dlc_changes = np.zeros(self.capacity, dtype=np.int64)
+        self.last_data = np.zeros((self.capacity, 8), dtype=np.uint8)
+
+    @staticmethod
+    def frame_keys(frames):
+        """
+        Return the statistics key of every frame: the channel and the extended flag above the
+        32-bit CAN ID.
+        """
+        extended = (frames["flags"] & frame_flag.EXTENDED).astype(np.uint64)
+        channel = frames["channel"].astype(np.uint64)
+        return (channel << np.uint64(33)) | (extended << np.uint64(32)) | frames["arbitration_id"].astype(np.uint64)
+
+    def _grow(self, required):
+        capacity = self.capacity
+        while capacity < required:
+            capacity *= 2
+        for name in ("keys", "count", "period_count", "period_mean", "period_m2", "period_min",
+                     "period_max", "last_timestamp", "last_dlc", "dlc_changes", "last_data"):
+            old = getattr(self, name)
+            fill = np.inf if name == "period_min" else 0
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def _slots(self, keys):
+        """
+        Map keys to slots, allocating slots for keys seen for the first time.
+        """
+        unique_keys = np.unique(keys)
+        positions = np.searchsorted(self.sorted_keys, unique_keys)
+        known = positions < len(self.sorted_keys)
+        known[known] = self.sorted_keys[positions[known]] == unique_keys[known]
+
+        new_keys = unique_keys[~known]
+        if len(new_keys):
+            first_slot = self.size
+            if self.size + len(new_keys) > self.capacity:
+                self._grow(self.size + len(new_keys))
+            new_slots = np.arange(first_slot, first_slot + len(new_keys), dtype=np.int64)
+            self.keys[new_slots] = new_keys
+            self.size += len(new_keys)
+            order = np.argsort(self.keys[:self.size], kind="stable")
+            self.sorted_keys = self.keys[:self.size][order]
+            self.sorted_slots = order.astype(np.int64)
+
+        return self.sorted_slots[np.searchsorted(self.sorted_keys, keys)]
+
+    def update(self, frames):
+        """
+        Fold a frame batch into the statistics.
+        """
+        if not len(frames):
+            return
+
+        slots = self._slots(self.frame_keys(frames))
+        order = np.argsort(slots, kind="stable")
+        slots = slots[order]
+        timestamps = frames["timestamp"][order]
+        dlcs = frames["dlc"][order]
+
+        starts = np.flatnonzero(np.r_[True, slots[1:] != slots[:-1]])
+        ends = np.r_[starts[1:], len(slots)] - 1
+        group_slots = slots[starts]
+        groups = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(slots)]))
+
+        previous_timestamps = np.empty_like(timestamps)
+        previous_timestamps[1:] = timestamps[:-1]
+        previous_timestamps[starts] = self.last_timestamp[group_slots]
+        previous_dlcs = np.empty_like(dlcs)
+        previous_dlcs[1:] = dlcs[:-1]
+        previous_dlcs[starts] = self.last_dlc[group_slots]
+        has_previous = np.ones(len(slots), dtype=bool)
+        has_previous[starts] = self.count[group_slots] > 0
+
+        periods = np.where(has_previous, timestamps - previous_timestamps, 0.0)
+        batch_count = np.bincount(groups, weights=has_previous, minlength=len(starts))
+        batch_sum = np.bincount(groups, weights=periods, minlength=len(starts))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            batch_mean = np.where(batch_count > 0, batch_sum / batch_count, 0.0)
+        deviations = np.where(has_previous, periods - batch_mean[groups], 0.0)
+        batch_m2 = np.bincount(groups, weights=deviations * deviations, minlength=len(starts))
+
+        old_count = self.period_count[group_slots].astype(np.float64)
+        total = old_count + batch_count
+        delta = batch_mean - self.period_mean[group_slots]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.period_mean[group_slots] = np.where(total > 0, self.period_mean[group_slots] + delta * batch_count / total, 0.0)
+            self.period_m2[group_slots] += np.where(total > 0, batch_m2 + delta * delta * old_count * batch_count / total, 0.0)
+        self.period_count[group_slots] = total.astype(np.int64)
+
+        self.period_min[group_slots] = np.minimum(self.period_min[group_slots], np.minimum.reduceat(np.where(has_previous, periods, np.inf), starts))
+        self.period_max[group_slots] = np.maximum(self.period_max[group_slots], np.maximum.reduceat(periods, starts))
+        self.dlc_changes[group_slots] += np.bincount(groups, weights=has_previous & (dlcs != previous_dlcs), minlength=len(starts)).astype(np.int64)
+
+        self.count[group_slots] += ends - starts + 1
+        self.last_timestamp[group_slots] = timestamps[ends]
+        self.last_dlc[group_slots] = dlcs[ends]
+        self.last_data[group_slots] = frames["data"][order[ends]]
+
+    def jitter(self):
+        """
+        Return the standard deviation of the period of every slot.
+        """
+        counts = self.period_count[:self.size]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 1, np.sqrt(self.period_m2[:self.size] / np.maximum(counts - 1, 1)), 0.0)
+
+    def snapshot(self):
+        """
+        Return a copy of every statistic for the known IDs, sorted by channel and ID.
+        """
+        slots = self.sorted_slots
+        keys = self.keys[slots]
+        return {
+            "channel": (keys >> np.uint64(33)).astype(np.uint8),
+            "arbitration_id": (keys & np.uint64(0xFFFFFFFF)).astype(np.uint32),
+            "extended": ((keys >> np.uint64(32)) & np.uint64(1)).astype(bool),
+            "count": self.count[slots].copy(),
+            "period_mean": self.period_mean[slots].copy(),
+            "period_min": np.where(np.isinf(self.period_min[slots]), 0.0, self.period_min[slots]),
+            "period_max": self.period_max[slots].copy(),
+            "jitter": self.jitter()[slots],
+            "dlc_changes": self.dlc_changes[slots].copy(),
+            "last_dlc": self.last_dlc[slots].copy(),
+            "last_data": self.last_data[slots].copy(),
+        }
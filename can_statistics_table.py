@@ -0,0 +1,117 @@
+from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
+from PySide6.QtWidgets import QTableView, QHeaderView
+
+
+class CANStatisticsTableModel(QAbstractTableModel):
+    def __init__(self, headers, parent=None):
+        """
+        Initialize the CANStatisticsTableModel.
+        """
+        super().__init__(parent)
+        self.headers = headers
+        self.snapshot = None
+        self.row_count = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Return the number of rows in the table.
+        """
+        return self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Return the number of columns in the table.
+        """
+        return len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """
+        Return the data for a given cell, formatted from the latest statistics snapshot.
+        """
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+
+        row = index.row()
+        column = index.column()
+        snapshot = self.snapshot
+        if column == 0:
+            return str(int(snapshot["channel"][row]))
+        if column == 1:
+            return f"0x{int(snapshot['arbitration_id'][row]):X}"
+        if column == 2:
+            return "1" if snapshot["extended"][row] else "0"
+        if column == 3:
+            return str(int(snapshot["count"][row]))
+        if column == 4:
+            return f"{snapshot['period_mean'][row] * 1000:.3f}"
+        if column == 5:
+            return f"{snapshot['period_min'][row] * 1000:.3f}"
+        if column == 6:
+            return f"{snapshot['period_max'][row] * 1000:.3f}"
+        if column == 7:
+            return f"{snapshot['jitter'][row] * 1000:.3f}"
+        if column == 8:
+            return str(int(snapshot["dlc_changes"][row]))
+        if column == 9:
+            dlc = min(int(snapshot["last_dlc"][row]), 8)
+            return " ".join(f"0x{byte:02X}" for byte in snapshot["last_data"][row][:dlc].tolist())
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """
+        Return the header data for the table.
+        """
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+
+        return None
+
+    def update_statistics(self, snapshot):
+        """
+        Replace the displayed statistics with a new snapshot.
+        """
+        row_count = len(snapshot["count"])
+        if row_count != self.row_count:
+            self.beginResetModel()
+            self.snapshot = snapshot
+            self.row_count = row_count
+            self.endResetModel()
+        else:
+            self.snapshot = snapshot
+            if row_count:
+                self.dataChanged.emit(self.index(0, 0), self.index(row_count - 1, len(self.headers) - 1))
+
+
+class CANStatisticsTable(QTableView):
+    def __init__(self, parent=None):
+        """
+        Initialize the CANStatisticsTable as a QTableView with a statistics model.
+        """
+        super().__init__(parent)
+
+        self.headers = ["Ch", "ID", "Ext", "Count", "Mean (ms)", "Min (ms)", "Max (ms)", "Jitter (ms)", "DLC Changes", "Last Data"]
+
+        self.model = CANStatisticsTableModel(self.headers)
+        self.setModel(self.model)
+
+        self.setAlternatingRowColors(True)
+        self.setStyleSheet("""
+            QTableView {
+                background-color: #1F1F1F;
+                alternate-background-color: #2E2E2E;
+                gridline-color: #707070;
+                color: white;
+                border: 1px solid #4F4F4F;
+            }
+        """)
+
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSectionResizeMode(len(self.headers) - 1, QHeaderView.Stretch)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
+    def update_statistics(self, statistics):
+        """
+        Show the current state of an IDStatistics engine.
+        """
+        self.model.update_statistics(statistics.snapshot())
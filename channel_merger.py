@@ -0,0 +1,187 @@
+import numpy as np
+import threading
+import time
+from collections import deque
+from bus_clock import BusClock, host_offset
+
+
+class ChannelState:
+    """
+    Per-channel merge state: frames waiting for release, the newest timestamp seen and the
+    shift onto the merged clock.
+    """
+
+    def __init__(self, channel):
+        """
+        Initialize the ChannelState.
+        """
+        self.channel = channel
+        self.pending = []
+        self.arrivals = []
+        self.latest = -np.inf
+        self.last_arrival = None
+        self.host_offset = None
+        self.shift = None
+        self.frames_received = 0
+
+
+class ChannelMerger:
+    """
+    Merges the frame batches of several channels into one timestamp-ordered stream.
+
+    Every channel delivers its batches from its own reader thread through push(). The
+    frames are tagged with the channel number and, while more than one channel is
+    registered, held back until no live channel can still deliver an earlier frame: frames
+    up to the lowest newest-timestamp of the channels heard from within max_lag are
+    released together, sorted by timestamp. A channel that goes quiet stops holding the
+    others back after max_lag, and no frame is held longer than max_lag, so a slow or
+    stalled channel never delays the rest by more than that.
+
+    Channels on different adapters tick on different clocks. The merged clock is the BusClock:
+    the first channel to deliver frames fixes its host offset and keeps its timestamps, and
+    every other channel is shifted by the difference between its own and that offset to the
+    host clock, measured on its first batch. Timestamps within a second of the host clock are
+    taken as host time, so channels that already share it are not shifted. Transmitted frames
+    are moved onto the same clock with BusClock.align_host().
+    With a single registered channel, batches pass straight through.
+
+    The callback is never called with the merge lock held. Released batches are queued in an
+    outbox and delivered in order by whichever thread is not already delivering, so a slow
+    callback on one reader thread does not block the push() of the others.
+    """
+
+    def __init__(self, callback, max_lag=0.05, clock=None):
+        """
+        Initialize the ChannelMerger.
+        """
+        self.callback = callback
+        self.max_lag = max_lag
+        self.clock = clock or BusClock()
+        self.channels = {}
+        self.outbox = deque()
+        self._lock = threading.Lock()
+        self._delivery_lock = threading.Lock()
+
+    def add_channel(self, channel):
+        """
+        Register a channel before it delivers frames, so that the other channels wait up to
+        max_lag for its first batch.
+        """
+        with self._lock:
+            if channel not in self.channels:
+                state = self.channels[channel] = ChannelState(channel)
+                state.last_arrival = time.monotonic()
+
+    def remove_channel(self, channel):
+        """
+        Unregister a channel and release whatever it still had pending.
+        """
+        with self._lock:
+            state = self.channels.pop(channel, None)
+            if state and state.pending:
+                self._emit([np.concatenate(state.pending)])
+            if not self.channels:
+                self.clock.reset()
+        self._deliver()
+
+    def push(self, channel, frames):
+        """
+        Tag a batch received on channel and merge it into the stream. Called from the reader
+        thread of the channel.
+        """
+        if not len(frames):
+            return
+        frames["channel"] = channel
+        now = time.monotonic()
+
+        with self._lock:
+            state = self.channels.get(channel)
+            if state is None:
+                state = self.channels[channel] = ChannelState(channel)
+            state.frames_received += len(frames)
+            self._align(state, frames)
+
+            if len(self.channels) == 1 and not state.pending:
+                self.outbox.append(frames)
+            else:
+                state.pending.append(frames)
+                state.arrivals.append(now)
+                state.latest = max(state.latest, float(frames["timestamp"][-1]))
+                state.last_arrival = now
+                self._release(now)
+        self._deliver()
+
+    def flush(self):
+        """
+        Release the frames that have waited max_lag. Call periodically so quiet periods do not
+        hold the last frames back.
+        """
+        with self._lock:
+            if any(state.pending for state in self.channels.values()):
+                self._release(time.monotonic())
+        self._deliver()
+
+    def _align(self, state, frames):
+        """
+        Shift a batch onto the merged clock.
+        """
+        if state.shift is None:
+            state.host_offset = host_offset(frames)
+            state.shift = state.host_offset - self.clock.reference(state.host_offset)
+        if state.shift:
+            frames["timestamp"] += state.shift
+
+    def _release(self, now):
+        live = [
+            state.latest for state in self.channels.values()
+            if state.last_arrival is not None and now - state.last_arrival < self.max_lag
+        ]
+        watermark = min(live) if live else np.inf
+
+        ready = []
+        for state in self.channels.values():
+            if not state.pending:
+                continue
+            frames = state.pending[0] if len(state.pending) == 1 else np.concatenate(state.pending)
+            batch_ends = np.cumsum([len(batch) for batch in state.pending])
+            expired = int(np.searchsorted(state.arrivals, now - self.max_lag, side="right"))
+            cut = int(np.searchsorted(frames["timestamp"], watermark, side="right"))
+            if expired:
+                cut = max(cut, int(batch_ends[expired - 1]))
+            if cut:
+                ready.append(frames[:cut])
+            if cut < len(frames):
+                first_batch = int(np.searchsorted(batch_ends, cut, side="right"))
+                state.pending = [frames[cut:]]
+                state.arrivals = [state.arrivals[first_batch]]
+            else:
+                state.pending = []
+                state.arrivals = []
+        self._emit(ready)
+
+    def _emit(self, ready):
+        if not ready:
+            return
+        frames = ready[0] if len(ready) == 1 else np.concatenate(ready)
+        if len(ready) > 1:
+            frames = frames[np.argsort(frames["timestamp"], kind="stable")]
+        self.outbox.append(frames)
+
+    def _deliver(self):
+        """
+        Hand the outbox to the callback in order, outside the merge lock. If another thread is
+        already delivering, it picks up the batches queued here.
+        """
+        while self.outbox and self._delivery_lock.acquire(blocking=False):
+            try:
+                while self.outbox:
+                    self.callback(self.outbox.popleft())
+            finally:
+                self._delivery_lock.release()
+
+    def stats(self):
+        """
+        Return the number of frames received per channel.
+        """
+        with self._lock:
+            return {channel: state.frames_received for channel, state in self.channels.items()}
@@ -1,77 +1,254 @@
 import can
 import json
-import pickle
+import os
 import serial
-import struct
+import select
 import socket
 import sys
-from can_enums import connect_enum
+from acceptance_filter import acceptance_mask
+from can_enums import connect_enum, frame_flag, reader_mode
 from PySide6.QtCore import QThread, Signal
+from capture_store import empty_frames, frames_from_messages
+from latency_probe import probe_clock
+from udp_protocol import UDPFrameDecoder
+import numpy as np
 import logging
 logger = logging.getLogger(__name__)
 
+ACAN_RECORD_DTYPE = np.dtype([
+    ("stx", "u1"),
+    ("timestamp", "<u4"),
+    ("dlc", "u1"),
+    ("arbitration_id", "<u4"),
+    ("data", "u1", (8,)),
+    ("etx", "u1"),
+])
+ACAN_STX = 0xAA
+ACAN_ETX = 0xBB
+
 class SerialReaderThread(QThread):
-    frame_received = Signal(bytes)
+    frames_received = Signal(bytes, float)
 
-    def __init__(self, serial_port, frame_size=19):
+    def __init__(self, serial_port, frame_size=19, buffer_size=65536, mode=reader_mode.POLLING, latency_ms=2.0,
+                 can_filters=None):
         super().__init__()
         self.serial_port = serial_port
         self._running = True
         self.frame_size = frame_size
-        self.buffer = bytearray()
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.head = 0
+        self.tail = 0
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.idle_timeout = 0.1
+        self.max_chunk = 4096
+        self.can_filters = can_filters or []
+        self.frames_filtered = 0
 
     def run(self):
+        if self.mode == reader_mode.BLOCKING:
+            self._run_blocking()
+        else:
+            self._run_polling()
+
+    def _run_polling(self):
         while self._running and self.serial_port and self.serial_port.is_open:
             try:
-                available = self.serial_port.in_waiting
+                available = min(self.serial_port.in_waiting, self._reserve())
                 to_read = (available // self.frame_size) * self.frame_size
                 if to_read > 0:
                     data = self.serial_port.read(to_read)
-                    self.buffer.extend(data)
-                    self._extract_frames()
+                    arrival = probe_clock()
+                    self._push(data)
+                    self._extract_frames(arrival)
+            except Exception as e:
+                print(f"[ERROR] Serial read error: {e}")
+                break
+
+    def _run_blocking(self):
+        """
+        Sleep in the kernel until the port becomes readable, then let a chunk fill for at most
+        the latency target before parsing it. An idle bus costs one wakeup per idle timeout,
+        while a busy one is drained in chunks of up to max_chunk bytes.
+        """
+        try:
+            self.serial_port.timeout = self.latency_ms / 1000.0
+            fd = self.serial_port.fileno() if os.name == "posix" else None
+        except Exception as e:
+            print(f"[ERROR] Failed to configure blocking serial reader: {e}")
+            return
+
+        while self._running and self.serial_port and self.serial_port.is_open:
+            try:
+                if fd is not None and not self.serial_port.in_waiting:
+                    readable, _, _ = select.select([fd], [], [], self.idle_timeout)
+                    if not readable:
+                        continue
+
+                data = self.serial_port.read(min(self._reserve(), self.max_chunk))
+                if data:
+                    arrival = probe_clock()
+                    self._push(data)
+                    self._extract_frames(arrival)
             except Exception as e:
                 print(f"[ERROR] Serial read error: {e}")
                 break
 
-    def _extract_frames(self):
-        idx = 0
-        while idx < len(self.buffer):
-            if self.buffer[idx] == 0xAA:
-                if idx + self.frame_size <= len(self.buffer):
-                    frame = self.buffer[idx:idx+self.frame_size]
-                    self.frame_received.emit(bytes(frame))
-                    idx += self.frame_size
-                else:
-                    break
-            else:
-                idx += 1
-        self.buffer = self.buffer[idx:]
+    def _reserve(self):
+        """
+        Compact unparsed bytes to the front of the ring buffer and return the free space behind them.
+        """
+        if self.head:
+            pending = self.tail - self.head
+            self.buffer[:pending] = self.view[self.head:self.tail]
+            self.head = 0
+            self.tail = pending
+        return len(self.buffer) - self.tail
+
+    def _push(self, data):
+        """
+        Copy freshly read bytes into the ring buffer.
+        """
+        size = len(data)
+        if size > len(self.buffer) - self.tail:
+            size = self._reserve()
+        self.buffer[self.tail:self.tail + size] = data[:size]
+        self.tail += size
+
+    def _extract_frames(self, arrival):
+        """
+        Validate all complete frames in the ring buffer in bulk and emit them as one packed batch,
+        together with the probe_clock() time the bytes were read at.
+        Garbage is skipped by searching for the next STX byte, and a frame with a bad STX/ETX
+        pair resynchronises one byte further on. Frames rejected by the acceptance filters are
+        dropped here, before anything leaves the thread.
+        """
+        fs = self.frame_size
+        chunks = []
+        pos = self.head
+        end = self.tail
+        while True:
+            pos = self.buffer.find(ACAN_STX, pos, end)
+            if pos < 0:
+                pos = end
+                break
+
+            count = (end - pos) // fs
+            if count == 0:
+                break
+
+            stop = pos + count * fs
+            stx = self.buffer[pos:stop:fs]
+            etx = self.buffer[pos + fs - 1:stop:fs]
+            valid = min(
+                count - len(stx.lstrip(bytes((ACAN_STX,)))),
+                count - len(etx.lstrip(bytes((ACAN_ETX,))))
+            )
+            if valid:
+                chunks.append(self.view[pos:pos + valid * fs])
+                pos += valid * fs
+            if valid < count:
+                pos += 1
+
+        self.head = pos
+        if chunks:
+            frames_bytes = b"".join(chunks)
+            if self.can_filters:
+                frames_bytes = self._filter_frames(frames_bytes)
+            if frames_bytes:
+                self.frames_received.emit(frames_bytes, arrival)
+        if self.head == self.tail:
+            self.head = self.tail = 0
+
+    def _filter_frames(self, frames_bytes):
+        """
+        Keep only the packed records accepted by the acceptance filters.
+        """
+        records = np.frombuffer(frames_bytes, dtype=ACAN_RECORD_DTYPE)
+        ids = records["arbitration_id"]
+        accepted = acceptance_mask(ids, ids > 0x7FF, self.can_filters)
+        kept = int(np.count_nonzero(accepted))
+        self.frames_filtered += len(records) - kept
+        if kept == len(records):
+            return frames_bytes
+        if not kept:
+            return b""
+        return records[accepted].tobytes()
 
     def stop(self):
         self._running = False
         self.wait()
 
 class UDPReaderThread(QThread):
-    frame_received = Signal(bytes, object)
+    frames_received = Signal(object, float)
+    client_registered = Signal(object)
 
-    def __init__(self, udp_socket, frame_size=19):
+    def __init__(self, udp_socket, udp_decoder, frame_size=19, max_batch=256, can_filters=None):
         super().__init__()
         self.udp_socket = udp_socket
+        self.udp_decoder = udp_decoder
         self._running = True
         self.frame_size = frame_size
+        self.max_batch = max_batch
+        self.can_filters = can_filters or []
+        self.frames_filtered = 0
 
     def run(self):
         while self._running:
             try:
                 data, addr = self.udp_socket.recvfrom(4096)
-                if data:
-                    self.frame_received.emit(data, addr)
+                arrival = probe_clock()
+                batch = [(data, addr)] if data else []
+                # Drain whatever else is already queued on the socket without blocking
+                while len(batch) < self.max_batch and select.select([self.udp_socket], [], [], 0)[0]:
+                    data, addr = self.udp_socket.recvfrom(4096)
+                    if data:
+                        batch.append((data, addr))
+                if batch:
+                    self._decode_datagrams(batch, arrival)
             except socket.timeout:
                 continue
             except Exception as e:
                 print(f"[ERROR] UDP read error: {e}")
                 break
 
+    def _decode_datagrams(self, datagrams, arrival):
+        """
+        Decode a batch of binary datagrams, apply the acceptance filters and emit the
+        surviving frames as one frame batch with the probe_clock() time of the first datagram.
+        """
+        batches = []
+        for frame_bytes, addr in datagrams:
+            if self.is_initial_connection(frame_bytes):
+                self.client_registered.emit(addr)
+                continue
+
+            frames = self.udp_decoder.decode(frame_bytes, addr)
+            if frames is None:
+                print("[WARNING] Received unknown UDP frame format.")
+            elif len(frames):
+                batches.append(frames)
+
+        if not batches:
+            return
+        frames = batches[0] if len(batches) == 1 else np.concatenate(batches)
+        if self.can_filters:
+            accepted = acceptance_mask(
+                frames["arbitration_id"],
+                (frames["flags"] & frame_flag.EXTENDED) != 0,
+                self.can_filters
+            )
+            self.frames_filtered += len(frames) - int(np.count_nonzero(accepted))
+            frames = frames[accepted]
+        if len(frames):
+            self.frames_received.emit(frames, arrival)
+
+    def is_initial_connection(self, frame_bytes):
+        # Implement your logic to detect initial connection message
+        # For example, check for a specific string or message type
+        return frame_bytes == b"HELLO"
+
     def stop(self):
         self._running = False
         self.wait()
@@ -87,9 +264,25 @@ class ConnectionManager:
         self.udp_socket = None
         self.msg_callback = None
         self.client_address = None
+        self.serial_reader_options = {}
+        self.udp_decoder = UDPFrameDecoder()
+        self.can_filters = []
+        self.arrival_listeners = []
+
+    def get_bus_config(self):
+        """
+        Return the bus_config section of the configuration file, or an empty dict if it cannot be read.
+        """
+        try:
+            with open(self.config_path, "r") as config_file:
+                return json.load(config_file)["bus_config"]
+        except Exception as e:
+            print(f"[WARNING] Failed to read bus config: {e}")
+            return {}
 
     def connect(self, on_message_received_callback, connection_type, params=None):
         self.connection_type = connection_type
+        self.can_filters = list((params or {}).get('can_filters') or [])
         if connection_type == connect_enum.PCAN:
             try:
                 with open(self.config_path, "r") as config_file:
@@ -100,11 +293,13 @@ class ConnectionManager:
                     bitrate = bus_config["bitrate"]
 
                     self.can_bus = can.ThreadSafeBus(
-                        channel=connection_config["channel"],
+                        channel=(params or {}).get('channel') or connection_config["channel"],
                         bustype=connection_config["bus_type"],
-                        bitrate=bitrate
+                        bitrate=bitrate,
+                        can_filters=self.can_filters or None
                     )
-                    self.can_msg_notifier = can.Notifier(self.can_bus, [on_message_received_callback])
+                    self.msg_callback = on_message_received_callback
+                    self.can_msg_notifier = can.Notifier(self.can_bus, [self.handle_bus_message])
                     self.active_bus = self.can_bus
                     return True
             except Exception as e:
@@ -117,12 +312,17 @@ class ConnectionManager:
                     print("[ERROR] No serial port specified.")
                     return False
                 self.serial_port = serial.Serial(port=port, baudrate=1000000, timeout=0.1)
-                self.serial_thread = SerialReaderThread(self.serial_port, frame_size=19)
+                self.serial_reader_options = {
+                    "mode": reader_mode(params.get('reader_mode', reader_mode.POLLING)),
+                    "latency_ms": float(params.get('latency_ms', 2.0)),
+                    "can_filters": self.can_filters,
+                }
+                self.serial_thread = SerialReaderThread(self.serial_port, frame_size=19, **self.serial_reader_options)
                 self.msg_callback = on_message_received_callback
-                self.serial_thread.frame_received.connect(self.handle_frame)
+                self.serial_thread.frames_received.connect(self.handle_frames)
                 self.serial_thread.start()
                 self.active_bus = self.serial_port
-                print(f"[DEBUG] Connected to serial port {port} (QThread, 1Mbps, 19 bytes/frame)")
+                print(f"[DEBUG] Connected to serial port {port} (QThread, 1Mbps, 19 bytes/frame, {self.serial_reader_options['mode'].name.lower()} reader)")
                 return True
             except Exception as e:
                 print(f"[ERROR] Failed to connect (ACAN): {e}")
@@ -134,9 +334,11 @@ class ConnectionManager:
                 self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
                 self.udp_socket.bind((ip, port))
                 self.udp_socket.settimeout(0.5)
-                self.udp_thread = UDPReaderThread(self.udp_socket, frame_size=19)
+                self.udp_decoder.reset()
+                self.udp_thread = UDPReaderThread(self.udp_socket, self.udp_decoder, frame_size=19, can_filters=self.can_filters)
                 self.msg_callback = on_message_received_callback
-                self.udp_thread.frame_received.connect(self.handle_udp_frame)
+                self.udp_thread.frames_received.connect(self.handle_udp_frames)
+                self.udp_thread.client_registered.connect(self.register_client)
                 self.udp_thread.start()
                 self.active_bus = self.udp_socket
                 print(f"[DEBUG] UDP server started on {ip}:{port}")
@@ -232,24 +434,26 @@ class ConnectionManager:
         try:
             if self.connection_type == connect_enum.PCAN:
                 if self.active_bus and not self.can_msg_notifier:
-                    self.can_msg_notifier = can.Notifier(self.active_bus, [on_message_received_callback])
+                    self.msg_callback = on_message_received_callback
+                    self.can_msg_notifier = can.Notifier(self.active_bus, [self.handle_bus_message])
                     print("[DEBUG] CAN message notifier resumed.")
                     return True
 
             elif self.connection_type == connect_enum.ACAN:
                 if self.serial_port and not self.serial_thread:
-                    self.serial_thread = SerialReaderThread(self.serial_port, frame_size=19)
+                    self.serial_thread = SerialReaderThread(self.serial_port, frame_size=19, **self.serial_reader_options)
                     self.msg_callback = on_message_received_callback
-                    self.serial_thread.frame_received.connect(self.handle_frame)
+                    self.serial_thread.frames_received.connect(self.handle_frames)
                     self.serial_thread.start()
                     print("[DEBUG] ACAN serial reader thread resumed.")
                     return True
 
             elif self.connection_type == connect_enum.SOCKETSERVER:
                 if self.udp_socket and (not hasattr(self, 'udp_thread') or self.udp_thread is None):
-                    self.udp_thread = UDPReaderThread(self.udp_socket, frame_size=19)
+                    self.udp_thread = UDPReaderThread(self.udp_socket, self.udp_decoder, frame_size=19, can_filters=self.can_filters)
                     self.msg_callback = on_message_received_callback
-                    self.udp_thread.frame_received.connect(self.handle_frame)
+                    self.udp_thread.frames_received.connect(self.handle_udp_frames)
+                    self.udp_thread.client_registered.connect(self.register_client)
                     self.udp_thread.start()
                     print("[DEBUG] UDP reader thread resumed.")
                     return True
@@ -260,44 +464,47 @@ class ConnectionManager:
             print(f"[ERROR] Failed to resume: {e}")
             return False
             
-    def handle_frame(self, frame_bytes):
-        if len(frame_bytes) != 19 or frame_bytes[0] != 0xAA or frame_bytes[-1] != 0xBB:
-            return
-
-        stx, ts, dlc, can_id, data, etx = struct.unpack("<B I B I 8s B", frame_bytes)
-
-        msg = can.Message(
-            timestamp=ts,
-            arbitration_id =can_id,
-            is_extended_id = can_id > 0x7FF,
-            is_rx =True,
-            is_remote_frame = False,
-            dlc = dlc,
-            data = bytearray(data)
-        )
+    def forward_frames(self, frames, arrival):
+        """
+        Pass a received batch and its probe_clock() arrival time to every arrival listener,
+        then to the message callback. Arrival listeners see the batch before any merging or
+        queueing, so a latency measured there does not include the ingest path.
+        """
+        for listener in self.arrival_listeners:
+            listener(frames, arrival)
         if self.msg_callback:
-            self.msg_callback(msg)
+            self.msg_callback(frames)
 
-    def handle_udp_frame(self, frame_bytes, addr):
-        if self.is_initial_connection(frame_bytes):
-            self.client_address = addr 
-            print(f"[INFO] Registered client address: {addr}")
-            return
-        try:
-            msg = pickle.loads(frame_bytes)
-            if hasattr(msg, "arbitration_id") and hasattr(msg, "data"):
-                if self.msg_callback:
-                    self.msg_callback(msg)
-                return
-        except Exception as e:
-            print(f"[WARNING] UDP frame is neither raw nor pickled can.Message: {e}")
+    def handle_bus_message(self, msg):
+        """
+        Forward a single python-can message as a one-frame batch.
+        """
+        arrival = probe_clock()
+        self.forward_frames(frames_from_messages([msg]), arrival)
 
-        print("[WARNING] Received unknown UDP frame format.")
+    def handle_frames(self, frames_bytes, arrival):
+        """
+        Unpack a batch of validated 19-byte ACAN frames in bulk and forward them as one frame batch.
+        """
+        records = np.frombuffer(frames_bytes, dtype=ACAN_RECORD_DTYPE)
+        frames = empty_frames(len(records))
+        frames["timestamp"] = records["timestamp"]
+        frames["arbitration_id"] = records["arbitration_id"]
+        frames["dlc"] = records["dlc"]
+        frames["flags"] = np.where(records["arbitration_id"] > 0x7FF, frame_flag.RX | frame_flag.EXTENDED, frame_flag.RX)
+        frames["data"] = records["data"]
+        if len(frames):
+            self.forward_frames(frames, arrival)
+
+    def handle_udp_frames(self, frames, arrival):
+        """
+        Forward a frame batch decoded and filtered by the UDP reader thread.
+        """
+        self.forward_frames(frames, arrival)
 
-    def is_initial_connection(self, frame_bytes):
-        # Implement your logic to detect initial connection message
-        # For example, check for a specific string or message type
-        return frame_bytes == b"HELLO"
+    def register_client(self, addr):
+        self.client_address = addr
+        print(f"[INFO] Registered client address: {addr}")
 
     def get_active_bus(self):
         return self.active_bus
@@ -0,0 +1,239 @@
+import can
+import heapq
+import math
+import numpy as np
+import threading
+import time
+from functools import partial
+from can_enums import connect_enum
+from capture_store import frames_from_messages
+
+
+class CyclicTask:
+    """
+    One cyclic message: the frame template, its period and the timing of every send.
+    """
+
+    def __init__(self, task_id, message, period):
+        """
+        Initialize the CyclicTask.
+        """
+        self.task_id = task_id
+        self.message = message
+        self.frame = frames_from_messages([message])
+        self.period = period
+        self.bus_task = None
+
+        self.sent = 0
+        self.missed = 0
+        self.last_sent = None
+        self.interval_count = 0
+        self.interval_mean = 0.0
+        self.interval_m2 = 0.0
+        self.max_deviation = 0.0
+
+    def record_send(self, now):
+        """
+        Fold the interval since the previous send into the running jitter statistics (Welford).
+        """
+        if self.last_sent is not None:
+            interval = now - self.last_sent
+            self.interval_count += 1
+            delta = interval - self.interval_mean
+            self.interval_mean += delta / self.interval_count
+            self.interval_m2 += delta * (interval - self.interval_mean)
+            self.max_deviation = max(self.max_deviation, abs(interval - self.period))
+        self.last_sent = now
+        self.sent += 1
+
+    def jitter(self):
+        """
+        Return the standard deviation of the send interval in seconds.
+        """
+        if self.interval_count < 2:
+            return 0.0
+        return math.sqrt(self.interval_m2 / (self.interval_count - 1))
+
+    def stats(self):
+        return {
+            "period": self.period,
+            "sent": self.sent,
+            "missed": self.missed,
+            "mean_interval": self.interval_mean,
+            "jitter": self.jitter(),
+            "max_deviation": self.max_deviation,
+        }
+
+
+class CyclicTransmitScheduler(threading.Thread):
+    """
+    Sends cyclic messages with independent periods.
+    On python-can buses every task is handed to bus.send_periodic. For ACAN and UDP the
+    scheduler thread keeps a heap ordered by due time, sleeps until shortly before the earliest
+    deadline and spins for the remainder, then sends everything that is due as one batch.
+    Deadlines advance by whole periods from the previous deadline, so lateness never
+    accumulates into drift.
+    """
+
+    def __init__(self, send_frame_manager, spin_threshold=0.001):
+        """
+        Initialize the CyclicTransmitScheduler.
+        """
+        super().__init__(daemon=True)
+        self.send_frame_manager = send_frame_manager
+        self.connection_manager = send_frame_manager.connection_manager
+        self.spin_threshold = spin_threshold
+
+        self.tasks = {}
+        self._heap = []
+        self._sequence = 0
+        self._running = True
+        self._condition = threading.Condition()
+
+    def add_task(self, task_id, message, period):
+        """
+        Start sending message every period seconds. An existing task with the same id is replaced.
+        """
+        self.remove_task(task_id)
+        connection_type = self.connection_manager.get_connection_type()
+        bus = self.connection_manager.get_active_bus()
+        if not bus:
+            print("[ERROR] Cannot start cyclic task: no active connection.")
+            return False
+
+        task = CyclicTask(task_id, message, period)
+        if connection_type == connect_enum.PCAN:
+            try:
+                task.bus_task = bus.send_periodic(
+                    message,
+                    period,
+                    store_task=False,
+                    modifier_callback=partial(self._on_bus_send, task)
+                )
+            except can.CanError as e:
+                print(f"[ERROR] Failed to start cyclic task: {e}")
+                return False
+            with self._condition:
+                self.tasks[task_id] = task
+        elif connection_type in (connect_enum.ACAN, connect_enum.SOCKETSERVER):
+            with self._condition:
+                self.tasks[task_id] = task
+                self._schedule(task, time.perf_counter())
+                self._condition.notify()
+        else:
+            print("[ERROR] Unsupported bus type for cyclic sending.")
+            return False
+
+        print(f"[DEBUG] Cyclic task {task_id}: 0x{message.arbitration_id:X} every {period * 1000:g} ms")
+        return True
+
+    def update_task(self, task_id, message):
+        """
+        Replace the frame a running task sends without restarting its schedule.
+        """
+        task = self.tasks.get(task_id)
+        if not task:
+            return False
+
+        if task.bus_task:
+            if message.arbitration_id != task.message.arbitration_id:
+                return self.add_task(task_id, message, task.period)
+            try:
+                task.bus_task.modify_data(message)
+            except Exception as e:
+                print(f"[ERROR] Failed to update cyclic task {task_id}: {e}")
+                return False
+        frame = frames_from_messages([message])
+        with self._condition:
+            task.message = message
+            task.frame = frame
+        return True
+
+    def remove_task(self, task_id):
+        with self._condition:
+            task = self.tasks.pop(task_id, None)
+        if task and task.bus_task:
+            try:
+                task.bus_task.stop()
+            except Exception as e:
+                print(f"[WARNING] Error stopping cyclic task {task_id}: {e}")
+        return task is not None
+
+    def stop_all(self):
+        for task_id in list(self.tasks):
+            self.remove_task(task_id)
+        with self._condition:
+            self._heap.clear()
+
+    def stats(self):
+        """
+        Return the timing statistics of every task, keyed by task id.
+        """
+        return {task_id: task.stats() for task_id, task in list(self.tasks.items())}
+
+    def stop(self):
+        self.stop_all()
+        self._running = False
+        with self._condition:
+            self._condition.notify()
+        if self.is_alive():
+            self.join()
+
+    def _on_bus_send(self, task, message):
+        """
+        Called by python-can right before each periodic send.
+        """
+        task.record_send(time.perf_counter())
+        message.timestamp = time.time()
+        message.is_rx = False
+        self.send_frame_manager.queue_tx_frames(frames_from_messages([message]))
+
+    def _schedule(self, task, due):
+        heapq.heappush(self._heap, (due, self._sequence, task))
+        self._sequence += 1
+
+    def _take_due(self, now):
+        """
+        Pop every task that is due, schedule its next deadline and return the tasks.
+        """
+        due_tasks = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, task = heapq.heappop(self._heap)
+            if self.tasks.get(task.task_id) is not task:
+                continue
+            next_due = due + task.period
+            if next_due <= now:
+                skipped = int((now - due) // task.period)
+                task.missed += skipped
+                next_due = due + (skipped + 1) * task.period
+            self._schedule(task, next_due)
+            due_tasks.append(task)
+        return due_tasks
+
+    def run(self):
+        while self._running:
+            with self._condition:
+                while self._heap and self.tasks.get(self._heap[0][2].task_id) is not self._heap[0][2]:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait(0.1)
+                    continue
+                deadline = self._heap[0][0]
+                remaining = deadline - time.perf_counter()
+                if remaining > self.spin_threshold:
+                    self._condition.wait(min(remaining - self.spin_threshold, 0.1))
+                    continue
+
+            while self._running and time.perf_counter() < deadline:
+                pass
+
+            with self._condition:
+                due_tasks = self._take_due(time.perf_counter())
+
+            if not due_tasks:
+                continue
+            frames = due_tasks[0].frame if len(due_tasks) == 1 else np.concatenate([task.frame for task in due_tasks])
+            self.send_frame_manager.send_frames(frames)
+            now = time.perf_counter()
+            for task in due_tasks:
+                task.record_send(now)
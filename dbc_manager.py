@@ -1,15 +1,50 @@
 import cantools
+import hashlib
 import json
 import ctypes
+import os
+import pickle
+from functools import lru_cache
+from PySide6.QtCore import QThread, Signal
+
+
+DBC_KEEP_PREFIXES = (
+    "VERSION", "NS_", "BS_", "BU_", "BO_", "SG_", "CM_", "VAL_", "BA_",
+    "BA_DEF_", "BA_DEF_DEF_", "BA_DEF_DEF_REL_", "BA_REL_", "SGTYPE_", "SG_MUL_VAL_"
+)
+DBC_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "infinity", "dbc")
+DBC_CACHE_VERSION = 1
+
+
+class DBCLoaderThread(QThread):
+    progress = Signal(int)
+    loaded = Signal(bool, str, object)
+
+    def __init__(self, dbc_manager, file_path):
+        super().__init__()
+        self.dbc_manager = dbc_manager
+        self.file_path = file_path
+
+    def run(self):
+        try:
+            can_db, from_cache = self.dbc_manager.parse_dbc_file(self.file_path, self.progress.emit)
+            source = "cache" if from_cache else "file"
+            self.loaded.emit(True, f"Successfully loaded and preprocessed DBC file (from {source})", can_db)
+        except Exception as e:
+            self.loaded.emit(False, f"Failed to load DBC file: {e}", None)
 
 
 class DBCManager:
-    def __init__(self):
+    def __init__(self, cache_size=8192):
         """
         Initialize the DBCManager.
         """
         self.can_db = None
+        self.file_path = None
         self.preprocessed_data = {}
+        self.cache_size = cache_size
+        self.cache_dir = DBC_CACHE_DIR
+        self.decode_text = lru_cache(maxsize=cache_size)(self._decode_text)
 
     def load_dbc_file(self, file_path):
         """
@@ -17,11 +52,124 @@ class DBCManager:
         """
         print("[DEBUG] Loading DBC file...")
         try:
-            self.can_db = cantools.database.load_file(file_path)
+            can_db, _ = self.parse_dbc_file(file_path)
+            self.set_database(can_db, file_path)
             return True, f"Successfully loaded and preprocessed DBC file"
         except Exception as e:
             return False, f"Failed to load DBC file: {e}"
 
+    def parse_dbc_file(self, file_path, progress=None):
+        """
+        Parse a DBC file without touching the active database and return (database, from_cache).
+        Only the DBC sections cantools understands are kept, and the text is parsed in memory.
+        The result is pickled to the cache directory keyed by path, mtime and content hash,
+        so an unchanged file is reloaded from the cache.
+        """
+        progress = progress or (lambda value: None)
+
+        progress(5)
+        mtime = os.path.getmtime(file_path)
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        content_hash = hashlib.sha256(raw).hexdigest()
+        progress(20)
+
+        cache_path = self.cache_path(file_path)
+        can_db = self.read_cache(cache_path, file_path, mtime, content_hash)
+        if can_db is not None:
+            progress(100)
+            return can_db, True
+
+        text = raw.decode("utf-8", errors="ignore")
+        filtered_text = "".join(
+            line for line in text.splitlines(keepends=True)
+            if line.lstrip().startswith(DBC_KEEP_PREFIXES)
+        )
+        progress(40)
+
+        can_db = cantools.database.load_string(filtered_text, database_format="dbc")
+        progress(90)
+
+        self.write_cache(cache_path, file_path, mtime, content_hash, can_db)
+        progress(100)
+        return can_db, False
+
+    def cache_path(self, file_path):
+        """
+        Return the cache file used for a DBC path.
+        """
+        key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def read_cache(self, cache_path, file_path, mtime, content_hash):
+        """
+        Return the cached database if it was built from this exact file, otherwise None.
+        """
+        try:
+            with open(cache_path, "rb") as f:
+                entry = pickle.load(f)
+            if (entry.get("version") == DBC_CACHE_VERSION
+                    and entry.get("path") == os.path.abspath(file_path)
+                    and entry.get("mtime") == mtime
+                    and entry.get("hash") == content_hash):
+                return entry["database"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable DBC cache {cache_path}: {e}")
+        return None
+
+    def write_cache(self, cache_path, file_path, mtime, content_hash, can_db):
+        """
+        Store a parsed database in the cache. Failures only cost the next load its speed-up.
+        """
+        entry = {
+            "version": DBC_CACHE_VERSION,
+            "path": os.path.abspath(file_path),
+            "mtime": mtime,
+            "hash": content_hash,
+            "database": can_db,
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{cache_path}.tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            print(f"[WARNING] Failed to write DBC cache: {e}")
+
+    def set_database(self, can_db, file_path=None):
+        """
+        Make a parsed database the active one and rebuild the decoder table.
+        """
+        self.can_db = can_db
+        self.file_path = file_path
+        self.preprocess()
+
+    def preprocess(self):
+        """
+        Build the per-ID decoder table: the cantools message, its display name and the
+        unit suffix of every signal. IDs missing from the table are unknown to the DBC,
+        so an unknown frame costs a single dict miss instead of a lookup exception.
+        """
+        preprocessed_data = {}
+        for message in self.can_db.messages:
+            units = tuple(
+                (signal.name, f" {signal.unit}" if signal.unit else "")
+                for signal in message.signals
+            )
+            preprocessed_data[message.frame_id] = (message, f"\t<{message.name}>", units)
+        self.preprocessed_data = preprocessed_data
+        self.decode_text.cache_clear()
+
+    def get_message_name(self, can_id):
+        """
+        Return the DBC name of a CAN ID, or None when it is unknown.
+        """
+        decoder = self.preprocessed_data.get(can_id)
+        return decoder[0].name if decoder else None
+
     def decode_message(self, can_id, data):
         """
         Decode a CAN message using cantools DBC.
@@ -29,14 +177,37 @@ class DBCManager:
         if not self.can_db:
             return None, "DBC file not loaded."
 
+        decoder = self.preprocessed_data.get(can_id)
+        if decoder is None:
+            return None, f"Error decoding CAN message with ID 0x{can_id:X}: unknown frame id"
+
+        message, _, units = decoder
         try:
-            message = self.can_db.get_message_by_frame_id(can_id)
             decoded = message.decode(data)
             decoded_signals = {}
-            for signal in message.signals:
-                value = decoded.get(signal.name)
-                unit = signal.unit if signal.unit else ""
-                decoded_signals[signal.name] = f"{value} {unit}".strip() if unit else f"{value}"
+            for name, unit in units:
+                decoded_signals[name] = f"{decoded.get(name)}{unit}"
             return decoded_signals, None
         except Exception as e:
             return None, f"Error decoding CAN message with ID 0x{can_id:X}: {e}"
+
+    def _decode_text(self, can_id, payload):
+        """
+        Format the raw bytes, message name and decoded signals of a frame for the table.
+        Wrapped in a bounded LRU cache as decode_text, keyed on (can_id, payload bytes),
+        since periodic frames mostly repeat the same payload.
+        """
+        decoded_signals, error = self.decode_message(can_id, payload)
+
+        decoder = self.preprocessed_data.get(can_id)
+        can_id_name = decoder[1] if decoder else ""
+
+        raw_data_str = " ".join(f"0x{byte:02X}" for byte in payload)
+        raw_data_str += can_id_name + "\n"
+
+        if error:
+            decoded_data_str = f"Decoding Error: {error}"
+        else:
+            decoded_data_str = "\n".join([f"{signal}: {value}" for signal, value in decoded_signals.items()])
+
+        return f"{raw_data_str}\n{decoded_data_str}"
@@ -0,0 +1,198 @@
+import csv
+import io
+import multiprocessing
+import os
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from PySide6.QtCore import QThread, Signal
+from can_enums import frame_flag
+from dbc_manager import DBCManager
+from trace_file import TRACE_HEADER, read_trace_header
+
+
+_worker_dbc_manager = None
+
+
+def _init_worker(file_path):
+    """
+    Load the DBC once per worker process. The parsed database normally comes from the
+    DBCManager pickle cache written when the GUI loaded the file.
+    """
+    global _worker_dbc_manager
+    dbc_manager = DBCManager()
+    can_db, _ = dbc_manager.parse_dbc_file(file_path)
+    dbc_manager.set_database(can_db, file_path)
+    _worker_dbc_manager = dbc_manager
+
+
+def _decode_batch(can_ids, data, dlc):
+    """
+    Decode a batch of frames into the interpret mode text of each frame.
+    """
+    decode_text = _worker_dbc_manager.decode_text
+    return [
+        decode_text(can_id, bytes(payload[:min(length, 8)]))
+        for can_id, payload, length in zip(can_ids.tolist(), data, dlc.tolist())
+    ]
+
+
+@lru_cache(maxsize=8192)
+def _signals_text(can_id, payload):
+    decoded_signals, error = _worker_dbc_manager.decode_message(can_id, payload)
+    if error:
+        return None
+    return "; ".join(f"{signal}={value}" for signal, value in decoded_signals.items())
+
+
+def _decode_trace_chunk(file_path, start, stop):
+    """
+    Decode the frames [start, stop) of a trace file into CSV rows. Frames of IDs the DBC
+    does not know are skipped. Returns (csv text, decoded frame count).
+    """
+    with open(file_path, "rb") as f:
+        _, record_dtype = read_trace_header(f)
+    frames = np.fromfile(
+        file_path, dtype=record_dtype, count=stop - start,
+        offset=TRACE_HEADER.size + start * record_dtype.itemsize
+    )
+    known = np.isin(frames["arbitration_id"], np.fromiter(_worker_dbc_manager.preprocessed_data, dtype=np.int64))
+    known &= (frames["flags"] & frame_flag.REMOTE) == 0
+    frames = frames[known]
+    channels = frames["channel"].tolist() if "channel" in record_dtype.names else [0] * len(frames)
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    get_message_name = _worker_dbc_manager.get_message_name
+    decoded = 0
+    for timestamp, channel, can_id, dlc, flags, payload in zip(
+        frames["timestamp"].tolist(), channels, frames["arbitration_id"].tolist(), frames["dlc"].tolist(),
+        frames["flags"].tolist(), map(bytes, frames["data"])
+    ):
+        signals = _signals_text(can_id, payload[:min(dlc, 8)])
+        if signals is None:
+            continue
+        writer.writerow((
+            f"{timestamp:.6f}",
+            channel,
+            f"0x{can_id:X}",
+            "Rx" if flags & frame_flag.RX else "Tx",
+            get_message_name(can_id),
+            signals,
+        ))
+        decoded += 1
+    return output.getvalue(), decoded
+
+
+class DBCDecodePool:
+    """
+    Decodes frames with cantools in worker processes, so DBC decoding runs on all cores and
+    outside the GIL of the GUI thread. Each worker loads the DBC once when it starts.
+    Batches submitted with submit() come back from collect() in submission order.
+    """
+
+    def __init__(self, file_path, max_workers=None):
+        """
+        Initialize the DBCDecodePool.
+        """
+        self.file_path = file_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(file_path,)
+        )
+        self.pending = deque()
+
+    def submit(self, tag, can_ids, data, dlc):
+        """
+        Queue a batch for decoding. tag is handed back with the results.
+        """
+        future = self.executor.submit(_decode_batch, can_ids, data, dlc)
+        self.pending.append((tag, future))
+
+    def collect(self):
+        """
+        Return the (tag, texts) of the finished batches at the head of the queue.
+        A batch still being decoded holds back the batches submitted after it.
+        """
+        results = []
+        while self.pending and self.pending[0][1].done():
+            tag, future = self.pending.popleft()
+            try:
+                results.append((tag, future.result()))
+            except Exception as e:
+                print(f"[ERROR] Decode batch failed: {e}")
+        return results
+
+    def decode_trace(self, trace_path, frame_count, output_path, chunk_size=65536, progress=None,
+                     is_cancelled=None):
+        """
+        Decode a whole trace file into a CSV file, one chunk of frames per task. At most two
+        chunks per worker are in flight and chunks are written in trace order.
+        Returns the number of decoded frames.
+        """
+        progress = progress or (lambda value: None)
+        is_cancelled = is_cancelled or (lambda: False)
+        chunks = deque()
+        starts = iter(range(0, frame_count, chunk_size))
+        decoded = 0
+        done = 0
+
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(("timestamp", "channel", "id", "dir", "message", "signals"))
+            while True:
+                while len(chunks) < 2 * self.max_workers:
+                    start = next(starts, None)
+                    if start is None:
+                        break
+                    stop = min(start + chunk_size, frame_count)
+                    chunks.append((stop, self.executor.submit(_decode_trace_chunk, trace_path, start, stop)))
+                if not chunks:
+                    break
+                stop, future = chunks.popleft()
+                text, count = future.result()
+                f.write(text)
+                decoded += count
+                done = stop
+                progress(int(done * 100 / frame_count))
+                if is_cancelled():
+                    for _, future in chunks:
+                        future.cancel()
+                    break
+        return decoded
+
+    def shutdown(self):
+        self.pending.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class DecodeTraceThread(QThread):
+    progress = Signal(int)
+    finished_decoding = Signal(bool, str)
+
+    def __init__(self, decode_pool, trace_path, frame_count, output_path):
+        super().__init__()
+        self.decode_pool = decode_pool
+        self.trace_path = trace_path
+        self.frame_count = frame_count
+        self.output_path = output_path
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            decoded = self.decode_pool.decode_trace(
+                self.trace_path, self.frame_count, self.output_path,
+                progress=self.progress.emit, is_cancelled=lambda: self._cancelled
+            )
+            if self._cancelled:
+                self.finished_decoding.emit(False, f"Decoding cancelled, {decoded} frames written")
+            else:
+                self.finished_decoding.emit(True, f"Decoded {decoded} of {self.frame_count} frames")
+        except Exception as e:
+            self.finished_decoding.emit(False, f"Failed to decode trace: {e}")
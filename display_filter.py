@@ -0,0 +1,340 @@
+import operator
+import re
+import numpy as np
+from can_enums import frame_flag
+
+
+FILTER_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>0[xX][0-9a-fA-F]+|\d+\.\d*|\.\d+|\d+)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)
+      | (?P<op>==|!=|<=|>=|&&|\|\||<|>|!|&|\(|\)|\[|\]|\{|\}|,|-)
+    )""", re.VERBOSE)
+
+FILTER_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+FILTER_FLAGS = {
+    "rx": lambda columns: (columns.flags & frame_flag.RX) != 0,
+    "tx": lambda columns: (columns.flags & frame_flag.RX) == 0,
+    "ext": lambda columns: (columns.flags & frame_flag.EXTENDED) != 0,
+    "std": lambda columns: (columns.flags & frame_flag.EXTENDED) == 0,
+    "rtr": lambda columns: (columns.flags & frame_flag.REMOTE) != 0,
+}
+
+FILTER_KEYWORDS = {"and", "or", "not", "in", "id", "dlc", "time", "channel", "data"} | set(FILTER_FLAGS)
+
+
+class FilterColumns:
+    """
+    The frame columns a filter is evaluated over.
+    """
+
+    def __init__(self, timestamp, arbitration_id, dlc, flags, data, channel, time_origin):
+        """
+        Initialize the FilterColumns.
+        """
+        self.timestamp = timestamp
+        self.arbitration_id = arbitration_id
+        self.dlc = dlc
+        self.flags = flags
+        self.data = data
+        self.channel = channel
+        self.time_origin = time_origin
+
+    @classmethod
+    def from_store(cls, store, start, stop, time_origin):
+        return cls(
+            store.timestamp[start:stop],
+            store.arbitration_id[start:stop],
+            store.dlc[start:stop],
+            store.flags[start:stop],
+            store.data[start:stop],
+            store.channel[start:stop],
+            time_origin
+        )
+
+    @classmethod
+    def from_frames(cls, frames, time_origin):
+        return cls(
+            frames["timestamp"],
+            frames["arbitration_id"],
+            frames["dlc"],
+            frames["flags"],
+            frames["data"],
+            frames["channel"],
+            time_origin
+        )
+
+    def __len__(self):
+        return len(self.arbitration_id)
+
+
+def signal_values(data, signal):
+    """
+    Extract the physical values of a cantools signal from an (N, 8) payload array with
+    shifts and masks on the payload read as one 64-bit word.
+    """
+    if signal.is_float:
+        raise ValueError(f"Float signal {signal.name} is not supported in filters")
+
+    payload = np.ascontiguousarray(data)
+    length = signal.length
+    mask = np.uint64((1 << length) - 1)
+    if signal.byte_order == "little_endian":
+        raw = (payload.view("<u8").ravel() >> np.uint64(signal.start)) & mask
+    else:
+        msb = (signal.start // 8) * 8 + (7 - signal.start % 8)
+        raw = (payload.view(">u8").ravel() >> np.uint64(64 - msb - length)) & mask
+
+    values = raw.astype(np.float64)
+    if signal.is_signed:
+        values[raw >= np.uint64(1 << (length - 1))] -= float(1 << length)
+    return values * signal.scale + signal.offset
+
+
+class DisplayFilter:
+    """
+    A compiled display filter expression, evaluated over frame columns into a boolean mask.
+
+    Expressions combine predicates with and/or/not (also &&, ||, !) and parentheses:
+    - flags: rx, tx, ext, std, rtr
+    - id, dlc, channel and time (seconds from the first displayed frame) compared with ==, !=, <, <=, >, >=
+    - id in 0x100-0x1FF, or id in {0x100, 0x200-0x2FF}
+    - data[i] compared with a value, optionally masked first: data[0] & 0xF0 == 0x10
+    - DBC signals by name, or Message.Signal, compared with a physical value: EngineSpeed > 3000
+    Keywords are lowercase and matched case-sensitively, so signals such as Time or ID are
+    filtered by their bare name. A signal spelled exactly like a keyword (time, id, rx, ...)
+    is reached as Message.Signal, e.g. Engine.time > 10.
+    Every predicate is a NumPy operation over the whole column range, so a filter costs a
+    handful of vector passes regardless of the number of frames.
+    """
+
+    def __init__(self, text, can_db=None):
+        """
+        Initialize the DisplayFilter. Raises ValueError when the expression does not parse.
+        """
+        self.text = text
+        self.can_db = can_db
+        self.tokens = self._tokenize(text)
+        self.position = 0
+        self.predicate = self._parse_or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.position][1]}'")
+
+    def evaluate(self, store, start, stop, time_origin=0.0):
+        """
+        Return a boolean mask over the stored frames in [start, stop).
+        """
+        if start >= stop:
+            return np.zeros(0, dtype=bool)
+        return self._mask(FilterColumns.from_store(store, start, stop, time_origin))
+
+    def evaluate_frames(self, frames, time_origin=0.0):
+        """
+        Return a boolean mask over a frame batch.
+        """
+        if not len(frames):
+            return np.zeros(0, dtype=bool)
+        return self._mask(FilterColumns.from_frames(frames, time_origin))
+
+    def _mask(self, columns):
+        mask = self.predicate(columns)
+        if np.ndim(mask) == 0:
+            return np.full(len(columns), bool(mask))
+        return mask
+
+    def _tokenize(self, text):
+        tokens = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = FILTER_TOKEN.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Unexpected character '{text[position:].strip()[:1]}'")
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "name" and value in FILTER_KEYWORDS:
+                kind = "keyword"
+            tokens.append((kind, value))
+            position = match.end()
+        if not tokens:
+            raise ValueError("Empty filter")
+        return tokens
+
+    def _peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def _take(self, *values):
+        kind, value = self._peek()
+        if value in values:
+            self.position += 1
+            return value
+        return None
+
+    def _expect(self, value):
+        if not self._take(value):
+            found = self._peek()[1]
+            raise ValueError(f"Expected '{value}'" + (f" before '{found}'" if found else " at end of filter"))
+
+    def _number(self):
+        negative = self._take("-") is not None
+        kind, value = self._peek()
+        if kind != "number":
+            raise ValueError(f"Expected a number" + (f" before '{value}'" if value else " at end of filter"))
+        self.position += 1
+        number = int(value, 16) if value[:2].lower() == "0x" else (float(value) if "." in value else int(value))
+        return -number if negative else number
+
+    def _parse_or(self):
+        predicate = self._parse_and()
+        while self._take("or", "||"):
+            left, right = predicate, self._parse_and()
+            predicate = lambda columns, left=left, right=right: left(columns) | right(columns)
+        return predicate
+
+    def _parse_and(self):
+        predicate = self._parse_not()
+        while self._take("and", "&&"):
+            left, right = predicate, self._parse_not()
+            predicate = lambda columns, left=left, right=right: left(columns) & right(columns)
+        return predicate
+
+    def _parse_not(self):
+        if self._take("not", "!"):
+            inner = self._parse_not()
+            return lambda columns: ~inner(columns)
+        return self._parse_atom()
+
+    def _parse_atom(self):
+        if self._take("("):
+            predicate = self._parse_or()
+            self._expect(")")
+            return predicate
+
+        kind, value = self._peek()
+        if value in FILTER_FLAGS:
+            self.position += 1
+            return FILTER_FLAGS[value]
+        if value in ("id", "dlc", "time", "channel", "data"):
+            self.position += 1
+            return self._parse_field(value)
+        if kind == "name":
+            self.position += 1
+            return self._parse_signal(value)
+        raise ValueError(f"Unexpected '{value}'" if value else "Unexpected end of filter")
+
+    def _parse_comparison(self):
+        kind, value = self._peek()
+        if value not in FILTER_COMPARISONS:
+            raise ValueError(f"Expected a comparison" + (f" before '{value}'" if value else " at end of filter"))
+        self.position += 1
+        return FILTER_COMPARISONS[value], self._number()
+
+    def _parse_ranges(self):
+        """
+        Parse "a-b", a single value, or "{a, b-c, ...}" into a list of inclusive ranges.
+        """
+        ranges = []
+        braced = self._take("{") is not None
+        while True:
+            low = self._number()
+            high = self._number() if self._take("-") else low
+            ranges.append((low, high))
+            if not braced or not self._take(","):
+                break
+        if braced:
+            self._expect("}")
+        return ranges
+
+    def _parse_field(self, field):
+        if field == "data":
+            self._expect("[")
+            byte_index = self._number()
+            self._expect("]")
+            if not 0 <= byte_index < 8:
+                raise ValueError("Byte index must be 0 to 7")
+            mask = self._number() if self._take("&") else 0xFF
+            if not 0 <= mask <= 0xFF:
+                raise ValueError("Byte mask must be 0x00 to 0xFF")
+            compare, value = self._parse_comparison()
+            return lambda columns: (
+                (columns.dlc > byte_index) & compare(columns.data[:, byte_index] & mask, value)
+            )
+
+        column = {
+            "id": lambda columns: columns.arbitration_id,
+            "dlc": lambda columns: columns.dlc,
+            "time": lambda columns: columns.timestamp - columns.time_origin,
+            "channel": lambda columns: columns.channel,
+        }[field]
+        if self._take("in"):
+            ranges = self._parse_ranges()
+
+            def in_ranges(columns):
+                values = column(columns)
+                mask = np.zeros(len(values), dtype=bool)
+                for low, high in ranges:
+                    mask |= (values >= low) & (values <= high)
+                return mask
+            return in_ranges
+
+        compare, value = self._parse_comparison()
+        return lambda columns: compare(column(columns), value)
+
+    def _parse_signal(self, name):
+        """
+        Resolve a DBC signal and compile a comparison against its physical value. Only frames
+        of messages carrying the signal (with the right multiplexer value) can match.
+        """
+        keyword_hint = f", did you mean '{name.lower()}'?" if name.lower() in FILTER_KEYWORDS else ""
+        if self.can_db is None:
+            raise ValueError(f"Unknown field '{name}' (load a DBC file to filter on signals{keyword_hint})")
+
+        message_name, _, signal_name = name.rpartition(".")
+        sources = []
+        for message in self.can_db.messages:
+            if message_name and message.name != message_name:
+                continue
+            for signal in message.signals:
+                if signal.name != signal_name:
+                    continue
+                multiplexer = None
+                if signal.multiplexer_ids:
+                    multiplexer = next(
+                        (candidate for candidate in message.signals
+                         if candidate.is_multiplexer and candidate.name == signal.multiplexer_signal),
+                        None
+                    )
+                signal_values(np.zeros((0, 8), dtype=np.uint8), signal)
+                sources.append((message, signal, multiplexer))
+        if not sources:
+            raise ValueError(f"Unknown signal '{name}'" + (f" (keywords are lowercase{keyword_hint})" if keyword_hint else ""))
+
+        compare, value = self._parse_comparison()
+
+        def signal_predicate(columns):
+            mask = np.zeros(len(columns), dtype=bool)
+            extended = (columns.flags & frame_flag.EXTENDED) != 0
+            for message, signal, multiplexer in sources:
+                rows = np.flatnonzero(
+                    (columns.arbitration_id == message.frame_id) & (extended == message.is_extended_frame)
+                    & ((columns.flags & frame_flag.REMOTE) == 0)
+                )
+                if not len(rows):
+                    continue
+                data = columns.data[rows]
+                matched = compare(signal_values(data, signal), value)
+                if multiplexer is not None:
+                    matched &= np.isin(signal_values(data, multiplexer), signal.multiplexer_ids)
+                mask[rows[matched]] = True
+            return mask
+        return signal_predicate
@@ -0,0 +1,75 @@
+import signal
+import time
+from PySide6.QtCore import QCoreApplication, QTimer
+from connection_manager import ConnectionManager
+from trace_logger import TraceLogger
+
+
+class HeadlessCapture:
+    """
+    Records a bus straight to a trace file without any widgets, printing throughput stats periodically.
+    """
+
+    def __init__(self, connection_type, params, out_path, stats_interval=1.0):
+        """
+        Initialize the HeadlessCapture.
+        """
+        self.connection_type = connection_type
+        self.params = params
+        self.out_path = out_path
+        self.stats_interval = stats_interval
+
+        self.connection_manager = ConnectionManager()
+        self.logger = None
+
+        self.total_frames = 0
+        self.started_at = None
+        self.stats_timer = None
+
+    def on_message_received(self, frames):
+        """
+        Hand every received frame batch to the trace logger.
+        """
+        self.total_frames += len(frames)
+        self.logger.log(frames)
+
+    def print_stats(self):
+        """
+        Print write throughput, logger queue depth and losses since the last report.
+        """
+        stats = self.logger.stats()
+        lost = self.connection_manager.udp_decoder.lost_datagrams
+        print(f"[INFO] {stats['frames_per_second']:10.0f} fps | {stats['frames_written']} frames | "
+              f"{stats['bytes_written'] / 1e6:.1f} MB | queue {stats['queue_depth']} | "
+              f"{stats['dropped_frames']} dropped frames | {lost} lost datagrams")
+
+    def run(self):
+        """
+        Connect, capture until interrupted and return the process exit code.
+        """
+        app = QCoreApplication.instance() or QCoreApplication([])
+
+        self.logger = TraceLogger(self.out_path)
+        self.logger.start()
+        if not self.connection_manager.connect(self.on_message_received, self.connection_type, self.params):
+            self.logger.stop()
+            print(f"[ERROR] Failed to connect to {self.connection_type.name}.")
+            return 1
+
+        signal.signal(signal.SIGINT, lambda *args: app.quit())
+        signal.signal(signal.SIGTERM, lambda *args: app.quit())
+
+        self.started_at = time.time()
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.print_stats)
+        self.stats_timer.start(int(self.stats_interval * 1000))
+        print(f"[INFO] Capturing {self.connection_type.name} to {self.out_path}, press Ctrl+C to stop")
+
+        app.exec()
+
+        self.stats_timer.stop()
+        self.connection_manager.disconnect()
+        self.logger.stop()
+        elapsed = time.time() - self.started_at
+        print(f"[INFO] Captured {self.total_frames} frames in {elapsed:.1f} s to {self.out_path}")
+        return 0
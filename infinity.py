@@ -1,7 +1,57 @@
-from PySide6.QtWidgets import QApplication
-from main_window import MainWindow
+import argparse
+import sys
+from acceptance_filter import parse_acceptance_filters
+from can_enums import connect_enum, reader_mode
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Infinity CAN debug tool")
+    parser.add_argument("--headless", action="store_true", help="capture to a trace file without the GUI")
+    parser.add_argument("--conn", choices=["pcan", "acan", "udp"], default="pcan", help="connection type for headless capture")
+    parser.add_argument("--port", help="serial device for ACAN or listen port for UDP")
+    parser.add_argument("--ip", default="0.0.0.0", help="listen address for UDP")
+    parser.add_argument("--out", default="trace.bin", help="trace file to write")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="ACAN reader latency target")
+    parser.add_argument("--filter", default="", help="acceptance filters as id:mask pairs, e.g. 0x100:0x7F0,0x200")
+    parser.add_argument("--stats-interval", type=float, default=1.0, help="seconds between throughput reports")
+    return parser.parse_args()
+
+
+def run_headless(args):
+    from headless_capture import HeadlessCapture
+
+    connection_type = {
+        "pcan": connect_enum.PCAN,
+        "acan": connect_enum.ACAN,
+        "udp": connect_enum.SOCKETSERVER,
+    }[args.conn]
+
+    try:
+        params = {'can_filters': parse_acceptance_filters(args.filter)}
+    except ValueError as e:
+        print(f"[ERROR] Invalid acceptance filter: {e}")
+        return 1
+
+    if connection_type == connect_enum.ACAN:
+        params['port'] = args.port
+        params['reader_mode'] = reader_mode.BLOCKING
+        params['latency_ms'] = args.latency_ms
+    elif connection_type == connect_enum.SOCKETSERVER:
+        params['ip'] = args.ip
+        params['port'] = args.port or 12345
+
+    capture = HeadlessCapture(connection_type, params, args.out, args.stats_interval)
+    return capture.run()
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.headless:
+        sys.exit(run_headless(args))
+
+    from PySide6.QtWidgets import QApplication
+    from main_window import MainWindow
+
     app = QApplication([])
     with open("styles.qss", "r") as file:
         print("[DEBUG] Loading QSS file")
@@ -9,4 +59,4 @@ if __name__ == "__main__":
 
     window = MainWindow()
     window.show()
-    app.exec()
\ No newline at end of file
+    app.exec()
@@ -0,0 +1,179 @@
+import numpy as np
+import threading
+import time
+from can_enums import frame_flag
+from capture_store import empty_frames
+
+
+LATENCY_PROBE_TAG = (0xA5, 0x5A)
+LATENCY_PROBE_DLC = 8
+
+
+def probe_clock():
+    """
+    The monotonic high-resolution clock shared by the send and ingest sides of the probe.
+    """
+    return time.perf_counter()
+
+
+class LatencyProbe(threading.Thread):
+    """
+    Measures Tx->Rx round-trip latency. Every interval the probe sends one tagged frame whose
+    payload holds the tag bytes A5 5A followed by a 32-bit little-endian sequence number. The
+    ingest path hands every received batch to match(), which finds tagged frames with a
+    vectorized mask and pairs them with their send time. Latencies are kept per connection
+    type in preallocated sample buffers.
+    """
+
+    def __init__(self, send_frame_manager, can_id=0x7E0, is_extended=False, interval=0.01,
+                 timeout=1.0, max_samples=100000):
+        """
+        Initialize the LatencyProbe.
+        """
+        super().__init__(daemon=True)
+        self.send_frame_manager = send_frame_manager
+        self.connection_manager = send_frame_manager.connection_manager
+        self.can_id = can_id
+        self.is_extended = is_extended
+        self.interval = interval
+        self.timeout = timeout
+        self.max_samples = max_samples
+
+        self.sequence = 0
+        self.pending = {}
+        self.samples = {}
+        self.sample_counts = {}
+        self.sent = {}
+        self.lost = {}
+
+        self._running = True
+        self._lock = threading.Lock()
+
+    def stop(self):
+        self._running = False
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+    def make_frame(self, sequence):
+        """
+        Build the tagged probe frame carrying sequence.
+        """
+        frames = empty_frames(1)
+        frames["arbitration_id"] = self.can_id
+        frames["dlc"] = LATENCY_PROBE_DLC
+        frames["flags"] = frame_flag.EXTENDED if self.is_extended else 0
+        frames["data"][0, :2] = LATENCY_PROBE_TAG
+        frames["data"][0, 2:6] = np.frombuffer(np.uint32(sequence).tobytes(), dtype=np.uint8)
+        return frames
+
+    def match(self, frames, received_time):
+        """
+        Pair received probe frames with their send time. Called from the ingest path.
+        """
+        if not self.pending:
+            return 0
+
+        data = frames["data"]
+        tagged = ((data[:, 0] == LATENCY_PROBE_TAG[0]) & (data[:, 1] == LATENCY_PROBE_TAG[1])
+                  & (frames["dlc"] == LATENCY_PROBE_DLC) & ((frames["flags"] & frame_flag.RX) != 0))
+        if not tagged.any():
+            return 0
+
+        sequences = np.ascontiguousarray(data[tagged, 2:6]).view("<u4").ravel()
+        matched = 0
+        with self._lock:
+            for sequence in sequences.tolist():
+                entry = self.pending.pop(sequence, None)
+                if entry is None:
+                    continue
+                connection_type, sent_time = entry
+                self._add_sample(connection_type, received_time - sent_time)
+                matched += 1
+        return matched
+
+    def _add_sample(self, connection_type, latency):
+        samples = self.samples.get(connection_type)
+        if samples is None:
+            samples = self.samples[connection_type] = np.empty(self.max_samples, dtype=np.float64)
+            self.sample_counts[connection_type] = 0
+        count = self.sample_counts[connection_type]
+        samples[count % self.max_samples] = latency
+        self.sample_counts[connection_type] = count + 1
+
+    def _expire(self, now):
+        """
+        Count probes that were not answered within the timeout as lost.
+        """
+        expired = [sequence for sequence, (_, sent_time) in self.pending.items() if now - sent_time > self.timeout]
+        for sequence in expired:
+            connection_type, _ = self.pending.pop(sequence)
+            self.lost[connection_type] = self.lost.get(connection_type, 0) + 1
+
+    def stats(self):
+        """
+        Return sent/received/lost counts and p50/p99/max latency in seconds per connection type.
+        """
+        result = {}
+        with self._lock:
+            for connection_type in set(self.sent) | set(self.samples):
+                count = self.sample_counts.get(connection_type, 0)
+                samples = self.samples[connection_type][:min(count, self.max_samples)] if count else np.empty(0)
+                entry = {
+                    "sent": self.sent.get(connection_type, 0),
+                    "received": count,
+                    "lost": self.lost.get(connection_type, 0),
+                    "p50": 0.0,
+                    "p99": 0.0,
+                    "max": 0.0,
+                }
+                if len(samples):
+                    entry["p50"], entry["p99"] = (float(value) for value in np.percentile(samples, [50, 99]))
+                    entry["max"] = float(samples.max())
+                result[connection_type] = entry
+        return result
+
+    def histogram(self, connection_type, bins=20):
+        """
+        Return the latency histogram of a connection type as (counts, bin edges in seconds),
+        using logarithmic bins between the smallest and largest sample.
+        """
+        with self._lock:
+            count = self.sample_counts.get(connection_type, 0)
+            if not count:
+                return np.zeros(0, dtype=np.int64), np.zeros(0)
+            samples = self.samples[connection_type][:min(count, self.max_samples)].copy()
+        low = max(samples.min(), 1e-6)
+        high = max(samples.max(), low * 1.01)
+        return np.histogram(samples, bins=np.geomspace(low, high, bins + 1))
+
+    def clear(self):
+        with self._lock:
+            self.pending.clear()
+            self.samples.clear()
+            self.sample_counts.clear()
+            self.sent.clear()
+            self.lost.clear()
+
+    def run(self):
+        next_send = probe_clock()
+        while self._running:
+            now = probe_clock()
+            if now < next_send:
+                time.sleep(min(next_send - now, 0.1))
+                continue
+            next_send += self.interval
+            if next_send < now:
+                next_send = now + self.interval
+
+            connection_type = self.connection_manager.get_connection_type().name
+            frames = self.make_frame(self.sequence)
+            with self._lock:
+                self._expire(now)
+                self.pending[self.sequence] = (connection_type, probe_clock())
+                self.sent[connection_type] = self.sent.get(connection_type, 0) + 1
+            success, _ = self.send_frame_manager.send_frames(frames)
+            if not success:
+                with self._lock:
+                    self.pending.pop(self.sequence, None)
+                    self.sent[connection_type] -= 1
+            self.sequence = (self.sequence + 1) & 0xFFFFFFFF
@@ -0,0 +1,157 @@
+import numpy as np
+import threading
+import time
+
+
+class ReplayEngine(threading.Thread):
+    """
+    Replays a TraceReader into the live pipeline at real time, N times real time or as fast as possible.
+    Frames are scheduled against time.perf_counter(): the thread sleeps until shortly before the
+    next frame is due and spins for the remainder, then delivers every frame that is due as one
+    batch. Timestamps are rebased onto the wall clock so the replay looks like a live capture.
+    When backlog is given, it returns the number of batches the consumer has not taken yet, and
+    the replay waits while max_backlog or more are queued. As-fast-as-possible and looped replays
+    therefore run at the consumer's pace instead of growing its queue without bound.
+    """
+
+    def __init__(self, trace_reader, frame_callback, speed=1.0, loop=False, transmit_callback=None,
+                 max_batch=4096, spin_threshold=0.001, backlog=None, max_backlog=64):
+        """
+        Initialize the ReplayEngine. A speed of 0 replays as fast as possible.
+        """
+        super().__init__(daemon=True)
+        self.trace_reader = trace_reader
+        self.frame_callback = frame_callback
+        self.transmit_callback = transmit_callback
+        self.speed = speed
+        self.loop = loop
+        self.max_batch = max_batch
+        self.spin_threshold = spin_threshold
+        self.backlog = backlog
+        self.max_backlog = max_backlog
+
+        self.position = 0
+        self.frames_replayed = 0
+        self.loops_completed = 0
+        self.max_lateness = 0.0
+        self.finished = False
+
+        self._running = True
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._seek_index = None
+        self._lock = threading.Lock()
+
+    def pause(self):
+        self._resume_event.clear()
+
+    def resume(self):
+        self._resume_event.set()
+
+    def is_paused(self):
+        return not self._resume_event.is_set()
+
+    def seek(self, offset):
+        """
+        Continue the replay from offset seconds after the start of the trace.
+        """
+        start = float(self.trace_reader.block_min.min()) if len(self.trace_reader) else 0.0
+        with self._lock:
+            self._seek_index = self.trace_reader.index_for_time(start + offset)
+
+    def stop(self):
+        self._running = False
+        self._resume_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+    def _sleep_until(self, deadline):
+        """
+        Sleep until just before deadline, then spin on the high-resolution clock.
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_threshold:
+            time.sleep(min(remaining - self.spin_threshold, 0.1))
+            return
+        while self._running and time.perf_counter() < deadline:
+            pass
+
+    def run(self):
+        reader = self.trace_reader
+        timestamps = reader.timestamp
+        count = len(reader)
+        if not count:
+            self.finished = True
+            return
+
+        trace_start = float(reader.block_min.min())
+        trace_duration = reader.duration
+        replay_base = time.time()
+        anchor_trace = None
+        anchor_clock = 0.0
+
+        while self._running:
+            if not self._resume_event.is_set():
+                self._resume_event.wait(0.1)
+                anchor_trace = None
+                continue
+
+            with self._lock:
+                if self._seek_index is not None:
+                    self.position = self._seek_index
+                    self._seek_index = None
+                    anchor_trace = None
+
+            if self.backlog and self.backlog() >= self.max_backlog:
+                time.sleep(0.001)
+                continue
+
+            if self.position >= count:
+                if not self.loop:
+                    break
+                self.position = 0
+                self.loops_completed += 1
+                replay_base += trace_duration / self.speed if self.speed else trace_duration
+                anchor_trace = None
+                continue
+
+            if anchor_trace is None:
+                anchor_trace = float(timestamps[self.position])
+                anchor_clock = time.perf_counter()
+                replay_base = time.time() - (anchor_trace - trace_start) / (self.speed or 1.0)
+
+            stop = min(count, self.position + self.max_batch)
+            if self.speed:
+                now = time.perf_counter()
+                due = anchor_trace + (now - anchor_clock) * self.speed
+                window = timestamps[self.position:stop]
+                stop = self.position + int(np.searchsorted(window, due, side="right"))
+                if stop == self.position:
+                    self._sleep_until(anchor_clock + (float(window[0]) - anchor_trace) / self.speed)
+                    continue
+                self.max_lateness = max(self.max_lateness, (due - float(window[0])) / self.speed)
+
+            frames = np.array(reader.frames(self.position, stop))
+            if self.speed:
+                frames["timestamp"] = replay_base + (frames["timestamp"] - trace_start) / self.speed
+            else:
+                frames["timestamp"] = replay_base + (frames["timestamp"] - trace_start)
+
+            self.frame_callback(frames)
+            if self.transmit_callback:
+                self.transmit_callback(frames)
+
+            self.frames_replayed += len(frames)
+            self.position = stop
+
+        self.finished = True
+
+    def progress(self):
+        """
+        Return the replay position in seconds from the start of the trace.
+        """
+        reader = self.trace_reader
+        if not len(reader):
+            return 0.0
+        position = min(self.position, len(reader) - 1)
+        return float(reader.timestamp[position] - reader.block_min.min())
@@ -1,10 +1,53 @@
 import can
 import time
 import socket
-import pickle
-import struct
 import serial
-from can_enums import connect_enum
+import threading
+import numpy as np
+from can_enums import connect_enum, frame_flag
+from capture_store import empty_frames, frame_to_message
+from connection_manager import ACAN_ETX, ACAN_RECORD_DTYPE, ACAN_STX
+from udp_protocol import UDP_SEQUENCE_MASK, pack_datagrams, stamp_datagram
+
+
+class FrameTemplate:
+    """
+    A frame batch packed once for one connection type and re-sent as often as needed:
+    ACAN records ready for a single serial write, UDP datagrams ready for sendto, or
+    python-can messages ready for bus.send. Only the timestamps and UDP sequence numbers
+    are rewritten on each send.
+    """
+
+    def __init__(self, frames, connection_type):
+        """
+        Initialize the FrameTemplate.
+        """
+        self.frames = frames.copy()
+        self.frames["flags"] &= ~np.uint8(frame_flag.RX)
+        self.connection_type = connection_type
+        self.records = None
+        self.datagrams = None
+        self.messages = None
+
+        if connection_type == connect_enum.ACAN:
+            self.records = np.empty(len(frames), dtype=ACAN_RECORD_DTYPE)
+            self.records["stx"] = ACAN_STX
+            self.records["timestamp"] = 0
+            self.records["dlc"] = self.frames["dlc"]
+            self.records["arbitration_id"] = self.frames["arbitration_id"]
+            self.records["data"] = self.frames["data"]
+            self.records["etx"] = ACAN_ETX
+        elif connection_type == connect_enum.SOCKETSERVER:
+            relative = self.frames.copy()
+            relative["timestamp"] = 0.0
+            datagrams, _ = pack_datagrams(relative, 0)
+            self.datagrams = [bytearray(datagram) for datagram in datagrams]
+        elif connection_type == connect_enum.PCAN:
+            self.messages = [frame_to_message(frame) for frame in self.frames]
+
+    def __len__(self):
+        return len(self.frames)
+
 
 class SendFrameManager:
     def __init__(self, connection_manager, can_message_queue):
@@ -15,8 +58,31 @@ class SendFrameManager:
         """
         self.connection_manager = connection_manager
         self.can_message_queue = can_message_queue
+        self.udp_sequence = 0
+        self.tx_listeners = []
+        self.to_bus_clock = None
+        self.send_lock = threading.Lock()
 
     def send_frame(self, can_id, is_extended, is_rtr, dlc, data):
+        frames = empty_frames(1)
+        frames["arbitration_id"] = can_id
+        frames["dlc"] = dlc
+        frames["flags"] = (frame_flag.EXTENDED if is_extended else 0) | (frame_flag.REMOTE if is_rtr else 0)
+        payload = bytes(data[:8])
+        frames["data"][0, :len(payload)] = np.frombuffer(payload, dtype=np.uint8)
+        return self.send_frames(frames)
+
+    def prepare_frames(self, frames):
+        """
+        Pack a frame batch into a FrameTemplate for the current connection type.
+        """
+        return FrameTemplate(frames, self.connection_manager.get_connection_type())
+
+    def send_frames(self, batch):
+        """
+        Send a frame batch or a FrameTemplate. ACAN frames go out in one serial write, UDP
+        frames in one datagram per MTU, and python-can messages in a tight bus.send loop.
+        """
         bus = self.connection_manager.get_active_bus()
         connection_type = self.connection_manager.get_connection_type()
 
@@ -24,47 +90,24 @@ class SendFrameManager:
             print("[ERROR] CAN bus is not initialized.")
             return False, "CAN bus is not initialized."
 
+        template = batch if isinstance(batch, FrameTemplate) else None
+        if template is None or template.connection_type != connection_type:
+            template = FrameTemplate(batch.frames if template else batch, connection_type)
+        if not len(template):
+            return True, "No frames to send."
+
         try:
             if connection_type == connect_enum.ACAN:
-                stx = 0xAA
-                etx = 0xBB
-                timestamp = int(time.time())
-                frame = struct.pack(
-                    "<BIBI8sB",
-                    stx,
-                    timestamp,
-                    dlc,
-                    can_id,
-                    bytes(data).ljust(8, b'\x00'),
-                    etx
-                )
-                bus.write(frame)
-                message = can.Message(
-                    timestamp=timestamp,
-                    arbitration_id=can_id,
-                    is_extended_id=is_extended,
-                    is_remote_frame=is_rtr,
-                    dlc=dlc,
-                    data=bytearray(data),
-                    is_rx = False
-                )
-                message.is_rx = False
-                self.can_message_queue.put(message)
-                return True, "Frame sent successfully (ACAN)."
+                with self.send_lock:
+                    timestamp = time.time()
+                    template.records["timestamp"] = int(timestamp)
+                    bus.write(template.records.tobytes())
 
             elif connection_type == connect_enum.PCAN:
-                message = can.Message(
-                    arbitration_id=can_id,
-                    is_extended_id=is_extended,
-                    is_remote_frame=is_rtr,
-                    dlc=dlc,
-                    data=data
-                )
-                bus.send(message)
-                message.timestamp = time.time()
-                message.is_rx = False
-                self.can_message_queue.put(message)
-                return True, "Frame sent successfully."
+                send = bus.send
+                timestamp = time.time()
+                for message in template.messages:
+                    send(message)
 
             elif connection_type == connect_enum.SOCKETSERVER:
                 udp_socket = self.connection_manager.get_active_bus()
@@ -76,19 +119,12 @@ class SendFrameManager:
                     print("[ERROR] Client address is not set. Awaiting initial connection.")
                     return False, "Client address is not set."
 
-                message = can.Message(
-                    arbitration_id=can_id,
-                    is_extended_id=is_extended,
-                    is_remote_frame=is_rtr,
-                    dlc=dlc,
-                    data=bytearray(data),
-                    is_rx=False,
-                    timestamp=time.time()
-                )
-                frame_bytes = pickle.dumps(message)
-                udp_socket.sendto(frame_bytes, client_address)
-                self.can_message_queue.put(message)
-                return True, "Frame sent successfully (UDP)."
+                with self.send_lock:
+                    timestamp = time.time()
+                    for datagram in template.datagrams:
+                        stamp_datagram(datagram, self.udp_sequence, timestamp)
+                        self.udp_sequence = (self.udp_sequence + 1) & UDP_SEQUENCE_MASK
+                        udp_socket.sendto(datagram, client_address)
 
             else:
                 print("[ERROR] Unsupported bus type for sending.")
@@ -101,10 +137,28 @@ class SendFrameManager:
             print(f"[ERROR] Failed to process CAN frame: {e}")
             return False, f"Failed to process frame: {e}"
 
+        frames = template.frames.copy()
+        frames["timestamp"] = timestamp
+        self.queue_tx_frames(frames)
+        if len(frames) == 1:
+            return True, f"Frame sent successfully ({connection_type.name})."
+        return True, f"{len(frames)} frames sent successfully ({connection_type.name})."
+
+    def queue_tx_frames(self, frames):
+        """
+        Queue transmitted frames for display and pass them to every Tx listener.
+        Their host timestamps are first moved onto the clock of the received frames.
+        """
+        if self.to_bus_clock:
+            self.to_bus_clock(frames)
+        self.can_message_queue.put(frames)
+        for listener in self.tx_listeners:
+            listener(frames)
+
     def set_connection_type(self, connection_type):
         if connection_type not in connect_enum:
             self.connection_type = connect_enum.NONE
             return False
         
         self.connection_type = connection_type
-        return True
\ No newline at end of file
+        return True
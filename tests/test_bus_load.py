@@ -0,0 +1,170 @@
+import time
+import numpy as np
+import pytest
+from bus_clock import BusClock
+from bus_load import BusLoadEstimator, frame_bit_lengths
+from can_enums import frame_flag
+from capture_store import empty_frames
+
+
+def reference_bit_length(can_id, extended, remote, dlc, data):
+    """
+    Build one classic CAN frame bit by bit and return its on-wire length: stuffed SOF..CRC,
+    then CRC delimiter, ACK slot and delimiter, EOF and the 3-bit interframe space.
+    """
+    bits = [0]
+
+    def put(value, width):
+        bits.extend((value >> shift) & 1 for shift in range(width - 1, -1, -1))
+
+    if extended:
+        put(can_id >> 18, 11)
+        put(1, 1)
+        put(1, 1)
+        put(can_id & 0x3FFFF, 18)
+        put(int(remote), 1)
+        put(0, 2)
+    else:
+        put(can_id, 11)
+        put(int(remote), 1)
+        put(0, 2)
+    put(dlc & 0xF, 4)
+    if not remote:
+        for byte in data[:min(dlc, 8)]:
+            put(byte, 8)
+
+    crc = 0
+    for bit in bits:
+        crc = ((crc << 1) & 0x7FFF) ^ (0x4599 if (bit ^ (crc >> 14)) & 1 else 0)
+    put(crc, 15)
+
+    stuff_bits = 0
+    last_bit = None
+    run = 0
+    for bit in bits:
+        run = run + 1 if bit == last_bit else 1
+        last_bit = bit
+        if run == 5:
+            stuff_bits += 1
+            last_bit = 1 - bit
+            run = 1
+    return len(bits) + stuff_bits + 13
+
+
+def make_frames(can_id, dlc, extended=False, remote=False, data=None):
+    frames = empty_frames(1)
+    frames["arbitration_id"] = can_id
+    frames["dlc"] = dlc
+    frames["flags"] = (frame_flag.EXTENDED if extended else 0) | (frame_flag.REMOTE if remote else 0)
+    if data is not None:
+        frames["data"][0, :len(data)] = data
+    return frames
+
+
+def rx_frames(start, count, interval=0.0002, can_id=0x100):
+    """
+    Return count received frames stamped on an adapter clock that is far from host time.
+    """
+    frames = empty_frames(count)
+    frames["timestamp"] = start + np.arange(count) * interval
+    frames["arbitration_id"] = can_id
+    frames["dlc"] = 8
+    frames["flags"] = frame_flag.RX
+    return frames
+
+
+def tx_frame(can_id=0x100):
+    """
+    Return one transmitted frame stamped with host time, as SendFrameManager does.
+    """
+    frames = empty_frames(1)
+    frames["timestamp"] = time.time()
+    frames["arbitration_id"] = can_id
+    frames["dlc"] = 8
+    return frames
+
+
+def test_exact_lengths_match_bit_level_reference():
+    rng = np.random.default_rng(0)
+    count = 3000
+    extended = rng.random(count) < 0.5
+    remote = rng.random(count) < 0.2
+    frames = empty_frames(count)
+    frames["arbitration_id"] = np.where(extended, rng.integers(0, 1 << 29, count), rng.integers(0, 1 << 11, count))
+    frames["dlc"] = rng.integers(0, 16, count)
+    frames["flags"] = np.where(extended, frame_flag.EXTENDED, 0) | np.where(remote, frame_flag.REMOTE, 0)
+    frames["data"] = rng.integers(0, 256, (count, 8))
+
+    expected = [
+        reference_bit_length(int(frame["arbitration_id"]), bool(is_extended), bool(is_remote),
+                             int(frame["dlc"]), frame["data"].tolist())
+        for frame, is_extended, is_remote in zip(frames, extended, remote)
+    ]
+    assert frame_bit_lengths(frames).tolist() == expected
+
+
+@pytest.mark.parametrize("extended, dlc, expected", [
+    (False, 0, 19 + 15 + 8 + 13),
+    (False, 8, 19 + 64 + 15 + 24 + 13),
+    (True, 0, 39 + 15 + 13 + 13),
+    (True, 8, 39 + 64 + 15 + 29 + 13),
+])
+def test_worst_case_stuffing(extended, dlc, expected):
+    frames = make_frames(0x123, dlc, extended)
+    assert frame_bit_lengths(frames, exact=False).tolist() == [expected]
+
+
+def test_all_zero_frame_stuffs_after_every_fifth_bit():
+    frames = make_frames(0, 0)
+    assert frame_bit_lengths(frames).tolist() == [34 + 6 + 13]
+
+
+def test_remote_frame_carries_no_data():
+    with_data = make_frames(0x123, 8, remote=True, data=[0xFF] * 8)
+    without_data = make_frames(0x123, 8, remote=True)
+    assert frame_bit_lengths(with_data).tolist() == frame_bit_lengths(without_data).tolist()
+    assert frame_bit_lengths(with_data, exact=False).tolist() == [19 + 15 + 8 + 13]
+
+
+def test_dlc_above_8_sends_8_bytes_with_the_raw_code():
+    data = [0x12, 0x34, 0x56, 0x78, 0x9A, 0xBC, 0xDE, 0xF0]
+    frames = make_frames(0x123, 12, data=data)
+    assert frame_bit_lengths(frames, exact=False).tolist() == frame_bit_lengths(make_frames(0x123, 8), exact=False).tolist()
+    assert frame_bit_lengths(frames).tolist() == [reference_bit_length(0x123, False, False, 12, data)]
+
+
+def test_load_of_a_saturated_window():
+    frames = rx_frames(100.0, 1000, interval=0.0001)
+    frames["flags"] = frame_flag.RX | frame_flag.EXTENDED
+    estimator = BusLoadEstimator(500000, exact=False)
+    estimator.add(frames)
+    assert estimator.load(0.1) == pytest.approx(1000 * 160 / 50000 * 100.0)
+
+
+def test_tx_echo_keeps_bus_load_on_the_rx_clock():
+    clock = BusClock()
+    estimator = BusLoadEstimator(500000)
+
+    frames = rx_frames(100.0, 1000)
+    clock.observe(frames)
+    estimator.add(frames)
+    load_before = estimator.load(0.1)
+
+    tx = tx_frame()
+    clock.align_host(tx)
+    estimator.add(tx)
+    estimator.add(rx_frames(100.2, 1000))
+
+    assert load_before > 50.0
+    assert abs(float(tx["timestamp"][0]) - 100.2) < 1.0
+    assert estimator.load(0.1) > 50.0
+
+
+def test_tx_before_any_rx_makes_host_time_the_bus_clock():
+    clock = BusClock()
+    tx = tx_frame()
+    sent_at = float(tx["timestamp"][0])
+    clock.align_host(tx)
+
+    assert float(tx["timestamp"][0]) == sent_at
+    assert clock.observe(rx_frames(100.0, 10)) == 0.0
@@ -0,0 +1,50 @@
+import time
+import numpy as np
+from bus_clock import BusClock
+from can_enums import frame_flag
+from can_statistics import IDStatistics
+from capture_store import empty_frames
+
+
+def rx_frames(start, count, interval, can_id=0x100):
+    """
+    Return count received frames stamped on an adapter clock that is far from host time.
+    """
+    frames = empty_frames(count)
+    frames["timestamp"] = start + np.arange(count) * interval
+    frames["arbitration_id"] = can_id
+    frames["dlc"] = 8
+    frames["flags"] = frame_flag.RX
+    return frames
+
+
+def test_periods_of_a_cyclic_id():
+    statistics = IDStatistics()
+    statistics.update(rx_frames(100.0, 50, 0.01))
+    statistics.update(rx_frames(100.5, 50, 0.01))
+
+    snapshot = statistics.snapshot()
+    assert snapshot["count"].tolist() == [100]
+    assert np.isclose(snapshot["period_mean"][0], 0.01)
+    assert np.isclose(snapshot["period_max"][0], 0.01)
+
+
+def test_tx_echo_keeps_id_periods_on_the_rx_clock():
+    clock = BusClock()
+    statistics = IDStatistics()
+
+    frames = rx_frames(100.0, 100, 0.01)
+    clock.observe(frames)
+    statistics.update(frames)
+
+    tx = empty_frames(1)
+    tx["timestamp"] = time.time()
+    tx["arbitration_id"] = 0x100
+    tx["dlc"] = 8
+    clock.align_host(tx)
+    statistics.update(tx)
+    statistics.update(rx_frames(101.0, 100, 0.01))
+
+    snapshot = statistics.snapshot()
+    assert snapshot["count"][0] == 201
+    assert snapshot["period_max"][0] < 1.0
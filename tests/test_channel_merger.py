@@ -0,0 +1,86 @@
+import threading
+import time
+import numpy as np
+from bus_clock import BusClock
+from capture_store import empty_frames
+from channel_merger import ChannelMerger
+
+
+START = time.time()
+
+
+def frames_at(offsets):
+    """
+    Return frames stamped offsets seconds after now on the host clock, so no channel is shifted.
+    """
+    frames = empty_frames(len(offsets))
+    frames["timestamp"] = START + np.array(offsets)
+    return frames
+
+
+def test_slow_callback_does_not_block_other_channels():
+    delivered = []
+    callback_started = threading.Event()
+
+    def slow_callback(frames):
+        callback_started.set()
+        time.sleep(0.05)
+        delivered.append(frames)
+
+    merger = ChannelMerger(slow_callback, max_lag=0.01)
+    merger.add_channel(1)
+    merger.add_channel(2)
+    merger.push(1, frames_at([0.0, 0.1]))
+    time.sleep(0.02)
+
+    flusher = threading.Thread(target=merger.flush)
+    flusher.start()
+    assert callback_started.wait(1.0)
+
+    started = time.perf_counter()
+    merger.push(2, frames_at([0.2, 0.3]))
+    blocked = time.perf_counter() - started
+
+    flusher.join()
+    time.sleep(0.02)
+    merger.flush()
+
+    assert blocked < 0.02
+    timestamps = np.concatenate(delivered)["timestamp"] - START
+    assert np.allclose(timestamps, [0.0, 0.1, 0.2, 0.3])
+
+
+def test_remove_channel_releases_pending_frames():
+    delivered = []
+    merger = ChannelMerger(delivered.append)
+    merger.add_channel(1)
+    merger.add_channel(2)
+    merger.push(1, frames_at([0.0]))
+    merger.remove_channel(1)
+
+    assert len(delivered) == 1
+    assert delivered[0]["channel"].tolist() == [1]
+
+
+def test_channels_and_tx_share_the_bus_clock():
+    delivered = []
+    clock = BusClock()
+    merger = ChannelMerger(delivered.append, max_lag=0.01, clock=clock)
+    merger.add_channel(0)
+    merger.add_channel(1)
+
+    adapter = empty_frames(1)
+    adapter["timestamp"] = 100.0
+    merger.push(0, adapter)
+    host = empty_frames(1)
+    host["timestamp"] = time.time()
+    merger.push(1, host)
+    tx = empty_frames(1)
+    tx["timestamp"] = time.time()
+    clock.align_host(tx)
+    time.sleep(0.02)
+    merger.flush()
+
+    timestamps = np.concatenate(delivered)["timestamp"]
+    assert np.allclose(timestamps, 100.0, atol=0.1)
+    assert abs(float(tx["timestamp"][0]) - 100.0) < 0.1
@@ -0,0 +1,42 @@
+import cantools
+import pytest
+from capture_store import empty_frames
+from display_filter import DisplayFilter
+
+
+DBC = """VERSION ""
+BU_: Node
+BO_ 291 Engine: 8 Node
+ SG_ Time : 0|8@1+ (1,0) [0|255] "" Node
+ SG_ ID : 8|8@1+ (1,0) [0|255] "" Node
+ SG_ Data : 16|8@1+ (1,0) [0|255] "" Node
+ SG_ time : 24|8@1+ (1,0) [0|255] "" Node
+"""
+
+
+@pytest.fixture
+def can_db():
+    return cantools.database.load_string(DBC)
+
+
+@pytest.fixture
+def frames():
+    frames = empty_frames(2)
+    frames["arbitration_id"] = [0x123, 0x124]
+    frames["dlc"] = 8
+    frames["data"][0, :4] = [5, 6, 7, 8]
+    return frames
+
+
+@pytest.mark.parametrize("text", ["Time == 5", "ID == 6", "Data == 7", "Engine.time == 8"])
+def test_signals_named_like_keywords(can_db, frames, text):
+    assert DisplayFilter(text, can_db).evaluate_frames(frames).tolist() == [True, False]
+
+
+def test_lowercase_keywords_stay_fields(can_db, frames):
+    assert DisplayFilter("id == 0x124 or time > 1", can_db).evaluate_frames(frames).tolist() == [False, True]
+
+
+def test_capitalized_keyword_without_signal_is_rejected(frames):
+    with pytest.raises(ValueError, match="did you mean 'id'"):
+        DisplayFilter("ID == 0x123")
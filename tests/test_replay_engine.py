@@ -0,0 +1,41 @@
+import queue
+import time
+import numpy as np
+from capture_store import empty_frames
+from replay_engine import ReplayEngine
+from trace_file import TraceWriter
+from trace_reader import TraceReader
+
+
+def write_trace(path, count=10000):
+    frames = empty_frames(count)
+    frames["timestamp"] = np.arange(count) * 1e-4
+    frames["arbitration_id"] = 0x100
+    frames["dlc"] = 8
+    writer = TraceWriter(str(path))
+    writer.write(frames)
+    writer.close()
+    return TraceReader(str(path))
+
+
+def test_looped_full_speed_replay_waits_for_the_consumer(tmp_path):
+    reader = write_trace(tmp_path / "trace.bin")
+    frame_queue = queue.Queue()
+    engine = ReplayEngine(reader, frame_queue.put, speed=0, loop=True, max_batch=1000,
+                          backlog=frame_queue.qsize, max_backlog=8)
+    engine.start()
+    time.sleep(0.2)
+    queued = frame_queue.qsize()
+
+    drained = 0
+    deadline = time.perf_counter() + 0.2
+    while time.perf_counter() < deadline:
+        try:
+            drained += len(frame_queue.get(timeout=0.01))
+        except queue.Empty:
+            pass
+    engine.stop()
+    reader.close()
+
+    assert queued == 8
+    assert drained > 8 * 1000
@@ -0,0 +1,79 @@
+import numpy as np
+import struct
+import time
+from capture_store import FRAME_DTYPE
+
+
+TRACE_MAGIC = b"INFTRACE"
+TRACE_VERSION = 2
+TRACE_HEADER = struct.Struct("<8sHHId")
+TRACE_RECORD_DTYPES = {
+    1: np.dtype([
+        ("timestamp", "<f8"),
+        ("arbitration_id", "<u4"),
+        ("dlc", "u1"),
+        ("flags", "u1"),
+        ("data", "u1", (8,)),
+    ]),
+    2: FRAME_DTYPE,
+}
+
+
+def write_trace_header(f, start_time=None):
+    """
+    Write the trace header: magic "INFTRACE", version (u16), record size (u16),
+    reserved (u32) and the capture start time (f64). Records follow as raw FRAME_DTYPE rows.
+    """
+    start_time = time.time() if start_time is None else start_time
+    f.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, FRAME_DTYPE.itemsize, 0, start_time))
+
+
+def read_trace_header(f):
+    """
+    Read and validate a trace header and return (capture start time, record dtype).
+    Version 1 traces predate the channel column and are read with their own record dtype.
+    """
+    header = f.read(TRACE_HEADER.size)
+    if len(header) != TRACE_HEADER.size:
+        raise ValueError("File is too short to be a trace")
+
+    magic, version, record_size, _, start_time = TRACE_HEADER.unpack(header)
+    if magic != TRACE_MAGIC:
+        raise ValueError("Not an Infinity trace file")
+    record_dtype = TRACE_RECORD_DTYPES.get(version)
+    if record_dtype is None or record_size != record_dtype.itemsize:
+        raise ValueError(f"Unsupported trace version {version} (record size {record_size})")
+    return start_time, record_dtype
+
+
+class TraceWriter:
+    """
+    Appends frame batches to a binary trace file.
+    """
+
+    def __init__(self, file_path, buffer_size=1 << 20):
+        """
+        Initialize the TraceWriter and write the trace header.
+        """
+        self.file_path = file_path
+        self.file = open(file_path, "wb", buffering=buffer_size)
+        write_trace_header(self.file)
+        self.frames_written = 0
+        self.bytes_written = TRACE_HEADER.size
+
+    def write(self, frames):
+        """
+        Append a frame batch.
+        """
+        data = frames.astype(FRAME_DTYPE, copy=False).tobytes()
+        self.file.write(data)
+        self.frames_written += len(frames)
+        self.bytes_written += len(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
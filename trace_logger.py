@@ -0,0 +1,143 @@
+import can
+import numpy as np
+import os
+import queue
+import threading
+import time
+from capture_store import frame_to_message
+from trace_file import TraceWriter
+
+
+class TraceLogger(threading.Thread):
+    """
+    Streams frame batches to disk on a dedicated writer thread.
+    Producers hand batches over through a bounded queue and never block: when the queue is
+    full the batch is dropped and counted. The writer coalesces queued batches into large
+    writes, so memory stays constant however long the capture runs.
+    Files ending in .asc or .blf are written through python-can writers, anything else uses
+    the native binary trace format.
+    """
+
+    def __init__(self, file_path, max_queue=4096, max_batch_frames=65536):
+        """
+        Initialize the TraceLogger. Call start() to begin writing.
+        """
+        super().__init__(daemon=True)
+        self.file_path = file_path
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_batch_frames = max_batch_frames
+        self._running = True
+
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension in (".asc", ".blf"):
+            self.writer = can.Logger(file_path)
+            self.native = False
+        else:
+            self.writer = TraceWriter(file_path)
+            self.native = True
+
+        self.frames_written = 0
+        self.dropped_frames = 0
+        self.error = None
+        self._stats_time = time.monotonic()
+        self._stats_frames = 0
+
+    def log(self, frames):
+        """
+        Queue a frame batch for writing without blocking.
+        """
+        if not self._running:
+            return
+        try:
+            self.queue.put_nowait(frames)
+        except queue.Full:
+            self.dropped_frames += len(frames)
+
+    def run(self):
+        while True:
+            try:
+                batches = [self.queue.get(timeout=0.2)]
+            except queue.Empty:
+                if not self._running:
+                    break
+                continue
+
+            if batches[0] is None:
+                break
+
+            count = len(batches[0])
+            stop = False
+            while count < self.max_batch_frames:
+                try:
+                    frames = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if frames is None:
+                    stop = True
+                    break
+                batches.append(frames)
+                count += len(frames)
+
+            self.write(batches[0] if len(batches) == 1 else np.concatenate(batches))
+            if stop:
+                break
+
+        self.close()
+
+    def write(self, frames):
+        """
+        Write one coalesced batch to the trace file.
+        """
+        try:
+            if self.native:
+                self.writer.write(frames)
+            else:
+                for frame in frames:
+                    self.writer.on_message_received(frame_to_message(frame))
+            self.frames_written += len(frames)
+        except Exception as e:
+            self.error = str(e)
+            self._running = False
+            print(f"[ERROR] Failed to write trace file: {e}")
+
+    def close(self):
+        try:
+            if self.native:
+                self.writer.close()
+            else:
+                self.writer.stop()
+        except Exception as e:
+            print(f"[WARNING] Error closing trace file: {e}")
+
+    def stop(self):
+        """
+        Flush everything queued so far, close the file and wait for the writer thread.
+        """
+        self._running = False
+        while True:
+            try:
+                self.queue.put(None, timeout=0.5)
+                break
+            except queue.Full:
+                if not self.is_alive():
+                    break
+        self.join()
+
+    def stats(self):
+        """
+        Return queue depth, totals and write throughput since the previous call.
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._stats_time, 1e-9)
+        written = self.frames_written
+        rate = (written - self._stats_frames) / elapsed
+        self._stats_time = now
+        self._stats_frames = written
+        bytes_written = self.writer.bytes_written if self.native else os.path.getsize(self.file_path)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "frames_written": written,
+            "bytes_written": bytes_written,
+            "frames_per_second": rate,
+            "dropped_frames": self.dropped_frames,
+        }
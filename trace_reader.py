@@ -0,0 +1,196 @@
+import mmap
+import numpy as np
+import os
+from capture_store import FRAME_DTYPE, empty_frames
+from trace_file import TRACE_HEADER, read_trace_header
+
+
+TRACE_INDEX_VERSION = 1
+
+
+class TraceReader:
+    """
+    Read-only view of a binary trace file through mmap.
+    The columns are zero-copy NumPy views of the mapped file, so only the pages that are
+    actually touched (typically the visible table rows) are read from disk. A sparse index
+    (timestamp range of every index_interval frames plus the blocks each CAN ID occurs in)
+    is built on first open and stored next to the trace as <trace>.idx.
+    """
+
+    def __init__(self, file_path, index_interval=4096):
+        """
+        Initialize the TraceReader and map the trace file.
+        """
+        self.file_path = file_path
+        self.index_interval = index_interval
+        self.file = open(file_path, "rb")
+        try:
+            self.start_time, self.record_dtype = read_trace_header(self.file)
+            size = os.fstat(self.file.fileno()).st_size
+            self.count = (size - TRACE_HEADER.size) // self.record_dtype.itemsize
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+        except Exception:
+            self.file.close()
+            raise
+
+        if self.mmap is not None:
+            self.records = np.frombuffer(self.mmap, dtype=self.record_dtype, count=self.count, offset=TRACE_HEADER.size)
+        else:
+            self.records = np.zeros(0, dtype=self.record_dtype)
+
+        self.timestamp = self.records["timestamp"]
+        self.arbitration_id = self.records["arbitration_id"]
+        self.dlc = self.records["dlc"]
+        self.flags = self.records["flags"]
+        self.data = self.records["data"]
+        if "channel" in self.record_dtype.names:
+            self.channel = self.records["channel"]
+        else:
+            self.channel = np.broadcast_to(np.uint8(0), (self.count,))
+
+        self.load_index()
+
+    def __len__(self):
+        return self.count
+
+    def payload(self, index):
+        """
+        Return the payload bytes of a frame, trimmed to its DLC.
+        """
+        return self.data[index, :min(int(self.dlc[index]), 8)].tobytes()
+
+    def frames(self, start=0, stop=None):
+        """
+        Return the frames in [start, stop) as a zero-copy frame batch view, or as a converted
+        copy for traces written before the channel column.
+        """
+        if self.record_dtype == FRAME_DTYPE:
+            return self.records[start:stop]
+        records = self.records[start:stop]
+        frames = empty_frames(len(records))
+        for name in self.record_dtype.names:
+            frames[name] = records[name]
+        return frames
+
+    def index_path(self):
+        return f"{self.file_path}.idx"
+
+    def load_index(self):
+        """
+        Load the sidecar index if it matches this trace, otherwise build and save it.
+        """
+        stat = os.stat(self.file_path)
+        try:
+            with np.load(self.index_path()) as index:
+                meta = index["meta"]
+                if (int(meta[0]) == TRACE_INDEX_VERSION and int(meta[1]) == stat.st_size
+                        and int(meta[2]) == stat.st_mtime_ns and int(meta[3]) == self.index_interval):
+                    self.block_min = index["block_min"]
+                    self.block_max = index["block_max"]
+                    self.id_keys = index["id_keys"]
+                    self.id_offsets = index["id_offsets"]
+                    self.id_blocks = index["id_blocks"]
+                    self.block_max_cumulative = np.maximum.accumulate(self.block_max) if len(self.block_max) else self.block_max
+                    return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[WARNING] Rebuilding unreadable trace index: {e}")
+
+        self.build_index()
+        try:
+            np.savez(
+                self.index_path(),
+                meta=np.array([TRACE_INDEX_VERSION, stat.st_size, stat.st_mtime_ns, self.index_interval], dtype=np.int64),
+                block_min=self.block_min,
+                block_max=self.block_max,
+                id_keys=self.id_keys,
+                id_offsets=self.id_offsets,
+                id_blocks=self.id_blocks,
+            )
+            os.replace(f"{self.index_path()}.npz", self.index_path())
+        except Exception as e:
+            print(f"[WARNING] Failed to save trace index: {e}")
+
+    def build_index(self, chunk_blocks=256):
+        """
+        Scan the trace once in chunks and build the per-block time ranges and per-ID block lists.
+        """
+        interval = self.index_interval
+        block_count = (self.count + interval - 1) // interval
+        self.block_min = np.zeros(block_count, dtype=np.float64)
+        self.block_max = np.zeros(block_count, dtype=np.float64)
+        id_block_pairs = []
+
+        for first_block in range(0, block_count, chunk_blocks):
+            start = first_block * interval
+            stop = min(self.count, (first_block + chunk_blocks) * interval)
+            timestamps = np.array(self.timestamp[start:stop])
+            block_numbers = np.arange(start, stop, dtype=np.int64) // interval
+            boundaries = np.arange(0, stop - start, interval)
+            self.block_min[block_numbers[0]:block_numbers[-1] + 1] = np.minimum.reduceat(timestamps, boundaries)
+            self.block_max[block_numbers[0]:block_numbers[-1] + 1] = np.maximum.reduceat(timestamps, boundaries)
+            keys = (self.arbitration_id[start:stop].astype(np.uint64) << np.uint64(32)) | block_numbers.astype(np.uint64)
+            id_block_pairs.append(np.unique(keys))
+
+        pairs = np.unique(np.concatenate(id_block_pairs)) if id_block_pairs else np.zeros(0, dtype=np.uint64)
+        ids = (pairs >> np.uint64(32)).astype(np.uint32)
+        self.id_keys, first = np.unique(ids, return_index=True)
+        self.id_offsets = np.append(first, len(ids)).astype(np.int64)
+        self.id_blocks = (pairs & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        self.block_max_cumulative = np.maximum.accumulate(self.block_max) if block_count else self.block_max
+
+    def index_for_time(self, timestamp):
+        """
+        Return the index of the first frame at or after timestamp, or len(self) if there is none.
+        """
+        block = int(np.searchsorted(self.block_max_cumulative, timestamp, side="left"))
+        if block >= len(self.block_max_cumulative):
+            return self.count
+
+        start = block * self.index_interval
+        stop = min(self.count, start + self.index_interval)
+        hits = np.flatnonzero(self.timestamp[start:stop] >= timestamp)
+        return start + int(hits[0]) if len(hits) else stop
+
+    def blocks_for_id(self, can_id):
+        """
+        Return the numbers of the index blocks that contain can_id.
+        """
+        position = int(np.searchsorted(self.id_keys, can_id))
+        if position >= len(self.id_keys) or self.id_keys[position] != can_id:
+            return np.zeros(0, dtype=np.int64)
+        return self.id_blocks[self.id_offsets[position]:self.id_offsets[position + 1]]
+
+    def next_index_for_id(self, can_id, start=0):
+        """
+        Return the index of the first frame with can_id at or after start, or None.
+        """
+        interval = self.index_interval
+        blocks = self.blocks_for_id(can_id)
+        for block in blocks[np.searchsorted(blocks, start // interval):]:
+            first = max(start, int(block) * interval)
+            stop = min(self.count, (int(block) + 1) * interval)
+            hits = np.flatnonzero(self.arbitration_id[first:stop] == can_id)
+            if len(hits):
+                return first + int(hits[0])
+        return None
+
+    @property
+    def duration(self):
+        if not self.count:
+            return 0.0
+        return float(self.block_max_cumulative[-1] - self.block_min.min())
+
+    def close(self):
+        """
+        Drop the column views and unmap the file.
+        """
+        self.records = self.timestamp = self.arbitration_id = self.dlc = self.flags = self.data = self.channel = None
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                pass
+            self.mmap = None
+        self.file.close()
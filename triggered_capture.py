@@ -0,0 +1,155 @@
+import threading
+import numpy as np
+from can_enums import trigger_state
+from capture_store import empty_frames
+
+
+class TriggeredCapture:
+    """
+    Holds received frames back until a trigger condition matches, then releases the frames
+    from pre_trigger seconds before the trigger through post_trigger seconds after it.
+
+    The trigger is a compiled DisplayFilter, so any display filter expression works as a
+    condition: an ID, a masked byte value or a DBC signal threshold. While armed, every batch
+    is evaluated with one vectorized pass and written into a ring buffer preallocated for
+    capacity frames, so memory stays constant between triggers and re-arming only resets
+    the ring indices.
+    """
+
+    def __init__(self, trigger, pre_trigger=1.0, post_trigger=1.0, capacity=262144, rearm=False):
+        """
+        Initialize the TriggeredCapture.
+        """
+        self.trigger = trigger
+        self.pre_trigger = pre_trigger
+        self.post_trigger = post_trigger
+        self.capacity = capacity
+        self.rearm = rearm
+
+        self.ring = empty_frames(capacity)
+        self.ring_head = 0
+        self.ring_count = 0
+
+        self.state = trigger_state.IDLE
+        self.trigger_time = None
+        self.post_deadline = None
+        self.time_origin = None
+        self.triggers_fired = 0
+        self.frames_released = 0
+
+        self._lock = threading.Lock()
+
+    def arm(self):
+        """
+        Arm the trigger, discarding any frames buffered before.
+        """
+        with self._lock:
+            self.ring_head = 0
+            self.ring_count = 0
+            self.time_origin = None
+            self.state = trigger_state.ARMED
+
+    def disarm(self):
+        with self._lock:
+            self.state = trigger_state.IDLE
+
+    def process(self, frames):
+        """
+        Feed a received batch through the trigger. Returns the frames to pass on to the table
+        and the logger, which is empty while armed and waiting for the trigger.
+        """
+        with self._lock:
+            released = []
+            while len(frames) and self.state != trigger_state.IDLE:
+                if self.state == trigger_state.TRIGGERED:
+                    frames = self._collect_post_trigger(frames, released)
+                else:
+                    frames = self._check_trigger(frames, released)
+
+            if not released:
+                return frames[:0]
+            released = released[0] if len(released) == 1 else np.concatenate(released)
+            self.frames_released += len(released)
+            return released
+
+    def _check_trigger(self, frames, released):
+        if self.time_origin is None:
+            self.time_origin = float(frames["timestamp"][0])
+
+        mask = self.trigger.evaluate_frames(frames, self.time_origin)
+        if not mask.any():
+            self._push_ring(frames)
+            return frames[:0]
+
+        index = int(np.argmax(mask))
+        self._push_ring(frames[:index])
+        self.trigger_time = float(frames["timestamp"][index])
+        self.post_deadline = self.trigger_time + self.post_trigger
+        self.triggers_fired += 1
+        self.state = trigger_state.TRIGGERED
+
+        pre_window = self._pre_trigger_window()
+        if len(pre_window):
+            released.append(pre_window)
+        print(f"[INFO] Trigger fired at {self.trigger_time:.6f} with {len(pre_window)} pre-trigger frames")
+        return frames[index:]
+
+    def _collect_post_trigger(self, frames, released):
+        late = frames["timestamp"] > self.post_deadline
+        if not late.any():
+            released.append(frames)
+            return frames[:0]
+
+        end = int(np.argmax(late))
+        if end:
+            released.append(frames[:end])
+        if self.rearm:
+            self.ring_head = 0
+            self.ring_count = 0
+            self.state = trigger_state.ARMED
+        else:
+            self.state = trigger_state.IDLE
+        return frames[end:]
+
+    def _push_ring(self, frames):
+        """
+        Copy a batch into the ring buffer, overwriting the oldest frames once it is full.
+        """
+        count = len(frames)
+        if not count:
+            return
+        if count >= self.capacity:
+            self.ring[:] = frames[count - self.capacity:]
+            self.ring_head = 0
+            self.ring_count = self.capacity
+            return
+
+        first = min(count, self.capacity - self.ring_head)
+        self.ring[self.ring_head:self.ring_head + first] = frames[:first]
+        self.ring[:count - first] = frames[first:]
+        self.ring_head = (self.ring_head + count) % self.capacity
+        self.ring_count = min(self.ring_count + count, self.capacity)
+
+    def _pre_trigger_window(self):
+        """
+        Return a copy of the buffered frames within pre_trigger seconds of the trigger, oldest
+        first, and empty the ring.
+        """
+        start = (self.ring_head - self.ring_count) % self.capacity
+        if start + self.ring_count <= self.capacity:
+            window = self.ring[start:start + self.ring_count].copy()
+        else:
+            window = np.concatenate((self.ring[start:], self.ring[:self.ring_head]))
+        self.ring_head = 0
+        self.ring_count = 0
+        return window[window["timestamp"] >= self.trigger_time - self.pre_trigger]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "buffered": self.ring_count,
+                "triggers": self.triggers_fired,
+                "released": self.frames_released,
+                "trigger_time": self.trigger_time,
+            }
@@ -0,0 +1,112 @@
+import struct
+import numpy as np
+from capture_store import empty_frames
+
+
+UDP_MAGIC = b"ICAN"
+UDP_VERSION = 1
+UDP_HEADER = struct.Struct("<4sBBHId")
+UDP_STAMP = struct.Struct("<Id")
+UDP_STAMP_OFFSET = 8
+UDP_RECORD_DTYPE = np.dtype([
+    ("time_offset", "<u4"),
+    ("arbitration_id", "<u4"),
+    ("dlc", "u1"),
+    ("flags", "u1"),
+    ("data", "u1", (8,)),
+])
+UDP_MAX_DATAGRAM = 1472
+UDP_MAX_RECORDS = (UDP_MAX_DATAGRAM - UDP_HEADER.size) // UDP_RECORD_DTYPE.itemsize
+UDP_SEQUENCE_MASK = 0xFFFFFFFF
+
+
+def pack_datagrams(frames, sequence):
+    """
+    Pack a frame batch into as few datagrams as fit the MTU.
+    Datagram layout: magic "ICAN", version (u8), reserved (u8), record count (u16),
+    sequence number (u32) and base timestamp (f64), followed by 18-byte records holding the
+    time offset from the base in microseconds (u32), CAN ID (u32), DLC (u8), flags (u8) and
+    8 data bytes. Return the datagrams and the next sequence number.
+    """
+    datagrams = []
+    for start in range(0, len(frames), UDP_MAX_RECORDS):
+        chunk = frames[start:start + UDP_MAX_RECORDS]
+        base_timestamp = float(chunk["timestamp"].min())
+        records = np.empty(len(chunk), dtype=UDP_RECORD_DTYPE)
+        records["time_offset"] = np.round((chunk["timestamp"] - base_timestamp) * 1e6)
+        records["arbitration_id"] = chunk["arbitration_id"]
+        records["dlc"] = chunk["dlc"]
+        records["flags"] = chunk["flags"]
+        records["data"] = chunk["data"]
+        header = UDP_HEADER.pack(UDP_MAGIC, UDP_VERSION, 0, len(chunk), sequence, base_timestamp)
+        datagrams.append(header + records.tobytes())
+        sequence = (sequence + 1) & UDP_SEQUENCE_MASK
+    return datagrams, sequence
+
+
+def stamp_datagram(datagram, sequence, base_timestamp):
+    """
+    Rewrite the sequence number and base timestamp of a packed datagram (a bytearray) in place.
+    """
+    UDP_STAMP.pack_into(datagram, UDP_STAMP_OFFSET, sequence, base_timestamp)
+
+
+class UDPFrameDecoder:
+    """
+    Decodes binary frame datagrams and tracks sequence numbers per sender to count lost datagrams.
+    """
+
+    def __init__(self):
+        """
+        Initialize the UDPFrameDecoder.
+        """
+        self.sequences = {}
+        self.lost_datagrams = 0
+        self.invalid_datagrams = 0
+
+    def reset(self):
+        """
+        Forget all senders and counters.
+        """
+        self.sequences.clear()
+        self.lost_datagrams = 0
+        self.invalid_datagrams = 0
+
+    def decode(self, datagram, addr=None):
+        """
+        Return the frames carried by a datagram as a frame batch, or None if it is not a valid datagram.
+        """
+        if len(datagram) < UDP_HEADER.size:
+            self.invalid_datagrams += 1
+            return None
+
+        magic, version, _, count, sequence, base_timestamp = UDP_HEADER.unpack_from(datagram)
+        if (magic != UDP_MAGIC or version != UDP_VERSION
+                or len(datagram) != UDP_HEADER.size + count * UDP_RECORD_DTYPE.itemsize):
+            self.invalid_datagrams += 1
+            return None
+
+        self.track_sequence(addr, sequence)
+
+        records = np.frombuffer(datagram, dtype=UDP_RECORD_DTYPE, count=count, offset=UDP_HEADER.size)
+        frames = empty_frames(count)
+        frames["timestamp"] = base_timestamp + records["time_offset"] * 1e-6
+        frames["arbitration_id"] = records["arbitration_id"]
+        frames["dlc"] = records["dlc"]
+        frames["flags"] = records["flags"]
+        frames["data"] = records["data"]
+        return frames
+
+    def track_sequence(self, addr, sequence):
+        """
+        Count the datagrams skipped since the previous one from the same sender.
+        """
+        expected = self.sequences.get(addr)
+        self.sequences[addr] = sequence
+        if expected is None:
+            return
+
+        gap = (sequence - expected - 1) & UDP_SEQUENCE_MASK
+        if 0 < gap < (UDP_SEQUENCE_MASK >> 1):
+            self.lost_datagrams += gap
+            print(f"[WARNING] Lost {gap} UDP datagram(s) from {addr}")